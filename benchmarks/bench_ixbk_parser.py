@@ -0,0 +1,72 @@
+"""
+线报酷页面提取基准
+对比 html.parser 完整解析（原实现）与 lxml + 部分解析的耗时，并校验两者输出一致
+
+用法: python -m benchmarks.bench_ixbk_parser [--repeat 50] [--scale 4]
+"""
+from pathlib import Path
+import argparse
+import re
+import time
+
+from src.config import settings
+from src.crawlers import base
+from src.crawlers.ixbk_parser import parse_detail_page, parse_list_page
+
+FIXTURES = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures'
+BASE_URL = 'https://new.ixbk.net/'
+
+CONFIGS = [
+    ('html.parser 完整解析', 'html.parser', False),
+    ('html.parser 部分解析', 'html.parser', True),
+    ('lxml 完整解析', 'lxml', False),
+    ('lxml 部分解析', 'lxml', True),
+]
+
+
+def scale_list_page(html: str, scale: int) -> str:
+    """复制列表项，模拟更长的列表页"""
+    items = re.search(r'<ul class="new-post">(.*?)</ul>', html, re.S).group(1)
+    return html.replace(items, items * scale, 1)
+
+
+def run(func, args, parser: str, partial: bool, repeat: int):
+    """按指定解析器运行 repeat 次，返回 (单次平均耗时, 最后一次结果)"""
+    base.HTML_PARSER = parser
+    settings.PARTIAL_PARSE = partial
+    result = func(*args)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--repeat', type=int, default=50, help='每种配置的重复次数')
+    arg_parser.add_argument('--scale', type=int, default=4, help='列表页列表项放大倍数')
+    args = arg_parser.parse_args()
+    
+    list_html = scale_list_page((FIXTURES / 'ixbk_list.html').read_text(encoding='utf-8'), args.scale)
+    detail_html = (FIXTURES / 'ixbk_detail.html').read_text(encoding='utf-8')
+    pages = [
+        ('列表页', parse_list_page, (list_html, BASE_URL)),
+        ('详情页', parse_detail_page, (detail_html,)),
+    ]
+    
+    for page_name, func, func_args in pages:
+        print(f"{page_name}（{len(func_args[0].encode('utf-8')) // 1024} KB）")
+        baseline_time = baseline = None
+        for name, parser, partial in CONFIGS:
+            elapsed, result = run(func, func_args, parser, partial, args.repeat)
+            if baseline is None:
+                baseline_time, baseline = elapsed, result
+            status = '一致' if result == baseline else '不一致!'
+            print(
+                f"  {name:<18} {elapsed * 1000:8.2f} ms  "
+                f"{baseline_time / elapsed:5.1f}x  输出{status}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+帖子记录内存基准
+用 tracemalloc 统计保存同样一批帖子时，原帖子字典与 Post（含内容压缩）占用的内存，并校验两者内容一致
+
+用法: python -m benchmarks.bench_post_memory [--count 100000] [--content-length 400]
+"""
+from datetime import datetime, timedelta
+import argparse
+import gc
+import tracemalloc
+
+from src.storage import Post
+
+CATEGORIES = ['京东', '淘宝', '话费', '支付宝', '拼多多', '美团']
+AUTHORS = [f'线报员{i}' for i in range(50)]
+SENTENCES = [
+    '领券后下单立减，', '限时秒杀，', '实物包邮，', '先到先得。', '需要PLUS会员，',
+    '每个账号限购一件，', '库存不多，', '叠加店铺满减更划算。', '亲测已到账，', '活动页面见链接。',
+]
+
+CONFIGS = [
+    ('dict（原实现）', None),
+    ('Post', False),
+    ('Post + 内容压缩', True),
+]
+
+
+def make_post(i: int, content_length: int) -> dict:
+    """
+    生成与爬虫产出结构相同的帖子字典
+    
+    字符串每次重新拼接，与解析页面得到的字符串一样互不共享；约四分之一的帖子内容与标题相同（列表页没有简介）。
+    """
+    title = f'{CATEGORIES[i % len(CATEGORIES)]} 满{i % 200}减{i % 30} 第{i}号线报'
+    if i % 4 == 0:
+        content = ''.join([title])
+    else:
+        parts = [f'{i}：']
+        while sum(map(len, parts)) < content_length:
+            parts.append(SENTENCES[(i + len(parts) * 7) % len(SENTENCES)])
+            parts.append(str(i * len(parts) % 997))
+        content = ''.join(parts)[:content_length]
+    publish_time = datetime(2026, 1, 1) + timedelta(minutes=i)
+    return {
+        'title': title,
+        'url': f'https://new.ixbk.net/{i}.html',
+        'author': ''.join([AUTHORS[i % len(AUTHORS)]]),
+        'publish_time': publish_time,
+        'content': content,
+        'source': ''.join(['ixbk']),
+        'view_count': 0,
+        'reply_count': 0,
+        'crawl_time': publish_time,
+        'category': ''.join([CATEGORIES[i % len(CATEGORIES)]]),
+        'comments': i % 40,
+        'comment_links': '',
+        'quality_score': float(i % 100),
+    }
+
+
+def measure(count: int, content_length: int, compress):
+    """
+    生成 count 条帖子并保留在列表中，返回 (保留的内存字节数, 帖子列表)
+    
+    compress 为 None 时保留原字典，否则转换为 Post（转换前的字典随即释放）。
+    """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    if compress is None:
+        posts = [make_post(i, content_length) for i in range(count)]
+    else:
+        posts = [Post(make_post(i, content_length), compress_content=compress) for i in range(count)]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current - start, posts
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument('--count', type=int, default=100_000, help='帖子数量')
+    arg_parser.add_argument('--content-length', type=int, default=400, help='帖子内容长度（字符数）')
+    args = arg_parser.parse_args()
+    
+    print(f"{args.count} 条帖子（内容 {args.content_length} 字）")
+    baseline_size = baseline = None
+    for name, compress in CONFIGS:
+        size, posts = measure(args.count, args.content_length, compress)
+        per_100k = size / args.count * 100_000 / 1024 / 1024
+        if baseline is None:
+            baseline_size, baseline = size, posts
+            status = ''
+        else:
+            status = '内容一致' if all(dict(post) == data for post, data in zip(posts, baseline)) else '内容不一致!'
+        print(
+            f"  {name:<14} {per_100k:8.1f} MB/10万条  "
+            f"{size / args.count:7.0f} B/条  {size / baseline_size:5.0%}  {status}"
+        )
+        del posts
+
+
+if __name__ == '__main__':
+    main()
@@ -6,9 +6,11 @@ import asyncio
 import sys
 from pathlib import Path
 
-from src.crawlers.ixbk import IxbkCrawler
-from src.filters.quality_filter import QualityFilter
+from src.crawlers import MultiSourceCrawler
+from src.config import settings
+from src.filters import NearDuplicateFilter, QualityFilter
 from src.rss import RSSManager
+from src.storage import SQLitePostStore
 from loguru import logger
 
 
@@ -21,35 +23,43 @@ async def main():
         
         # 1. 初始化组件
         logger.info("初始化爬虫和过滤器...")
-        crawler = IxbkCrawler()
+        crawler = MultiSourceCrawler.from_settings()
         quality_filter = QualityFilter(threshold=60)
-        rss_manager = RSSManager(crawler=crawler, quality_filter=quality_filter)
-        
-        # 2. 生成RSS Feed
-        logger.info("开始生成RSS Feed...")
-        await rss_manager.generate_rss_feed(
-            output_file="output/feed.xml",
-            max_items=100  # 输出前100条高质量线报
+        deduplicator = None
+        if settings.DEDUP_ENABLED:
+            # calculate_score 与过滤器共用评分缓存，过滤时关键词分直接命中缓存，不会重复计算
+            deduplicator = NearDuplicateFilter(
+                max_distance=settings.DEDUP_MAX_DISTANCE,
+                window_hours=settings.DEDUP_WINDOW_HOURS,
+                score_func=quality_filter.calculate_score,
+                state_file=settings.DEDUP_STATE_FILE or None
+            )
+        # 增量模式下爬虫只产出新帖子，需要帖子存储补齐输出
+        post_store = None
+        if settings.POST_STORE_ENABLED or settings.INCREMENTAL_CRAWL:
+            post_store = SQLitePostStore.from_settings()
+        rss_manager = RSSManager(
+            crawler=crawler,
+            quality_filter=quality_filter,
+            deduplicator=deduplicator,
+            post_store=post_store
         )
         
-        # 3. 同时生成Atom格式（可选）
-        logger.info("生成Atom格式Feed...")
-        posts = await crawler.crawl()
-        filtered_posts = quality_filter.filter_posts(posts)
-        if len(filtered_posts) > 100:
-            filtered_posts = filtered_posts[:100]
-        
-        rss_manager.rss_generator.generate_atom(
-            filtered_posts,
-            output_file="output/feed.atom"
-        )
-        
-        # 4. 生成JSON数据（供Web界面使用）
-        logger.info("生成JSON数据...")
-        rss_manager.rss_generator.generate_json(
-            filtered_posts,
-            output_file="output/feed.json"
-        )
+        # 2. 爬取和过滤一次，同时生成RSS、Atom和JSON（JSON供Web界面使用）
+        async with crawler:
+            logger.info("开始生成Feed...")
+            await rss_manager.generate_feeds(
+                {
+                    'rss': "output/feed.xml",
+                    'atom': "output/feed.atom",
+                    'json': "output/feed.json",
+                    'json-pages': "output",
+                },
+                max_items=100  # 输出前100条高质量线报
+            )
+        if post_store is not None:
+            logger.info(f"帖子存储: 共 {len(post_store)} 条（{post_store.db_path}）")
+            post_store.close()
         
         logger.info("=" * 80)
         logger.info("✓ RSS生成完成！")
@@ -58,6 +68,7 @@ async def main():
         logger.info("  - output/feed.xml (RSS 2.0)")
         logger.info("  - output/feed.atom (Atom 1.0)")
         logger.info("  - output/feed.json (JSON API)")
+        logger.info("  - output/feed-index.json + feed-N.json (分页JSON)")
         logger.info("=" * 80)
         
         return 0
@@ -15,16 +15,81 @@ class Settings:
     # 爬虫配置
     CRAWL_INTERVAL: int = int(os.getenv('CRAWL_INTERVAL', '30'))
     MAX_POSTS_PER_SOURCE: int = int(os.getenv('MAX_POSTS_PER_SOURCE', '50'))
+    MAX_CRAWL_PAGES: int = int(os.getenv('MAX_CRAWL_PAGES', '1'))
     REQUEST_TIMEOUT: int = int(os.getenv('REQUEST_TIMEOUT', '10'))
     
+    # HTML解析配置（默认内置html.parser；lxml / auto 需显式开启，auto 在已安装lxml时使用lxml）
+    HTML_PARSER: str = os.getenv('HTML_PARSER', 'html.parser')
+    PARTIAL_PARSE: bool = os.getenv('PARTIAL_PARSE', 'true').lower() == 'true'
+    # 解析执行器（thread / process / none），PARSE_WORKERS为0时使用默认线程/进程数
+    PARSE_EXECUTOR: str = os.getenv('PARSE_EXECUTOR', 'thread')
+    PARSE_WORKERS: int = int(os.getenv('PARSE_WORKERS', '0'))
+    
+    # 多数据源配置（单个数据源的爬取超时，秒；超时不影响其他数据源，SOURCES 中的 timeout 可单独覆盖）
+    SOURCE_TIMEOUT: float = float(os.getenv('SOURCE_TIMEOUT', '60'))
+    
+    # 增量爬取配置（记录已处理的帖子，只产出新帖子；Feed输出从帖子存储补齐）
+    INCREMENTAL_CRAWL: bool = os.getenv('INCREMENTAL_CRAWL', 'false').lower() == 'true'
+    SEEN_STORE_PATH: str = os.getenv('SEEN_STORE_PATH', '.cache/seen.db')
+    
+    # HTTP连接池配置
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv('HTTP_MAX_KEEPALIVE', '10'))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+    HTTP2_ENABLED: bool = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+    
+    # 限速与重试配置（每个主机独立的令牌桶，遇到429/5xx自动降速）
+    RATE_LIMIT_PER_HOST: float = float(os.getenv('RATE_LIMIT_PER_HOST', '10'))
+    RATE_LIMIT_BURST: int = int(os.getenv('RATE_LIMIT_BURST', '10'))
+    MAX_RETRIES: int = int(os.getenv('MAX_RETRIES', '3'))
+    RETRY_BACKOFF_BASE: float = float(os.getenv('RETRY_BACKOFF_BASE', '0.5'))
+    RETRY_BACKOFF_MAX: float = float(os.getenv('RETRY_BACKOFF_MAX', '30'))
+    
+    # 详情页并发配置
+    DETAIL_CONCURRENCY: int = int(os.getenv('DETAIL_CONCURRENCY', '8'))
+    CRAWL_DEADLINE: float = float(os.getenv('CRAWL_DEADLINE', '30'))
+    
+    # HTTP条件请求缓存配置
+    HTTP_CACHE_ENABLED: bool = os.getenv('HTTP_CACHE_ENABLED', 'false').lower() == 'true'
+    HTTP_CACHE_DIR: str = os.getenv('HTTP_CACHE_DIR', '.cache/http')
+    HTTP_CACHE_MAX_MB: int = int(os.getenv('HTTP_CACHE_MAX_MB', '50'))
+    
+    # 详情页内容缓存配置（评论数变化时失效）
+    DETAIL_CACHE_ENABLED: bool = os.getenv('DETAIL_CACHE_ENABLED', 'false').lower() == 'true'
+    DETAIL_CACHE_FILE: str = os.getenv('DETAIL_CACHE_FILE', '.cache/detail_cache.json')
+    DETAIL_CACHE_TTL_HOURS: float = float(os.getenv('DETAIL_CACHE_TTL_HOURS', '24'))
+    
     # 过滤配置
     QUALITY_THRESHOLD: int = int(os.getenv('QUALITY_THRESHOLD', '60'))
     MAX_POST_AGE_DAYS: int = int(os.getenv('MAX_POST_AGE_DAYS', '7'))
+    # 评分缓存（缓存与时间无关的评分部分，SCORE_CACHE_FILE为空时只缓存在内存中）
+    SCORE_CACHE_SIZE: int = int(os.getenv('SCORE_CACHE_SIZE', '10000'))
+    SCORE_CACHE_FILE: str = os.getenv('SCORE_CACHE_FILE', '')
+    # 评分规则文件（JSON，为空时使用内置的 src/filters/quality_rules.json）
+    QUALITY_RULES_FILE: str = os.getenv('QUALITY_RULES_FILE', '')
+    # 编译后的规则快照缓存目录（JSON，默认为空：每次启动重新编译，不写磁盘）
+    RULES_CACHE_DIR: str = os.getenv('RULES_CACHE_DIR', '')
+    # 近似重复检测（SimHash汉明距离不超过DEDUP_MAX_DISTANCE视为同一线报）
+    # 开启后需要先收集完整批次再过滤，不再边爬取边过滤
+    DEDUP_ENABLED: bool = os.getenv('DEDUP_ENABLED', 'false').lower() == 'true'
+    DEDUP_MAX_DISTANCE: int = int(os.getenv('DEDUP_MAX_DISTANCE', '3'))
+    DEDUP_WINDOW_HOURS: float = float(os.getenv('DEDUP_WINDOW_HOURS', '72'))
+    # 指纹索引持久化文件（时间窗口跨越多次运行；为空时只与本次爬取的帖子比较）
+    DEDUP_STATE_FILE: str = os.getenv('DEDUP_STATE_FILE', '.cache/dedup.json')
     
     # RSS配置
     RSS_TITLE: str = os.getenv('RSS_TITLE', '高质量羊毛线报')
     RSS_DESCRIPTION: str = os.getenv('RSS_DESCRIPTION', '精选优质羊毛活动，自动过滤低质内容')
     RSS_MAX_ITEMS: int = int(os.getenv('RSS_MAX_ITEMS', '100'))
+    # 分页JSON每页条目数
+    JSON_PAGE_SIZE: int = int(os.getenv('JSON_PAGE_SIZE', '20'))
+    # Feed条目片段缓存（只重新渲染新增或变化的帖子，FRAGMENT_CACHE_FILE为空时只缓存在内存中）
+    FRAGMENT_CACHE_SIZE: int = int(os.getenv('FRAGMENT_CACHE_SIZE', '2000'))
+    FRAGMENT_CACHE_FILE: str = os.getenv('FRAGMENT_CACHE_FILE', '')
+    # 输出文件预压缩（.gz / .br，brotli需要安装brotli）及ETag清单（为空时不生成清单）
+    OUTPUT_GZIP: bool = os.getenv('OUTPUT_GZIP', 'true').lower() == 'true'
+    OUTPUT_BROTLI: bool = os.getenv('OUTPUT_BROTLI', 'false').lower() == 'true'
+    OUTPUT_MANIFEST: str = os.getenv('OUTPUT_MANIFEST', 'manifest.json')
     
     # API配置
     API_HOST: str = os.getenv('API_HOST', '0.0.0.0')
@@ -32,6 +97,10 @@ class Settings:
     
     # 数据库配置
     DATABASE_URL: str = os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///wool.db')
+    # 帖子存储（保存每次爬取过滤后的帖子，支持增量Feed和统计查询），0表示不限制条数；
+    # 默认关闭，开启增量爬取时自动启用
+    POST_STORE_ENABLED: bool = os.getenv('POST_STORE_ENABLED', 'false').lower() == 'true'
+    POST_STORE_MAX_ENTRIES: int = int(os.getenv('POST_STORE_MAX_ENTRIES', '0'))
     
     # Cloudflare配置
     CF_ACCOUNT_ID: Optional[str] = os.getenv('CF_ACCOUNT_ID')
@@ -44,7 +113,7 @@ class Settings:
     # User-Agent
     USER_AGENT: str = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     
-    # 数据源配置
+    # 数据源配置（键对应 crawlers.registry.CRAWLER_REGISTRY，timeout 可覆盖 SOURCE_TIMEOUT）
     SOURCES = {
         'ixbk': {
             'name': '线报酷',
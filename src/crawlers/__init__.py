@@ -3,5 +3,6 @@
 """
 from .base import BaseCrawler
 from .ixbk import IxbkCrawler
+from .registry import CRAWLER_REGISTRY, MultiSourceCrawler, register_crawler
 
-__all__ = ['BaseCrawler', 'IxbkCrawler']
\ No newline at end of file
+__all__ = ['BaseCrawler', 'IxbkCrawler', 'CRAWLER_REGISTRY', 'MultiSourceCrawler', 'register_crawler']
\ No newline at end of file
@@ -2,19 +2,93 @@
 爬虫基类
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import AsyncIterator, Callable, List, Dict, Optional, TypeVar, Union
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import random
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from loguru import logger
 
+from .http_cache import HTTPCache
+from .rate_limit import HostRateLimiter
 from ..config import settings
+from ..storage.post import Post
+
+T = TypeVar('T')
+
+
+def resolve_parser(name: str) -> str:
+    """
+    确定BeautifulSoup使用的解析器
+    
+    Args:
+        name: 配置的解析器名称（默认内置 html.parser）；lxml 需显式开启，
+            auto 表示已安装 lxml 时使用 lxml，否则使用 html.parser
+        
+    Returns:
+        可用的解析器名称（要求 lxml 但未安装时回退到 html.parser）
+    """
+    if name not in ('auto', 'lxml'):
+        return name
+    
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        if name == 'lxml':
+            logger.warning("未安装lxml，使用html.parser解析（pip install lxml）")
+        return 'html.parser'
+
+
+HTML_PARSER = resolve_parser(settings.HTML_PARSER)
+
+
+def has_class(attrs, class_name: str) -> bool:
+    """
+    判断标签属性中是否包含指定class（供 SoupStrainer 过滤函数使用）
+    
+    Args:
+        attrs: 标签属性字典（class 可能是字符串或列表）
+        class_name: class名称
+        
+    Returns:
+        是否包含
+    """
+    classes = attrs.get('class') or ''
+    if isinstance(classes, str):
+        classes = classes.split()
+    return class_name in classes
+
+
+def make_soup(html: Union[str, bytes], parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    使用配置的解析器解析HTML（模块级函数，可在线程池/进程池中调用）
+    
+    Args:
+        html: HTML字符串或字节
+        parse_only: 只构建匹配部分的子树（部分解析），PARTIAL_PARSE 关闭时忽略
+        
+    Returns:
+        BeautifulSoup对象
+    """
+    if not settings.PARTIAL_PARSE:
+        parse_only = None
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
 
 
 class BaseCrawler(ABC):
     """爬虫基类"""
     
-    def __init__(self):
+    def __init__(self, use_http: bool = True):
+        """
+        初始化爬虫
+        
+        Args:
+            use_http: 是否自行请求页面（聚合其他爬虫的爬虫传False，不创建限速器和HTTP缓存）
+        """
         self.source_name: str = ""
         self.base_url: str = ""
         self.logger = logger  # 添加logger实例属性
@@ -25,11 +99,99 @@ class BaseCrawler(ABC):
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._executor: Optional[Executor] = None
+        self.rate_limiter: Optional[HostRateLimiter] = None
+        self.http_cache: Optional[HTTPCache] = None
+        if not use_http:
+            return
+        self.rate_limiter = HostRateLimiter(
+            rate=settings.RATE_LIMIT_PER_HOST,
+            burst=settings.RATE_LIMIT_BURST
+        )
+        if settings.HTTP_CACHE_ENABLED:
+            # 所有爬虫共用同一缓存目录的实例，避免各自的索引和淘汰互相覆盖、删除对方的文件
+            self.http_cache = HTTPCache.shared(
+                settings.HTTP_CACHE_DIR,
+                max_bytes=settings.HTTP_CACHE_MAX_MB * 1024 * 1024
+            )
+    
+    async def __aenter__(self):
+        await self.open()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def open(self) -> None:
+        """
+        打开爬虫级共享的HTTP连接池
+        
+        同一次爬取中的所有 fetch_page 调用复用该连接池，
+        避免每个请求都重新进行TCP+TLS握手。
+        """
+        if self._client is not None:
+            return
+        
+        http2 = settings.HTTP2_ENABLED
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("未安装h2，HTTP/2已禁用（pip install httpx[http2]）")
+                http2 = False
+        
+        self._client = self._build_client(http2=http2)
+        logger.debug(f"HTTP连接池已打开: {self.source_name} (HTTP/2: {http2})")
+    
+    async def close(self) -> None:
+        """关闭共享的HTTP连接池和解析执行器"""
+        if self.http_cache is not None:
+            self.http_cache.save_index()
+        
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if self._client is None:
+            return
+        
+        client, self._client = self._client, None
+        await client.aclose()
+        logger.debug(f"HTTP连接池已关闭: {self.source_name}")
+    
+    def _build_client(self, http2: bool = False) -> httpx.AsyncClient:
+        """
+        创建带连接池限制的HTTP客户端
+        
+        Args:
+            http2: 是否启用HTTP/2
+            
+        Returns:
+            httpx.AsyncClient对象
+        """
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        return httpx.AsyncClient(
+            timeout=settings.REQUEST_TIMEOUT,
+            limits=limits,
+            http2=http2,
+            headers=self.headers,
+            follow_redirects=True,
+        )
     
     async def fetch_page(self, url: str) -> Optional[str]:
         """
         获取页面HTML内容
         
+        如果已通过 open() 或 async with 打开连接池，则复用共享客户端；
+        否则为本次请求临时创建客户端。启用HTTP缓存时会发送条件请求，
+        服务端返回304则直接使用缓存内容。超时、网络错误、429和5xx会按
+        指数退避（带抖动，遵守Retry-After）重试。
+        
         Args:
             url: 目标URL
             
@@ -37,18 +199,37 @@ class BaseCrawler(ABC):
             HTML内容字符串，失败返回None
         """
         try:
-            async with httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT) as client:
-                response = await client.get(url, headers=self.headers, follow_redirects=True)
-                response.raise_for_status()
-                
-                # 尝试检测编码
-                if response.encoding == 'ISO-8859-1':
-                    # 可能是GBK编码
-                    response.encoding = 'gbk'
-                
-                logger.info(f"成功获取页面: {url}")
-                return response.text
-                
+            response = await self._get_with_retry(url)
+            
+            # 304 Not Modified: 使用缓存内容（缓存内容缺失时 _get_with_retry 已重新请求）
+            if response.status_code == 304 and self.http_cache is not None:
+                cached = self.http_cache.get(url)
+                if cached is None:
+                    logger.error(f"页面未修改但缓存内容缺失: {url}")
+                    return None
+                logger.info(f"页面未修改，使用缓存: {url}")
+                self._flush_http_cache()
+                return cached
+            
+            response.raise_for_status()
+            
+            # 尝试检测编码
+            if response.encoding == 'ISO-8859-1':
+                # 可能是GBK编码
+                response.encoding = 'gbk'
+            
+            if self.http_cache is not None:
+                self.http_cache.store(
+                    url,
+                    response.text,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified')
+                )
+                self._flush_http_cache()
+            
+            logger.info(f"成功获取页面: {url}")
+            return response.text
+            
         except httpx.TimeoutException:
             logger.error(f"请求超时: {url}")
         except httpx.HTTPError as e:
@@ -58,27 +239,188 @@ class BaseCrawler(ABC):
         
         return None
     
-    def parse_html(self, html: str) -> BeautifulSoup:
+    async def _get_with_retry(self, url: str) -> httpx.Response:
+        """
+        经过按主机限速发送GET请求，失败时指数退避重试
+        
+        启用HTTP缓存时发送条件请求；服务端返回304但缓存内容已丢失时，作废该条目并
+        不带条件请求头重新请求一次（不计入重试次数）。
+        
+        Args:
+            url: 目标URL
+            
+        Returns:
+            最后一次请求的响应（重试用尽时可能仍是429/5xx）
+        """
+        host = httpx.URL(url).host
+        max_retries = settings.MAX_RETRIES
+        attempt = 0
+        conditional = self.http_cache is not None
+        
+        while True:
+            cache_headers = self.http_cache.conditional_headers(url) if conditional else {}
+            await self.rate_limiter.acquire(host)
+            
+            try:
+                if self._client is not None:
+                    response = await self._client.get(url, headers=cache_headers)
+                else:
+                    async with self._build_client() as client:
+                        response = await client.get(url, headers=cache_headers)
+            except httpx.TransportError as e:
+                self.rate_limiter.record(host, None)
+                if attempt >= max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                logger.warning(
+                    f"请求失败，{delay:.1f}s后重试（{attempt}/{max_retries}）: {url}, {type(e).__name__}"
+                )
+                await asyncio.sleep(delay)
+                continue
+            
+            retryable = response.status_code in HostRateLimiter.THROTTLE_STATUS
+            retry_after = self._parse_retry_after(response) if retryable else 0.0
+            self.rate_limiter.record(host, response.status_code, retry_after)
+            if retryable and attempt < max_retries:
+                delay = max(retry_after, self._backoff_delay(attempt))
+                attempt += 1
+                logger.warning(
+                    f"服务端返回 {response.status_code}，{delay:.1f}s后重试（{attempt}/{max_retries}）: {url}"
+                )
+                await asyncio.sleep(delay)
+                continue
+            
+            if response.status_code == 304 and cache_headers and not self.http_cache.has_body(url):
+                logger.warning(f"缓存内容缺失，不带条件请求头重新请求: {url}")
+                self.http_cache.invalidate(url)
+                conditional = False
+                continue
+            
+            return response
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        计算指数退避等待时间（全抖动：在0到退避上限之间均匀随机）
+        
+        Args:
+            attempt: 已失败的次数（从0开始）
+            
+        Returns:
+            等待秒数
+        """
+        ceiling = min(settings.RETRY_BACKOFF_MAX, settings.RETRY_BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    def _parse_retry_after(self, response: httpx.Response) -> float:
+        """
+        解析Retry-After响应头（秒数或HTTP日期）
+        
+        Args:
+            response: HTTP响应
+            
+        Returns:
+            等待秒数（不超过 RETRY_BACKOFF_MAX），没有该响应头返回0
+        """
+        value = response.headers.get('Retry-After')
+        if not value:
+            return 0.0
+        
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+                seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return 0.0
+        
+        return max(0.0, min(seconds, settings.RETRY_BACKOFF_MAX))
+    
+    def _flush_http_cache(self) -> None:
+        """未打开连接池时（单次请求模式）立即保存缓存索引"""
+        if self._client is None and self.http_cache is not None:
+            self.http_cache.save_index()
+    
+    def parse_html(self, html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
         """
         解析HTML
         
         Args:
             html: HTML字符串
+            parse_only: 只构建匹配部分的子树（部分解析），PARTIAL_PARSE 关闭时忽略
             
         Returns:
             BeautifulSoup对象
         """
-        return BeautifulSoup(html, 'html.parser')
+        return make_soup(html, parse_only)
+    
+    async def run_parser(self, func: Callable[..., T], *args) -> T:
+        """
+        在解析线程池/进程池中执行CPU密集的解析函数，避免阻塞事件循环
+        
+        func 应为模块级纯函数（进程池需要可pickle），参数和返回值使用普通数据类型。
+        
+        Args:
+            func: 解析函数
+            *args: 函数参数
+            
+        Returns:
+            函数返回值
+        """
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+    
+    def _get_executor(self) -> Optional[Executor]:
+        """
+        获取（按需创建）解析执行器
+        
+        Returns:
+            执行器，PARSE_EXECUTOR 为 none 时返回None（在事件循环中直接执行）
+        """
+        if self._executor is None:
+            kind = settings.PARSE_EXECUTOR
+            workers = settings.PARSE_WORKERS or None
+            if kind == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+            elif kind == 'thread':
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='parser')
+        return self._executor
     
     @abstractmethod
+    def crawl_iter(self) -> AsyncIterator[Dict]:
+        """
+        流式爬取数据（子类必须以 async def + yield 实现）
+        
+        Yields:
+            帖子字典，解析完成一条即产出一条
+        """
+        pass
+    
     async def crawl(self) -> List[Dict]:
         """
-        爬取数据（子类必须实现）
+        爬取数据
         
         Returns:
             帖子列表，每个帖子是一个字典
         """
-        pass
+        return [post async for post in self.crawl_iter()]
+    
+    def mark_seen(self) -> int:
+        """
+        将本次爬取产出的帖子记录为已处理（增量模式）
+        
+        调用方在帖子评分并写入存储之后调用，避免未保存的帖子在下次爬取时被跳过；
+        不支持增量爬取的爬虫无需记录。
+        
+        Returns:
+            记录的帖子数
+        """
+        return 0
     
     def create_post_dict(
         self,
@@ -89,9 +431,9 @@ class BaseCrawler(ABC):
         content: str = "",
         view_count: int = 0,
         reply_count: int = 0
-    ) -> Dict:
+    ) -> Post:
         """
-        创建标准的帖子字典
+        创建标准的帖子记录（Post，用法与字典相同）
         
         Args:
             title: 标题
@@ -103,16 +445,16 @@ class BaseCrawler(ABC):
             reply_count: 回复数
             
         Returns:
-            标准化的帖子字典
-        """
-        return {
-            'title': title.strip(),
-            'url': url,
-            'author': author.strip(),
-            'publish_time': publish_time or datetime.now(),
-            'content': content.strip(),
-            'source': self.source_name,
-            'view_count': view_count,
-            'reply_count': reply_count,
-            'crawl_time': datetime.now(),
-        }
\ No newline at end of file
+            标准化的帖子记录
+        """
+        return Post(
+            title=title.strip(),
+            url=url,
+            author=author.strip(),
+            publish_time=publish_time or datetime.now(),
+            content=content.strip(),
+            source=self.source_name,
+            view_count=view_count,
+            reply_count=reply_count,
+            crawl_time=datetime.now(),
+        )
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+详情页内容缓存
+按帖子URL持久化已提取的详情内容，评论数变化或超过有效期时才重新抓取
+"""
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import os
+import time
+from loguru import logger
+
+
+class DetailCache:
+    """基于JSON文件的详情页内容缓存"""
+    
+    def __init__(self, cache_file: str, ttl: float = 24 * 3600):
+        """
+        初始化缓存
+        
+        Args:
+            cache_file: 缓存文件路径
+            ttl: 缓存有效期（秒）
+        """
+        self.cache_file = Path(cache_file)
+        self.ttl = ttl
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+    
+    def _load(self) -> None:
+        """从磁盘加载缓存"""
+        if not self.cache_file.exists():
+            return
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+            logger.debug(f"加载详情页缓存: {len(self._entries)} 条")
+        except Exception as e:
+            logger.warning(f"详情页缓存文件损坏，已忽略: {e}")
+            self._entries = {}
+    
+    def get(self, url: str, comments: int) -> Optional[Dict]:
+        """
+        读取缓存的详情内容
+        
+        评论数与缓存时不一致（评论区可能有新的链接）或已过期时视为未命中。
+        
+        Args:
+            url: 帖子URL
+            comments: 列表页上的当前评论数
+        
+        Returns:
+            包含 content / comment_links 的字典，未命中返回None
+        """
+        entry = self._entries.get(url)
+        if (
+            entry is None
+            or entry.get('comments') != comments
+            or time.time() - entry.get('cached_at', 0) > self.ttl
+        ):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return entry
+    
+    def put(self, url: str, comments: int, detail: Dict) -> None:
+        """
+        保存详情内容
+        
+        Args:
+            url: 帖子URL
+            comments: 抓取时的评论数
+            detail: 包含 content / comment_links 的字典
+        """
+        self._entries[url] = {
+            'content': detail.get('content', ''),
+            'comment_links': detail.get('comment_links', ''),
+            'comments': comments,
+            'cached_at': time.time(),
+        }
+        self._dirty = True
+    
+    def save(self) -> None:
+        """清理过期条目并写回磁盘"""
+        now = time.time()
+        expired = [
+            url for url, entry in self._entries.items()
+            if now - entry.get('cached_at', 0) > self.ttl
+        ]
+        for url in expired:
+            del self._entries[url]
+        
+        if not self._dirty and not expired:
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"保存详情页缓存失败: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._entries)
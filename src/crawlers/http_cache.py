@@ -0,0 +1,226 @@
+"""
+HTTP条件请求缓存
+按URL保存ETag/Last-Modified和页面内容，服务端返回304时直接使用缓存内容
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+from loguru import logger
+
+
+class HTTPCache:
+    """
+    基于磁盘的HTTP条件请求缓存（LRU淘汰）
+    
+    同一缓存目录只能由一个实例管理（索引和容量淘汰都在实例内），多个爬虫应通过 shared() 共用实例。
+    """
+    
+    INDEX_FILE = 'index.json'
+    
+    # 缓存目录 -> 共用的实例
+    _shared: Dict[Path, 'HTTPCache'] = {}
+    
+    @classmethod
+    def shared(cls, cache_dir: str, max_bytes: int = 50 * 1024 * 1024) -> 'HTTPCache':
+        """
+        获取缓存目录对应的共用实例（不存在时创建）
+        
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存内容总大小上限（字节，只在首次创建时生效）
+        
+        Returns:
+            HTTPCache对象
+        """
+        key = Path(cache_dir).resolve()
+        cache = cls._shared.get(key)
+        if cache is None:
+            cache = cls._shared[key] = cls(cache_dir, max_bytes=max_bytes)
+        return cache
+    
+    def __init__(self, cache_dir: str, max_bytes: int = 50 * 1024 * 1024):
+        """
+        初始化缓存
+        
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存内容总大小上限（字节），超过后按LRU淘汰
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._dirty = False
+        # url -> {'etag', 'last_modified', 'file', 'size'}，按最近使用顺序排列
+        self._index: "OrderedDict[str, Dict]" = OrderedDict()
+        self._load_index()
+    
+    def _load_index(self) -> None:
+        """从磁盘加载缓存索引"""
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return
+        
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            for url, entry in entries:
+                if (self.cache_dir / entry['file']).exists():
+                    self._index[url] = entry
+                    self.total_bytes += entry['size']
+            logger.debug(f"加载HTTP缓存索引: {len(self._index)} 条")
+        except Exception as e:
+            logger.warning(f"HTTP缓存索引损坏，已忽略: {e}")
+            self._index.clear()
+            self.total_bytes = 0
+    
+    def save_index(self) -> None:
+        """将缓存索引写回磁盘"""
+        if not self._dirty:
+            return
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            index_path = self.cache_dir / self.INDEX_FILE
+            tmp_path = index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._index.items()), f, ensure_ascii=False)
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"保存HTTP缓存索引失败: {e}")
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        获取URL对应的条件请求头
+        
+        Args:
+            url: 请求URL
+        
+        Returns:
+            包含 If-None-Match / If-Modified-Since 的请求头字典
+        """
+        entry = self._index.get(url)
+        if not entry:
+            return {}
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def has_body(self, url: str) -> bool:
+        """
+        判断URL是否有可用的缓存内容（索引存在且内容文件未丢失）
+        
+        Args:
+            url: 请求URL
+        
+        Returns:
+            是否可用
+        """
+        entry = self._index.get(url)
+        return entry is not None and (self.cache_dir / entry['file']).exists()
+    
+    def get(self, url: str) -> Optional[str]:
+        """
+        读取缓存内容（命中时更新LRU顺序）
+        
+        Args:
+            url: 请求URL
+        
+        Returns:
+            缓存的页面内容，未命中返回None
+        """
+        entry = self._index.get(url)
+        if not entry:
+            return None
+        
+        try:
+            body = (self.cache_dir / entry['file']).read_text(encoding='utf-8')
+        except OSError:
+            self.invalidate(url)
+            return None
+        
+        self._index.move_to_end(url)
+        self._dirty = True
+        return body
+    
+    def store(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """
+        保存页面内容及校验信息
+        
+        没有ETag和Last-Modified的响应无法做条件请求，不会被缓存。
+        
+        Args:
+            url: 请求URL
+            body: 页面内容
+            etag: 响应头ETag
+            last_modified: 响应头Last-Modified
+        """
+        if not etag and not last_modified:
+            return
+        
+        data = body.encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        
+        file_name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / file_name).write_bytes(data)
+        except OSError as e:
+            logger.error(f"写入HTTP缓存失败: {url}, {e}")
+            return
+        
+        old = self._index.pop(url, None)
+        if old:
+            self.total_bytes -= old['size']
+        
+        self._index[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'file': file_name,
+            'size': len(data),
+        }
+        self.total_bytes += len(data)
+        self._dirty = True
+        self._evict()
+    
+    def _evict(self) -> None:
+        """按LRU顺序淘汰，直到总大小不超过上限"""
+        while self.total_bytes > self.max_bytes and self._index:
+            url = next(iter(self._index))
+            self.invalidate(url)
+            logger.debug(f"HTTP缓存淘汰: {url}")
+    
+    def invalidate(self, url: str) -> None:
+        """
+        删除单条缓存
+        
+        Args:
+            url: 请求URL
+        """
+        entry = self._index.pop(url, None)
+        if not entry:
+            return
+        
+        self.total_bytes -= entry['size']
+        self._dirty = True
+        try:
+            (self.cache_dir / entry['file']).unlink()
+        except OSError:
+            pass
+    
+    def __len__(self) -> int:
+        return len(self._index)
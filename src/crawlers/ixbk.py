@@ -1,136 +1,264 @@
 """
 线报酷爬虫 - https://new.ixbk.net/
 """
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 import asyncio
 from .base import BaseCrawler
+from .detail_cache import DetailCache
+from .ixbk_parser import parse_detail_page, parse_list_page
+from ..config import settings
+from ..storage import SeenStore
 
 
 class IxbkCrawler(BaseCrawler):
     """线报酷爬虫"""
     
-    def __init__(self, fetch_detail: bool = True):
+    def __init__(
+        self,
+        fetch_detail: bool = True,
+        detail_concurrency: Optional[int] = None,
+        crawl_deadline: Optional[float] = None,
+        max_pages: Optional[int] = None,
+        max_age_days: Optional[int] = None,
+        seen_store: Optional[SeenStore] = None
+    ):
         """
         初始化爬虫
         
         Args:
             fetch_detail: 是否爬取详情页获取完整内容（默认True）
+            detail_concurrency: 详情页最大并发数（默认取配置 DETAIL_CONCURRENCY）
+            crawl_deadline: 详情页抓取总时限（秒，默认取配置 CRAWL_DEADLINE，<=0表示不限）
+            max_pages: 最多翻页数（默认取配置 MAX_CRAWL_PAGES）
+            max_age_days: 只爬取最近几天的帖子（默认取配置 MAX_POST_AGE_DAYS）
+            seen_store: 已处理帖子记录（增量模式），提供时只产出新帖子，
+                遇到已处理的帖子即停止翻页（默认在 INCREMENTAL_CRAWL 开启时自动创建）；
+                产出的帖子由调用方保存后调用 mark_seen() 记录
         """
         super().__init__()
         self.source_name = "线报酷"
         self.base_url = "https://new.ixbk.net/"
         self.fetch_detail = fetch_detail
+        self.detail_concurrency = max(1, detail_concurrency or settings.DETAIL_CONCURRENCY)
+        self.crawl_deadline = settings.CRAWL_DEADLINE if crawl_deadline is None else crawl_deadline
+        self.max_pages = max_pages or settings.MAX_CRAWL_PAGES
+        self.max_age_days = max_age_days or settings.MAX_POST_AGE_DAYS
+        self.seen_store = seen_store
+        if self.seen_store is None and settings.INCREMENTAL_CRAWL:
+            self.seen_store = SeenStore(settings.SEEN_STORE_PATH)
+        # 本次产出、内容完整、等待 mark_seen() 记录的帖子（url -> 帖子）
+        self._pending_seen: Dict[str, Dict] = {}
+        self.detail_cache: Optional[DetailCache] = None
+        if settings.DETAIL_CACHE_ENABLED:
+            self.detail_cache = DetailCache(
+                settings.DETAIL_CACHE_FILE,
+                ttl=settings.DETAIL_CACHE_TTL_HOURS * 3600
+            )
+        
+    async def crawl_iter(self) -> AsyncIterator[Dict]:
+        """
+        逐条产出线报酷帖子（流式）
+        
+        从首页开始沿“下一页”链接翻页，直到达到最大页数，或遇到早于
+        MAX_POST_AGE_DAYS 的帖子为止。每页的详情页并发抓取，帖子按页面顺序产出。
+        
+        增量模式下（提供了 seen_store）已处理的帖子不再产出也不抓取详情页，
+        遇到已处理的帖子或早于高水位的帖子时停止翻页。产出的帖子不会立即记录为已处理，
+        由调用方保存后调用 mark_seen()；详情页失败或超时（使用列表页内容）的帖子不记录，下次重新抓取。
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.crawl_deadline if self.crawl_deadline and self.crawl_deadline > 0 else None
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+        cutoff = datetime.now() - timedelta(days=self.max_age_days)
+        high_water_mark = self.seen_store.high_water_mark() if self.seen_store else None
+        self._pending_seen = {}
         
-    async def crawl(self) -> List[Dict]:
-        """爬取线报酷首页内容"""
+        url = self.base_url
+        page = 1
+        total = 0
         try:
-            # 获取首页HTML
-            html = await self.fetch_page(self.base_url)
-            if not html:
-                self.logger.error("获取线报酷页面失败")
-                return []
-            
-            soup = self.parse_html(html)
-            posts = []
-            
-            # 找到所有文章列表项
-            article_list = soup.find('ul', class_='new-post')
-            if not article_list:
-                self.logger.error("未找到文章列表")
-                return []
-            
-            articles = article_list.find_all('li', class_='article-list')
-            self.logger.info(f"找到 {len(articles)} 篇文章")
-            
-            for article in articles:
-                try:
-                    post = await self._parse_article(article)
-                    if post:
-                        posts.append(post)
-                except Exception as e:
-                    self.logger.error(f"解析文章失败: {e}")
-                    continue
+            while url and page <= self.max_pages:
+                # 获取列表页HTML
+                html = await self.fetch_page(url)
+                if not html:
+                    self.logger.error(f"获取线报酷页面失败: {url}")
+                    break
+                
+                # 在解析执行器中解析列表页
+                result = await self.run_parser(parse_list_page, html, self.base_url)
+                if result is None:
+                    self.logger.error("未找到文章列表")
+                    break
+                
+                self.logger.info(f"找到 {len(result['items'])} 篇文章")
+                posts = [self._build_post(item) for item in result['items']]
+                
+                # 列表按时间倒序，遇到过旧的帖子即停止翻页
+                fresh_posts = [post for post in posts if post['publish_time'] >= cutoff]
+                reached_cutoff = len(fresh_posts) < len(posts)
+                
+                # 增量模式：跳过已处理的帖子，遇到已处理的帖子或早于高水位即停止翻页
+                reached_known = False
+                if self.seen_store is not None:
+                    known = self.seen_store.known(post['url'] for post in fresh_posts)
+                    reached_known = bool(known) or bool(
+                        high_water_mark and fresh_posts
+                        and fresh_posts[-1]['publish_time'] < high_water_mark
+                    )
+                    fresh_posts = [post for post in fresh_posts if post['url'] not in known]
+                    self.logger.info(f"第 {page} 页新帖子 {len(fresh_posts)} 篇，已处理 {len(known)} 篇")
+                
+                async for post, complete in self._iter_details(fresh_posts, semaphore, deadline):
+                    total += 1
+                    if complete and self.seen_store is not None:
+                        self._pending_seen[post['url']] = post
+                    yield post
+                
+                if reached_cutoff:
+                    self.logger.info(f"第 {page} 页已到达 {self.max_age_days} 天时间范围，停止翻页")
+                    break
+                if reached_known:
+                    self.logger.info(f"第 {page} 页已到达上次爬取位置，停止翻页")
+                    break
+                
+                url = result['next_url']
+                page += 1
             
-            self.logger.info(f"成功解析 {len(posts)} 篇文章")
-            return posts
+            self.logger.info(f"成功解析 {total} 篇文章")
             
         except Exception as e:
             self.logger.error(f"爬取线报酷失败: {e}")
-            return []
+        finally:
+            if self.detail_cache is not None:
+                self.logger.info(
+                    f"详情页缓存累计命中 {self.detail_cache.hits} 次，未命中 {self.detail_cache.misses} 次"
+                )
+                self.detail_cache.save()
     
-    async def _parse_article(self, article) -> Optional[Dict]:
-        """解析单篇文章"""
+    def mark_seen(self) -> int:
+        """
+        将本次产出且内容完整的帖子记录为已处理（增量模式）
+        
+        Returns:
+            记录的帖子数
+        """
+        if self.seen_store is None or not self._pending_seen:
+            return 0
+        posts, self._pending_seen = list(self._pending_seen.values()), {}
+        self.seen_store.mark(posts)
+        return len(posts)
+    
+    async def _iter_details(
+        self,
+        posts: List[Dict],
+        semaphore: asyncio.Semaphore,
+        deadline: Optional[float]
+    ) -> AsyncIterator[Tuple[Dict, bool]]:
+        """
+        以有限并发抓取详情页，并按原顺序逐条产出帖子
+        
+        抓取失败或超过本次爬取总时限的帖子保留列表页内容。
+        
+        Args:
+            posts: 同一列表页解析出的帖子
+            semaphore: 本次爬取共享的并发限制
+            deadline: 总时限对应的事件循环时间，None表示不限
+        
+        Yields:
+            (帖子, 内容是否完整)；未开启详情页抓取时列表页内容即为完整内容
+        """
+        if not self.fetch_detail or not posts:
+            for post in posts:
+                yield post, True
+            return
+        
+        loop = asyncio.get_running_loop()
+        tasks = [asyncio.create_task(self._fill_detail(post, semaphore)) for post in posts]
+        timed_out = 0
         try:
-            # 获取标题和链接
-            title_element = article.find('a')
-            if not title_element:
-                return None
-            
-            title = title_element.get('title', '').strip()
-            link = title_element.get('href', '').strip()
-            
-            if not title or not link:
-                return None
-            
-            # 补全链接
-            if link.startswith('/'):
-                link = f"https://new.ixbk.net{link}"
-            
-            # 获取时间
-            time_element = article.find('time', class_='badge')
-            time_str = time_element.get_text().strip() if time_element else ""
-            
-            # 获取分类
-            category = title_element.get('data-catename', '未分类')
-            
-            # 获取内容
-            content = title_element.get('data-content', '').strip()
-            
-            # 获取评论数
-            comment_element = article.find('span', class_='badge com')
-            comments = 0
-            if comment_element:
-                comment_text = comment_element.get_text().strip()
-                # 提取数字
-                match = re.search(r'\d+', comment_text)
-                if match:
-                    comments = int(match.group())
-            
-            # 获取发布者
-            author = title_element.get('data-louzhu', '匿名')
-            
-            # 解析时间
-            pub_date = self._parse_time(time_str)
-            
-            # 如果启用详情页抓取，获取完整内容
-            full_content = content or title
-            if self.fetch_detail:
-                detail_content = await self._fetch_detail_content(link)
-                if detail_content:
-                    full_content = detail_content
-            
-            # 创建文章字典
-            post = self.create_post_dict(
-                title=title,
-                url=link,
-                author=author,
-                publish_time=pub_date,
-                content=full_content
+            for post, task in zip(posts, tasks):
+                timeout = None if deadline is None else max(0, deadline - loop.time())
+                done, _ = await asyncio.wait([task], timeout=timeout)
+                complete = False
+                if not done:
+                    task.cancel()
+                    timed_out += 1
+                elif task.exception():
+                    self.logger.error(f"抓取详情页失败: {task.exception()}")
+                else:
+                    complete = task.result()
+                yield post, complete
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        if timed_out:
+            self.logger.warning(
+                f"详情页抓取超时（{self.crawl_deadline}s），{timed_out}/{len(posts)} 篇使用列表页内容"
             )
+    
+    async def _fill_detail(self, post: Dict, semaphore: asyncio.Semaphore) -> bool:
+        """
+        抓取单篇帖子的详情页，成功时原地替换帖子内容
+        
+        Args:
+            post: 帖子字典
+            semaphore: 并发限制
+        
+        Returns:
+            是否取得详情页内容（失败时帖子保留列表页内容）
+        """
+        # 评论数未变化且未过期时直接使用缓存，不再请求详情页
+        if self.detail_cache is not None:
+            cached = self.detail_cache.get(post['url'], post.get('comments', 0))
+            if cached is not None:
+                post['content'] = cached['content']
+                post['comment_links'] = cached.get('comment_links', '')
+                return True
+        
+        async with semaphore:
+            detail = await self._fetch_detail_content(post['url'])
+        if detail:
+            post['content'] = detail['content'].strip()
+            post['comment_links'] = detail['comment_links']
+            if self.detail_cache is not None:
+                self.detail_cache.put(
+                    post['url'],
+                    post.get('comments', 0),
+                    {'content': post['content'], 'comment_links': detail['comment_links']}
+                )
+        return bool(detail)
+    
+    def _build_post(self, item: Dict) -> Dict:
+        """
+        根据列表页提取的文章信息创建帖子字典（详情页由 _fill_detail 补充）
+        
+        Args:
+            item: parse_list_page 提取的文章信息
             
-            # 添加分类信息
-            post['category'] = category
-            
-            # 添加额外信息
-            post['comments'] = comments
-            
-            return post
-            
-        except Exception as e:
-            self.logger.error(f"解析文章元素失败: {e}")
-            return None
+        Returns:
+            帖子字典
+        """
+        # 创建文章字典（详情页失败或超时时保留列表页的 data-content）
+        post = self.create_post_dict(
+            title=item['title'],
+            url=item['url'],
+            author=item['author'],
+            publish_time=self._parse_time(item['time_str']),
+            content=item['content'] or item['title']
+        )
+        
+        # 添加分类信息
+        post['category'] = item['category']
+        
+        # 添加额外信息
+        post['comments'] = item['comments']
+        
+        return post
     
     def _parse_time(self, time_str: str) -> datetime:
         """
@@ -138,11 +266,25 @@ class IxbkCrawler(BaseCrawler):
         支持格式：
         - "11:00" -> 今天11:00
         - "10:59" -> 今天10:59
+        - "10-15" / "2024-10-15" -> 对应日期（翻页后的旧帖子）
         """
         try:
             if not time_str:
                 return datetime.now()
             
+            # 匹配 [YYYY-]MM-DD 格式
+            match = re.match(r'(?:(\d{4})-)?(\d{1,2})-(\d{1,2})', time_str)
+            if match:
+                now = datetime.now()
+                year = int(match.group(1)) if match.group(1) else now.year
+                pub_date = datetime(year, int(match.group(2)), int(match.group(3)))
+                
+                # 没有年份且日期比现在晚，说明是去年的
+                if not match.group(1) and pub_date > now:
+                    pub_date = pub_date.replace(year=year - 1)
+                
+                return pub_date
+            
             # 匹配 HH:MM 格式
             match = re.match(r'(\d{1,2}):(\d{2})', time_str)
             if match:
@@ -165,7 +307,7 @@ class IxbkCrawler(BaseCrawler):
             self.logger.error(f"解析时间失败: {time_str}, {e}")
             return datetime.now()
     
-    async def _fetch_detail_content(self, url: str) -> Optional[str]:
+    async def _fetch_detail_content(self, url: str) -> Optional[Dict]:
         """
         获取详情页的核心内容信息（包含评论区的链接和获取方法）
         
@@ -173,7 +315,8 @@ class IxbkCrawler(BaseCrawler):
             url: 详情页URL
             
         Returns:
-            格式化的核心内容（正文+原文链接+评论区链接）
+            字典：content 为格式化的核心内容（正文+原文链接+评论区链接），
+            comment_links 为评论区提取的链接信息；失败返回None
         """
         try:
             # 获取详情页HTML
@@ -181,106 +324,9 @@ class IxbkCrawler(BaseCrawler):
             if not html:
                 return None
             
-            soup = self.parse_html(html)
-            content_parts = []
-            
-            # 1. 获取文章正文（核心线报信息）
-            article_content = soup.find('div', class_='article-content')
-            if article_content:
-                text = article_content.get_text('\n', strip=True)
-                if text:
-                    content_parts.append(text)
-            
-            # 2. 获取原文购买链接
-            source_link = soup.find('a', text=lambda t: t and '原文地址' in t)
-            if source_link:
-                href = source_link.get('href', '')
-                if href:
-                    content_parts.append(f"\n🔗 原文链接: {href}")
-            
-            # 3. 提取评论区的链接和获取方法
-            comment_links = self._extract_comment_links(soup)
-            if comment_links:
-                content_parts.append("\n\n💬 评论区补充:")
-                content_parts.append(comment_links)
-            
-            if content_parts:
-                return '\n\n'.join(content_parts)
-            
-            return None
+            # 在解析执行器中提取正文、原文链接和评论区链接
+            return await self.run_parser(parse_detail_page, html)
             
         except Exception as e:
             self.logger.error(f"获取详情页内容失败 {url}: {e}")
             return None
-    
-    def _extract_comment_links(self, soup) -> str:
-        """
-        从评论区提取商品链接和获取方法
-        
-        Args:
-            soup: BeautifulSoup对象
-            
-        Returns:
-            格式化的评论链接信息
-        """
-        try:
-            links_info = []
-            
-            # 查找评论列表
-            comment_list = soup.find('div', class_='comment-list')
-            if not comment_list:
-                return ""
-            
-            # 查找所有评论容器
-            comment_uls = comment_list.find_all('div', class_='ul')
-            
-            for i, ul in enumerate(comment_uls[:10], 1):  # 最多取10条评论
-                try:
-                    li = ul.find('div', class_='li')
-                    if not li:
-                        continue
-                    
-                    # 获取评论内容
-                    content_elem = li.find('div', class_='c-neirong')
-                    if not content_elem:
-                        continue
-                    
-                    comment_text = content_elem.get_text().strip()
-                    
-                    # 提取评论中的所有链接
-                    links = content_elem.find_all('a')
-                    for link in links:
-                        href = link.get('href', '')
-                        link_text = link.get_text().strip()
-                        if href:
-                            # 记录链接和上下文
-                            links_info.append(f"[{i}] {link_text}: {href}")
-                    
-                    # 如果评论中没有<a>标签，但包含URL文本
-                    if not links:
-                        # 使用正则提取URL
-                        import re
-                        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-                        urls = re.findall(url_pattern, comment_text)
-                        if urls:
-                            for url in urls:
-                                links_info.append(f"[{i}] {url}")
-                        # 也提取包含获取方法的关键信息
-                        elif any(keyword in comment_text for keyword in ['口令', '密令', '链接', '进入', '搜索', '打开']):
-                            # 这条评论可能包含获取方法
-                            if len(comment_text) < 200:  # 只保留较短的说明
-                                links_info.append(f"[{i}] {comment_text}")
-                        
-                except Exception as e:
-                    self.logger.debug(f"处理单条评论失败: {e}")
-                    continue
-            
-            if links_info:
-                return '\n'.join(links_info)
-            
-            return ""
-            
-        except Exception as e:
-            self.logger.error(f"提取评论链接失败: {e}")
-            return ""
-    
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+线报酷页面提取器
+纯函数：输入HTML，输出普通字典，可在线程池/进程池中执行而不阻塞事件循环
+"""
+from typing import Dict, Optional, Union
+from urllib.parse import urljoin
+import re
+from bs4 import SoupStrainer
+from loguru import logger
+from .base import has_class, make_soup
+
+
+# 列表页只需要文章列表和分页链接
+LIST_PAGE_STRAINER = SoupStrainer(
+    lambda name, attrs: (name == 'ul' and has_class(attrs, 'new-post')) or name == 'a'
+)
+
+# 详情页只需要正文、原文地址链接和评论区
+DETAIL_PAGE_STRAINER = SoupStrainer(
+    lambda name, attrs: (
+        (name == 'div' and (has_class(attrs, 'article-content') or has_class(attrs, 'comment-list')))
+        or name == 'a'
+    )
+)
+
+
+def parse_list_page(html: Union[str, bytes], base_url: str) -> Optional[Dict]:
+    """
+    解析列表页
+    
+    Args:
+        html: 列表页HTML
+        base_url: 站点地址（用于补全分页链接）
+    
+    Returns:
+        字典：items 为文章信息列表，next_url 为下一页URL（没有则为None）；
+        未找到文章列表返回None
+    """
+    soup = make_soup(html, LIST_PAGE_STRAINER)
+    
+    # 找到所有文章列表项
+    article_list = soup.find('ul', class_='new-post')
+    if not article_list:
+        return None
+    
+    items = []
+    for article in article_list.find_all('li', class_='article-list'):
+        try:
+            item = parse_article(article)
+            if item:
+                items.append(item)
+        except Exception as e:
+            logger.error(f"解析文章失败: {e}")
+            continue
+    
+    return {
+        'items': items,
+        'next_url': next_page_url(soup, base_url),
+    }
+
+
+def parse_article(article) -> Optional[Dict]:
+    """
+    解析列表页中的单篇文章
+    
+    Args:
+        article: 文章列表项（li.article-list）
+    
+    Returns:
+        文章信息字典（发布时间为原始字符串 time_str），无效条目返回None
+    """
+    # 获取标题和链接
+    title_element = article.find('a')
+    if not title_element:
+        return None
+    
+    title = title_element.get('title', '').strip()
+    link = title_element.get('href', '').strip()
+    
+    if not title or not link:
+        return None
+    
+    # 补全链接
+    if link.startswith('/'):
+        link = f"https://new.ixbk.net{link}"
+    
+    # 获取时间
+    time_element = article.find('time', class_='badge')
+    time_str = time_element.get_text().strip() if time_element else ""
+    
+    # 获取评论数
+    comment_element = article.find('span', class_='badge com')
+    comments = 0
+    if comment_element:
+        comment_text = comment_element.get_text().strip()
+        # 提取数字
+        match = re.search(r'\d+', comment_text)
+        if match:
+            comments = int(match.group())
+    
+    return {
+        'title': title,
+        'url': link,
+        'time_str': time_str,
+        'category': title_element.get('data-catename', '未分类'),
+        'content': title_element.get('data-content', '').strip(),
+        'comments': comments,
+        'author': title_element.get('data-louzhu', '匿名'),
+    }
+
+
+def next_page_url(soup, base_url: str) -> Optional[str]:
+    """
+    从列表页的分页导航中获取下一页链接
+    
+    Args:
+        soup: 列表页BeautifulSoup对象
+        base_url: 站点地址
+    
+    Returns:
+        下一页URL，没有下一页返回None
+    """
+    next_link = soup.find('a', rel='next') or soup.find('a', string=lambda t: t and '下一页' in t)
+    if not next_link:
+        return None
+    
+    href = next_link.get('href', '').strip()
+    if not href or href.startswith('javascript'):
+        return None
+    
+    return urljoin(base_url, href)
+
+
+def parse_detail_page(html: Union[str, bytes]) -> Optional[Dict]:
+    """
+    提取详情页的核心内容信息（包含评论区的链接和获取方法）
+    
+    Args:
+        html: 详情页HTML
+    
+    Returns:
+        字典：content 为格式化的核心内容（正文+原文链接+评论区链接），
+        comment_links 为评论区提取的链接信息；没有可用内容返回None
+    """
+    soup = make_soup(html, DETAIL_PAGE_STRAINER)
+    content_parts = []
+    
+    # 1. 获取文章正文（核心线报信息）
+    article_content = soup.find('div', class_='article-content')
+    if article_content:
+        text = article_content.get_text('\n', strip=True)
+        if text:
+            content_parts.append(text)
+    
+    # 2. 获取原文购买链接
+    source_link = soup.find('a', text=lambda t: t and '原文地址' in t)
+    if source_link:
+        href = source_link.get('href', '')
+        if href:
+            content_parts.append(f"\n🔗 原文链接: {href}")
+    
+    # 3. 提取评论区的链接和获取方法
+    comment_links = extract_comment_links(soup)
+    if comment_links:
+        content_parts.append("\n\n💬 评论区补充:")
+        content_parts.append(comment_links)
+    
+    if content_parts:
+        return {
+            'content': '\n\n'.join(content_parts),
+            'comment_links': comment_links,
+        }
+    
+    return None
+
+
+def extract_comment_links(soup) -> str:
+    """
+    从评论区提取商品链接和获取方法
+    
+    Args:
+        soup: BeautifulSoup对象
+    
+    Returns:
+        格式化的评论链接信息
+    """
+    try:
+        links_info = []
+        
+        # 查找评论列表
+        comment_list = soup.find('div', class_='comment-list')
+        if not comment_list:
+            return ""
+        
+        # 查找所有评论容器
+        comment_uls = comment_list.find_all('div', class_='ul')
+        
+        for i, ul in enumerate(comment_uls[:10], 1):  # 最多取10条评论
+            try:
+                li = ul.find('div', class_='li')
+                if not li:
+                    continue
+                
+                # 获取评论内容
+                content_elem = li.find('div', class_='c-neirong')
+                if not content_elem:
+                    continue
+                
+                comment_text = content_elem.get_text().strip()
+                
+                # 提取评论中的所有链接
+                links = content_elem.find_all('a')
+                for link in links:
+                    href = link.get('href', '')
+                    link_text = link.get_text().strip()
+                    if href:
+                        # 记录链接和上下文
+                        links_info.append(f"[{i}] {link_text}: {href}")
+                
+                # 如果评论中没有<a>标签，但包含URL文本
+                if not links:
+                    # 使用正则提取URL
+                    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
+                    urls = re.findall(url_pattern, comment_text)
+                    if urls:
+                        for url in urls:
+                            links_info.append(f"[{i}] {url}")
+                    # 也提取包含获取方法的关键信息
+                    elif any(keyword in comment_text for keyword in ['口令', '密令', '链接', '进入', '搜索', '打开']):
+                        # 这条评论可能包含获取方法
+                        if len(comment_text) < 200:  # 只保留较短的说明
+                            links_info.append(f"[{i}] {comment_text}")
+            
+            except Exception as e:
+                logger.debug(f"处理单条评论失败: {e}")
+                continue
+        
+        if links_info:
+            return '\n'.join(links_info)
+        
+        return ""
+    
+    except Exception as e:
+        logger.error(f"提取评论链接失败: {e}")
+        return ""
@@ -0,0 +1,124 @@
+"""
+按主机的自适应限速器
+令牌桶限速，根据429/5xx等异常响应自动降速（乘性减少、加性恢复）
+"""
+from typing import Dict, Optional
+import asyncio
+import time
+from loguru import logger
+
+
+class TokenBucket:
+    """单个主机的令牌桶"""
+    
+    def __init__(self, rate: float, burst: int, min_rate: float):
+        """
+        初始化令牌桶
+        
+        Args:
+            rate: 初始及最大速率（请求/秒）
+            burst: 桶容量（允许的突发请求数）
+            min_rate: 自适应降速的最低速率
+        """
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """获取一个令牌，不足时等待"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def on_success(self) -> None:
+        """请求成功：加性恢复速率"""
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+    
+    def on_throttle(self, pause: float = 0.0) -> None:
+        """
+        请求被限流或服务端出错：速率减半，并可暂停一段时间
+        
+        Args:
+            pause: 暂停秒数（如 Retry-After）
+        """
+        self.rate = max(self.min_rate, self.rate * 0.5)
+        self.tokens = min(self.tokens, 0.0)
+        if pause > 0:
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+
+class HostRateLimiter:
+    """按主机划分的自适应限速器"""
+    
+    # 视为被限流/服务端过载的状态码
+    THROTTLE_STATUS = {429, 500, 502, 503, 504}
+    
+    def __init__(self, rate: float = 5.0, burst: int = 5, min_rate: float = 0.2):
+        """
+        初始化限速器
+        
+        Args:
+            rate: 每个主机的最大请求速率（请求/秒），<=0 表示不限速
+            burst: 每个主机允许的突发请求数
+            min_rate: 自适应降速的最低速率
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+    
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if self.rate <= 0:
+            return None
+        
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, self.min_rate)
+            self._buckets[host] = bucket
+        return bucket
+    
+    async def acquire(self, host: str) -> None:
+        """
+        等待直到可以向该主机发送请求
+        
+        Args:
+            host: 主机名
+        """
+        bucket = self._bucket(host)
+        if bucket is not None:
+            await bucket.acquire()
+    
+    def record(self, host: str, status_code: Optional[int], retry_after: float = 0.0) -> None:
+        """
+        记录请求结果，调整该主机的速率
+        
+        Args:
+            host: 主机名
+            status_code: 响应状态码，网络错误/超时传None
+            retry_after: 服务端要求的等待秒数
+        """
+        bucket = self._bucket(host)
+        if bucket is None:
+            return
+        
+        if status_code is None or status_code in self.THROTTLE_STATUS:
+            bucket.on_throttle(retry_after)
+            logger.debug(f"主机 {host} 降速至 {bucket.rate:.2f} 请求/秒")
+        else:
+            bucket.on_success()
\ No newline at end of file
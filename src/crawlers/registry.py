@@ -0,0 +1,151 @@
+"""
+爬虫注册表与多源并发爬虫
+根据 Settings.SOURCES 实例化所有启用的数据源，并发爬取并合并结果
+"""
+from typing import AsyncIterator, Dict, Optional, Type
+import asyncio
+from loguru import logger
+from .base import BaseCrawler
+from .ixbk import IxbkCrawler
+from ..config import settings
+
+
+# 数据源标识 -> 爬虫类（与 Settings.SOURCES 的键对应）
+CRAWLER_REGISTRY: Dict[str, Type[BaseCrawler]] = {
+    'ixbk': IxbkCrawler,
+}
+
+
+def register_crawler(key: str, crawler_cls: Type[BaseCrawler]) -> None:
+    """
+    注册数据源爬虫
+    
+    Args:
+        key: 数据源标识（Settings.SOURCES 中的键）
+        crawler_cls: 爬虫类
+    """
+    CRAWLER_REGISTRY[key] = crawler_cls
+
+
+class MultiSourceCrawler(BaseCrawler):
+    """多源并发爬虫 - 每个数据源独立超时、互不影响"""
+    
+    _DONE = object()
+    
+    def __init__(self, crawlers: Dict[str, BaseCrawler], timeouts: Optional[Dict[str, float]] = None):
+        """
+        初始化多源爬虫
+        
+        Args:
+            crawlers: 数据源标识 -> 爬虫实例
+            timeouts: 数据源标识 -> 爬取超时（秒），未指定时取配置 SOURCE_TIMEOUT
+        """
+        # 聚合爬虫不自行请求页面，不创建限速器和HTTP缓存
+        super().__init__(use_http=False)
+        self.source_name = "多源聚合"
+        self.crawlers = crawlers
+        self.timeouts = timeouts or {}
+    
+    @classmethod
+    def from_settings(cls, sources: Optional[Dict] = None) -> 'MultiSourceCrawler':
+        """
+        根据数据源配置创建多源爬虫
+        
+        Args:
+            sources: 数据源配置（默认取 settings.SOURCES）
+            
+        Returns:
+            MultiSourceCrawler对象
+        """
+        sources = settings.SOURCES if sources is None else sources
+        crawlers = {}
+        timeouts = {}
+        
+        for key, config in sources.items():
+            if not config.get('enabled', False):
+                continue
+            
+            crawler_cls = CRAWLER_REGISTRY.get(key)
+            if crawler_cls is None:
+                logger.warning(f"未注册的数据源: {key}，已跳过")
+                continue
+            
+            crawlers[key] = crawler_cls()
+            if config.get('timeout'):
+                timeouts[key] = float(config['timeout'])
+        
+        return cls(crawlers, timeouts)
+    
+    async def open(self) -> None:
+        """打开所有数据源的连接池"""
+        await asyncio.gather(*(crawler.open() for crawler in self.crawlers.values()))
+    
+    async def close(self) -> None:
+        """关闭所有数据源的连接池"""
+        await asyncio.gather(
+            *(crawler.close() for crawler in self.crawlers.values()),
+            return_exceptions=True
+        )
+    
+    def mark_seen(self) -> int:
+        """将所有数据源本次产出的帖子记录为已处理"""
+        return sum(crawler.mark_seen() for crawler in self.crawlers.values())
+    
+    async def crawl_iter(self) -> AsyncIterator[Dict]:
+        """
+        并发爬取所有数据源，按到达顺序逐条产出帖子
+        
+        单个数据源超时或出错只会丢弃该数据源剩余的帖子，不影响其他数据源；
+        不同数据源中URL相同的帖子只保留先到达的一条。
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._run_source(key, crawler, queue))
+            for key, crawler in self.crawlers.items()
+        ]
+        remaining = len(tasks)
+        seen_urls = set()
+        
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is self._DONE:
+                    remaining -= 1
+                    continue
+                
+                if item['url'] in seen_urls:
+                    continue
+                seen_urls.add(item['url'])
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _run_source(self, key: str, crawler: BaseCrawler, queue: asyncio.Queue) -> None:
+        """
+        在独立超时内爬取单个数据源，把帖子放入合并队列
+        
+        Args:
+            key: 数据源标识
+            crawler: 爬虫实例
+            queue: 合并队列
+        """
+        timeout = self.timeouts.get(key, settings.SOURCE_TIMEOUT)
+        count = 0
+        
+        async def pump() -> None:
+            nonlocal count
+            async for post in crawler.crawl_iter():
+                count += 1
+                await queue.put(post)
+        
+        try:
+            await asyncio.wait_for(pump(), timeout=timeout if timeout > 0 else None)
+            self.logger.info(f"数据源 {key} 爬取完成: {count} 篇")
+        except asyncio.TimeoutError:
+            self.logger.warning(f"数据源 {key} 爬取超时（{timeout}s），已获取 {count} 篇")
+        except Exception as e:
+            self.logger.error(f"数据源 {key} 爬取失败: {e}")
+        finally:
+            queue.put_nowait(self._DONE)
\ No newline at end of file
@@ -2,5 +2,8 @@
 过滤模块
 """
 from .quality_filter import QualityFilter
+from .topk import TopKFilter
+from .dedup import NearDuplicateFilter
+from .rules import RuleSnapshot
 
-__all__ = ['QualityFilter']
\ No newline at end of file
+__all__ = ['QualityFilter', 'TopKFilter', 'NearDuplicateFilter', 'RuleSnapshot']
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+近似重复线报检测
+对标题和内容计算SimHash指纹，用LSH分段索引查找汉明距离相近的指纹，
+同一线报的多个版本只保留分数最高的一条；指纹索引可持久化到JSON文件，时间窗口跨越多次爬取
+"""
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import heapq
+import json
+import os
+import re
+from loguru import logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 计算指纹前去掉的空白和标点
+_NOISE_PATTERN = re.compile(r'[\s\W_]+', re.UNICODE)
+
+
+def simhash(text: str, bits: int = 64, shingle: int = 2) -> int:
+    """
+    计算文本的SimHash指纹
+    
+    Args:
+        text: 文本
+        bits: 指纹位数
+        shingle: 字符n-gram长度（中文按字切分）
+        
+    Returns:
+        指纹整数
+    """
+    text = _NOISE_PATTERN.sub('', text.lower())
+    if len(text) <= shingle:
+        features = Counter([text]) if text else Counter()
+    else:
+        features = Counter(text[i:i + shingle] for i in range(len(text) - shingle + 1))
+    if not features:
+        return 0
+    
+    hashes = [
+        int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for f in features
+    ]
+    weights = list(features.values())
+    
+    if np is not None and bits <= 64:
+        h = np.array(hashes, dtype=np.uint64)
+        bit_matrix = (h[:, None] >> np.arange(bits, dtype=np.uint64)) & np.uint64(1)
+        vector = (np.where(bit_matrix == 1, 1, -1) * np.array(weights)[:, None]).sum(axis=0)
+        return sum(1 << i for i in range(bits) if vector[i] > 0)
+    
+    vector = [0] * bits
+    for h, w in zip(hashes, weights):
+        for i in range(bits):
+            vector[i] += w if (h >> i) & 1 else -w
+    return sum(1 << i for i in range(bits) if vector[i] > 0)
+
+
+class NearDuplicateFilter:
+    """基于SimHash + LSH的近似重复过滤器"""
+    
+    BITS = 64
+    
+    def __init__(
+        self,
+        max_distance: int = 3,
+        window_hours: float = 72,
+        score_func: Optional[Callable[[Dict], float]] = None,
+        content_chars: int = 200,
+        state_file: Optional[str] = None
+    ):
+        """
+        初始化过滤器
+        
+        Args:
+            max_distance: 指纹汉明距离不超过该值视为重复（越大越宽松）
+            window_hours: 只与该时间窗口内的线报比较，窗口外的指纹会被淘汰
+            score_func: 评分函数，重复时保留分数最高的一条（帖子已有 quality_score 字段时直接使用，
+                不再调用；默认使用 quality_score 字段）
+            content_chars: 参与指纹计算的内容前缀长度（评论区链接等尾部信息不参与）
+            state_file: 指纹索引的持久化文件路径（可选，不提供则只在内存中保留，窗口不跨进程）
+        """
+        self.max_distance = max_distance
+        self.window = timedelta(hours=window_hours)
+        self.score_func = score_func or (lambda post: post.get('quality_score', 0))
+        self.content_chars = content_chars
+        
+        # 按鸽巢原理分为 max_distance+1 段：汉明距离不超过 max_distance 的两个指纹至少有一段完全相同
+        self.bands = max_distance + 1
+        self._band_bits = -(-self.BITS // self.bands)
+        self._band_mask = (1 << self._band_bits) - 1
+        
+        # 指纹索引: id -> (指纹, URL, 分数, 发布时间)
+        self._entries: Dict[int, Tuple[int, str, float, datetime]] = {}
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self._by_url: Dict[str, int] = {}
+        # 按发布时间排序的小顶堆 (发布时间, id)；已删除的条目留在堆中，弹出或压缩时跳过
+        self._by_time: List[Tuple[datetime, int]] = []
+        self._next_id = 0
+        self._latest: Optional[datetime] = None
+        
+        self.state_file = Path(state_file) if state_file else None
+        self._dirty = False
+        self._load()
+    
+    def _load(self) -> None:
+        """从磁盘加载指纹索引，并淘汰时间窗口之外的条目"""
+        if self.state_file is None or not self.state_file.exists():
+            return
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                for fp, url, score, pub_time in json.load(f):
+                    self._add(int(fp), url, float(score), datetime.fromisoformat(pub_time))
+            self._expire()
+            self._dirty = False
+            logger.debug(f"加载近似去重索引: {len(self._entries)} 条")
+        except Exception as e:
+            logger.warning(f"近似去重索引文件损坏，已忽略: {e}")
+            self._entries.clear()
+            self._buckets.clear()
+            self._by_url.clear()
+            self._by_time = []
+            self._latest = None
+    
+    def save(self) -> None:
+        """持久化指纹索引（未配置文件路径或没有变化时忽略）"""
+        if self.state_file is None or not self._dirty:
+            return
+        
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_file.with_suffix('.tmp')
+            entries = [
+                (fp, url, score, pub_time.isoformat())
+                for fp, url, score, pub_time in self._entries.values()
+            ]
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_file)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"保存近似去重索引失败: {e}")
+    
+    def fingerprint(self, post: Dict) -> int:
+        """
+        计算帖子的指纹
+        
+        Args:
+            post: 帖子数据字典
+            
+        Returns:
+            SimHash指纹
+        """
+        text = f"{post.get('title', '')} {post.get('content', '')[:self.content_chars]}"
+        return simhash(text, self.BITS)
+    
+    def _band_keys(self, fp: int) -> List[Tuple[int, int]]:
+        return [(i, (fp >> (i * self._band_bits)) & self._band_mask) for i in range(self.bands)]
+    
+    def _find_duplicate(self, fp: int, url: str) -> Optional[int]:
+        """在索引中查找近似重复的条目（同一URL视为同一帖子，不算重复）"""
+        seen = set()
+        for key in self._band_keys(fp):
+            for entry_id in self._buckets.get(key, ()):
+                if entry_id in seen or entry_id not in self._entries:
+                    continue
+                seen.add(entry_id)
+                other_fp, other_url, _, _ = self._entries[entry_id]
+                if other_url != url and bin(fp ^ other_fp).count('1') <= self.max_distance:
+                    return entry_id
+        return None
+    
+    def _add(self, fp: int, url: str, score: float, pub_time: datetime) -> None:
+        # 同一帖子再次出现（如下次爬取）时替换旧条目
+        if url in self._by_url:
+            self._remove(self._by_url[url])
+        
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (fp, url, score, pub_time)
+        self._by_url[url] = entry_id
+        for key in self._band_keys(fp):
+            self._buckets.setdefault(key, []).append(entry_id)
+        heapq.heappush(self._by_time, (pub_time, entry_id))
+        self._latest = pub_time if self._latest is None else max(self._latest, pub_time)
+        self._dirty = True
+    
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        self._dirty = True
+        if self._by_url.get(entry[1]) == entry_id:
+            del self._by_url[entry[1]]
+        for key in self._band_keys(entry[0]):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.remove(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+    
+    def _expire(self) -> None:
+        """淘汰时间窗口之外的指纹"""
+        if self._latest is None:
+            return
+        cutoff = self._latest - self.window
+        while self._by_time and self._by_time[0][0] < cutoff:
+            _, entry_id = heapq.heappop(self._by_time)
+            self._remove(entry_id)
+        
+        # 被替换的条目在堆中留下失效记录，过多时重建堆，保证占用与窗口内的条目数成正比
+        if len(self._by_time) > 2 * len(self._entries) + 64:
+            self._by_time = [(entry[3], entry_id) for entry_id, entry in self._entries.items()]
+            heapq.heapify(self._by_time)
+    
+    def dedupe(self, posts: List[Dict]) -> List[Dict]:
+        """
+        去除近似重复的帖子
+        
+        按分数从高到低处理，与已保留（包括之前批次）的帖子近似重复时只保留分数较高者。
+        
+        Args:
+            posts: 帖子列表
+            
+        Returns:
+            去重后的帖子列表（保持原顺序）
+        """
+        scored = []
+        for index, post in enumerate(posts):
+            pub_time = post.get('publish_time')
+            if not isinstance(pub_time, datetime):
+                pub_time = datetime.now()
+            score = post.get('quality_score')
+            if score is None:
+                score = self.score_func(post)
+            scored.append((score, index, post, pub_time))
+        
+        # 先按发布时间入窗口，再按分数从高到低决定保留哪一条
+        for _, _, _, pub_time in scored:
+            self._latest = pub_time if self._latest is None else max(self._latest, pub_time)
+        self._expire()
+        
+        kept = []
+        dropped = 0
+        for score, index, post, pub_time in sorted(scored, key=lambda x: (-x[0], x[1])):
+            if self._latest and pub_time < self._latest - self.window:
+                kept.append((index, post))
+                continue
+            
+            fp = self.fingerprint(post)
+            duplicate_id = self._find_duplicate(fp, post.get('url', ''))
+            if duplicate_id is not None:
+                _, other_url, other_score, _ = self._entries[duplicate_id]
+                if other_score >= score:
+                    dropped += 1
+                    logger.debug(f"近似重复，已跳过: {post.get('title', '')[:40]} ≈ {other_url}")
+                    continue
+                # 新帖子分数更高：以它替换索引中的旧条目
+                self._remove(duplicate_id)
+            
+            self._add(fp, post.get('url', ''), score, pub_time)
+            kept.append((index, post))
+        
+        self._expire()
+        if dropped:
+            logger.info(f"近似去重: 输入 {len(posts)} 条，去除重复 {dropped} 条")
+        
+        kept.sort(key=lambda x: x[0])
+        return [post for _, post in kept]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
\ No newline at end of file
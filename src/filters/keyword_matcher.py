@@ -0,0 +1,148 @@
+"""
+多模式关键词匹配器（Aho-Corasick自动机）
+关键词表编译一次，单次扫描文本即可找出所有出现的关键词
+"""
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick（可选，C实现）
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Aho-Corasick关键词匹配器，语义等价于对每个关键词做 keyword in text"""
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        编译关键词表
+        
+        Args:
+            keywords: 关键词（大小写敏感，空字符串会被忽略）
+        """
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            if self.keywords:
+                self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._build(self.keywords)
+    
+    def _build(self, keywords: List[str]) -> None:
+        """构建纯Python的trie和失败指针"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        
+        # 1. 构建trie
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] = (keyword,)
+        
+        # 2. 广度优先计算失败指针，并合并后缀状态的输出
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_target = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = fail_target if fail_target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+    
+    def to_state(self) -> Dict[str, Any]:
+        """
+        导出编译结果（纯Python实现的trie、失败指针和输出表，可JSON序列化）
+        
+        Returns:
+            状态字典，可用 from_state() 恢复
+        """
+        if not hasattr(self, '_goto'):
+            self._build(self.keywords)
+        return {
+            'keywords': self.keywords,
+            'goto': self._goto,
+            'fail': self._fail,
+            'out': [list(out) for out in self._out],
+        }
+    
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> 'KeywordMatcher':
+        """
+        从 to_state() 导出的状态恢复匹配器（安装了pyahocorasick时直接重新编译）
+        
+        Args:
+            state: 状态字典
+        
+        Returns:
+            关键词匹配器
+        
+        Raises:
+            ValueError: 状态格式不正确
+        """
+        keywords = state.get('keywords')
+        if not isinstance(keywords, list) or not all(isinstance(k, str) and k for k in keywords):
+            raise ValueError("匹配器状态的 keywords 必须是非空字符串列表")
+        if ahocorasick is not None:
+            return cls(keywords)
+        
+        goto, fail, out = state.get('goto'), state.get('fail'), state.get('out')
+        if not (
+            isinstance(goto, list) and isinstance(fail, list) and isinstance(out, list)
+            and len(goto) == len(fail) == len(out) > 0
+            and all(isinstance(edges, dict) for edges in goto)
+            and all(isinstance(target, int) and 0 <= target < len(goto) for edges in goto for target in edges.values())
+            and all(isinstance(target, int) and 0 <= target < len(goto) for target in fail)
+        ):
+            raise ValueError("匹配器状态的 goto / fail / out 表不一致")
+        
+        matcher = cls.__new__(cls)
+        matcher.keywords = keywords
+        matcher._automaton = None
+        matcher._goto = goto
+        matcher._fail = fail
+        matcher._out = [tuple(keywords_out) for keywords_out in out]
+        return matcher
+    
+    def find(self, text: str) -> Set[str]:
+        """
+        找出文本中出现的所有关键词
+        
+        Args:
+            text: 待匹配文本
+            
+        Returns:
+            出现过的关键词集合
+        """
+        if not self.keywords or not text:
+            return set()
+        
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
\ No newline at end of file
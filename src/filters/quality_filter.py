@@ -2,88 +2,201 @@
 内容质量过滤器
 基于关键词和规则对羊毛线报进行质量评分和过滤
 """
-from typing import Dict, List
+from typing import AsyncIterable, Dict, Iterable, List, Mapping, Optional, Union
 from datetime import datetime, timedelta
+from types import MappingProxyType
+import asyncio
+import os
 from loguru import logger
+from .rules import RuleSnapshot
+from .score_cache import ScoreCache
+from .topk import TopKFilter
+from ..config import settings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class QualityFilter:
     """质量过滤器"""
     
-    def __init__(self, threshold: int = 60):
+    def __init__(
+        self,
+        threshold: int = 60,
+        score_cache: Optional[ScoreCache] = None,
+        rules: Optional[RuleSnapshot] = None
+    ):
         """
         初始化过滤器
         
         Args:
             threshold: 质量分数阈值，低于此分数的内容将被过滤
+            score_cache: 评分缓存（默认按 SCORE_CACHE_SIZE / SCORE_CACHE_FILE 创建，
+                SCORE_CACHE_SIZE 为0时不缓存）
+            rules: 评分规则快照（默认从 QUALITY_RULES_FILE 加载）
         """
         self.threshold = threshold
         self.logger = logger
+        self.score_cache = score_cache
+        self.last_stats: Dict = {}
+        self.last_passed: List[Dict] = []
+        if self.score_cache is None and settings.SCORE_CACHE_SIZE > 0:
+            self.score_cache = ScoreCache(
+                max_entries=settings.SCORE_CACHE_SIZE,
+                cache_file=settings.SCORE_CACHE_FILE or None
+            )
         
-        # 正面关键词及加分（高质量线报特征）
-        self.positive_keywords = {
-            # 实物类 (+20分)
-            '实物': 20, '包邮': 15, '0元购': 25, '免单': 25,
-            
-            # 话费/充值类 (+15分)
-            '话费': 15, '流量': 15, '充值': 12, '红包': 10,
-            
-            # 大平台 (+10分)
-            '京东': 10, '淘宝': 10, '天猫': 10, '拼多多': 10,
-            '支付宝': 12, '微信': 12, '美团': 10, '饿了么': 10,
-            
-            # 优惠力度 (+8分)
-            '限时': 8, '秒杀': 8, '特价': 5, '优惠券': 5,
-            '满减': 5, '折扣': 5,
-            
-            # 质量标识 (+5分)
-            '品牌': 5, '官方': 8, '正品': 5,
-        }
-        
-        # 负面关键词及扣分（低质量/风险内容）
-        self.negative_keywords = {
-            # 高风险操作 (-30分)
-            '砍价': -30, '拉人': -30, '助力': -25, '邀请': -20,
-            '组队': -25, '分享': -18, '转发': -18,
-            
-            # 诱导行为 (-20分)
-            '下载app': -20, '注册': -15, '实名': -15, '绑卡': -20,
-            '贷款': -35, '借款': -35, '理财': -25, '投资': -25,
-            
-            # 不确定性 (-15分)
-            '抽奖': -15, '概率': -12, '随机': -12, '可能': -8,
-            '试试': -10, '碰运气': -12,
+        self.rules = rules if rules is not None else self._load_default_rules()
+    
+    @staticmethod
+    def _load_default_rules() -> RuleSnapshot:
+        """按 QUALITY_RULES_FILE / RULES_CACHE_DIR 加载规则，自定义规则文件不可用时使用内置规则"""
+        cache_dir = settings.RULES_CACHE_DIR or None
+        try:
+            return RuleSnapshot.load(settings.QUALITY_RULES_FILE or None, cache_dir)
+        except (OSError, ValueError) as e:
+            if not settings.QUALITY_RULES_FILE:
+                raise
+            logger.error(f"加载评分规则失败，使用内置规则: {e}")
+            return RuleSnapshot.load(None, cache_dir)
+    
+    @property
+    def positive_keywords(self) -> Mapping[str, float]:
+        """正面关键词及加分（高质量线报特征，只读，修改使用 update_rules）"""
+        return MappingProxyType(self.rules.positive_keywords)
+    
+    @property
+    def negative_keywords(self) -> Mapping[str, float]:
+        """负面关键词及扣分（低质量/风险内容，只读，修改使用 update_rules）"""
+        return MappingProxyType(self.rules.negative_keywords)
+    
+    @property
+    def category_weights(self) -> Mapping[str, float]:
+        """分类权重（只读，修改使用 update_rules）"""
+        return MappingProxyType(self.rules.category_weights)
+    
+    def update_rules(
+        self,
+        positive_keywords: Optional[Mapping[str, float]] = None,
+        negative_keywords: Optional[Mapping[str, float]] = None,
+        category_weights: Optional[Mapping[str, float]] = None
+    ) -> None:
+        """
+        替换关键词表，编译为新的规则快照并替换当前快照
+        
+        规则表是编译后快照的只读视图，直接修改会抛出 TypeError；需要调整时传入新表，
+        例如 update_rules(positive_keywords={**f.positive_keywords, '京东': 15})。
+        
+        Args:
+            positive_keywords: 新的正面关键词表（None表示不变）
+            negative_keywords: 新的负面关键词表（None表示不变）
+            category_weights: 新的分类权重表（None表示不变）
+        """
+        current = self.rules
+        self.rules = RuleSnapshot(
+            current.positive_keywords if positive_keywords is None else positive_keywords,
+            current.negative_keywords if negative_keywords is None else negative_keywords,
+            current.category_weights if category_weights is None else category_weights,
+            source=current.source,
+            mtime=current.mtime
+        )
+    
+    def reload_rules(self, rule_file: Optional[str] = None) -> bool:
+        """
+        重新加载规则文件并原子替换规则快照
+        
+        新快照编译完成后才替换引用，进行中的评分继续使用旧快照，不需要暂停评分；
+        加载失败时保留当前规则。
+        
+        Args:
+            rule_file: 规则文件路径（默认为当前快照的来源文件）
             
-            # 虚假诱导 (-25分)
-            '必中': -25, '100%': -20, '秒到': -15, '躺赚': -30,
+        Returns:
+            规则是否发生变化
+        """
+        current = self.rules
+        try:
+            snapshot = RuleSnapshot.load(
+                rule_file or current.source or None,
+                settings.RULES_CACHE_DIR or None
+            )
+        except (OSError, ValueError) as e:
+            self.logger.error(f"重新加载评分规则失败，继续使用当前规则: {e}")
+            return False
+        
+        self.rules = snapshot
+        changed = snapshot.fingerprint != current.fingerprint
+        if changed:
+            self.logger.info(f"评分规则已更新: {snapshot.source}（{len(snapshot)} 个关键词）")
+        return changed
+    
+    def reload_if_changed(self) -> bool:
+        """
+        规则文件修改时间变化时重新加载规则
+        
+        Returns:
+            规则是否发生变化
+        """
+        current = self.rules
+        if not current.source:
+            return False
+        try:
+            mtime = os.stat(current.source).st_mtime
+        except OSError as e:
+            self.logger.warning(f"无法读取评分规则文件: {e}")
+            return False
+        if mtime == current.mtime:
+            return False
+        return self.reload_rules()
+    
+    async def watch_rules(self, interval: float = 60) -> None:
+        """
+        定期检查规则文件并热更新（长期运行的进程中作为后台任务启动）
+        
+        Args:
+            interval: 检查间隔（秒）
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.reload_if_changed()
+    
+    def _cache_key(self, post: Dict, rules: RuleSnapshot) -> Optional[str]:
+        """
+        生成帖子的评分缓存键
+        
+        Args:
+            post: 帖子数据字典
+            rules: 评分使用的规则快照
             
-            # 复杂操作 (-10分)
-            '需要': -8, '步骤': -10, '教程': -8,
-        }
-        
-        # 分类权重
-        self.category_weights = {
-            '京东': 1.2,      # 京东线报更可靠
-            '淘宝': 1.1,
-            '支付宝': 1.2,
-            '话费': 1.3,      # 话费类很受欢迎
-            '实物': 1.2,
-            '红包': 1.1,
-            '抽奖': 0.7,      # 抽奖类不太靠谱
-            '助力': 0.5,      # 助力类质量较低
-            '砍价': 0.4,      # 砍价类最低
-        }
+        Returns:
+            缓存键，未启用缓存时返回None
+        """
+        if self.score_cache is None:
+            return None
+        return ScoreCache.make_key(
+            rules.fingerprint,
+            post.get('title', ''),
+            post.get('content', ''),
+            post.get('category', ''),
+            post.get('comments', 0)
+        )
     
-    def calculate_score(self, post: Dict) -> float:
+    def calculate_score(self, post: Dict, now: Optional[datetime] = None) -> float:
         """
         计算内容质量分数
         
         Args:
             post: 帖子数据字典
+            now: 计算时效性的参考时间（默认当前时间）
             
         Returns:
             质量分数（0-100）
         """
+        # 整个评分过程只使用同一个规则快照（期间规则可能被热更新）
+        rules = self.rules
+        
         # 基础分数
         score = 50.0
         
@@ -91,36 +204,50 @@ class QualityFilter:
         title = post.get('title', '')
         content = post.get('content', '')
         category = post.get('category', '')
-        text = f"{title} {content} {category}"
-        
-        # 关键词评分
-        positive_score = 0
-        negative_score = 0
-        matched_positive = []
-        matched_negative = []
-        
-        # 正面关键词匹配
-        for keyword, points in self.positive_keywords.items():
-            if keyword in text:
-                positive_score += points
-                matched_positive.append(keyword)
-        
-        # 负面关键词匹配
-        for keyword, points in self.negative_keywords.items():
-            if keyword in text:
-                negative_score += points  # points已经是负数
-                matched_negative.append(keyword)
+        
+        # 与时间无关的部分（关键词分、分类权重）优先从缓存读取
+        cache_key = self._cache_key(post, rules)
+        cached = self.score_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            positive_score, negative_score, category_score = cached
+            matched_positive = matched_negative = '(缓存)'
+        else:
+            text = f"{title} {content} {category}"
+            
+            # 关键词评分
+            positive_score = 0
+            negative_score = 0
+            matched_positive = []
+            matched_negative = []
+            
+            # 单次扫描找出所有命中的关键词
+            matched = sorted(rules.text_matcher.find(text), key=rules.keyword_order.get)
+            
+            # 正面关键词匹配
+            for keyword in matched:
+                if keyword in rules.positive_keywords:
+                    positive_score += rules.positive_keywords[keyword]
+                    matched_positive.append(keyword)
+            
+            # 负面关键词匹配
+            for keyword in matched:
+                if keyword in rules.negative_keywords:
+                    negative_score += rules.negative_keywords[keyword]  # 已经是负数
+                    matched_negative.append(keyword)
+            
+            category_score = self._calculate_category_score(category, rules)
+            if cache_key:
+                self.score_cache.put(cache_key, (positive_score, negative_score, category_score))
         
         score += positive_score + negative_score
         
         # 时效性评分
         pub_time = post.get('publish_time')
         if pub_time:
-            time_score = self._calculate_time_score(pub_time)
+            time_score = self._calculate_time_score(pub_time, now)
             score += time_score
         
         # 分类权重调整
-        category_score = self._calculate_category_score(category)
         score *= category_score
         
         # 评论数加分（有人互动说明有价值）
@@ -142,17 +269,18 @@ class QualityFilter:
         
         return round(score, 1)
     
-    def _calculate_time_score(self, pub_time: datetime) -> float:
+    def _calculate_time_score(self, pub_time: datetime, now: Optional[datetime] = None) -> float:
         """
         根据发布时间计算时效性分数
         
         Args:
             pub_time: 发布时间
+            now: 参考时间（默认当前时间）
             
         Returns:
             时效性分数加成
         """
-        now = datetime.now()
+        now = now or datetime.now()
         
         # 确保pub_time是datetime对象
         if not isinstance(pub_time, datetime):
@@ -176,25 +304,115 @@ class QualityFilter:
         else:
             return -10
     
-    def _calculate_category_score(self, category: str) -> float:
+    def _calculate_category_score(self, category: str, rules: Optional[RuleSnapshot] = None) -> float:
         """
         根据分类计算权重系数
         
         Args:
             category: 分类字符串
+            rules: 规则快照（默认使用当前快照）
             
         Returns:
             权重系数（0.5-1.5）
         """
+        if rules is None:
+            rules = self.rules
         weight = 1.0
         
         # 检查分类中是否包含特定关键词
-        for keyword, multiplier in self.category_weights.items():
-            if keyword in category:
-                weight = max(weight, multiplier)
+        for keyword in rules.category_matcher.find(category):
+            weight = max(weight, rules.category_weights[keyword])
         
         return weight
     
+    def score_batch(self, posts: List[Dict], now: Optional[datetime] = None) -> List[float]:
+        """
+        批量计算质量分数（结果与逐条调用 calculate_score 相同）
+        
+        每条帖子只做一次关键词扫描，得到关键词命中矩阵后，用NumPy数组运算一次性
+        计算关键词、时效性、分类和评论各项得分；所有帖子共用同一个参考时间。
+        命中评分缓存的帖子跳过关键词扫描。未安装NumPy时退化为逐条计算。
+        
+        Args:
+            posts: 帖子列表
+            now: 计算时效性的参考时间（默认当前时间）
+            
+        Returns:
+            与 posts 顺序一致的质量分数列表
+        """
+        now = now or datetime.now()
+        if np is None:
+            return [self.calculate_score(post, now) for post in posts]
+        # 同一批次只使用同一个规则快照
+        rules = self.rules
+        if not posts:
+            return []
+        
+        n = len(posts)
+        positive = np.zeros(n, dtype=np.float64)
+        negative = np.zeros(n, dtype=np.float64)
+        weights = np.ones(n, dtype=np.float64)
+        ages = np.full(n, np.nan, dtype=np.float64)
+        comments = np.zeros(n, dtype=np.float64)
+        # 未命中缓存的帖子: (行号, 缓存键, 命中的关键词列)
+        misses = []
+        
+        for i, post in enumerate(posts):
+            # 与时间无关的部分优先从缓存读取
+            cache_key = self._cache_key(post, rules)
+            cached = self.score_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                positive[i], negative[i], weights[i] = cached
+            else:
+                category = post.get('category', '')
+                text = f"{post.get('title', '')} {post.get('content', '')} {category}"
+                columns = [rules.keyword_order[keyword] for keyword in rules.text_matcher.find(text)]
+                misses.append((i, cache_key, columns))
+                
+                # 分类权重
+                weights[i] = self._calculate_category_score(category, rules)
+            
+            # 发布时间距今秒数（非datetime的发布时间不计时效分）
+            pub_time = post.get('publish_time')
+            if pub_time and isinstance(pub_time, datetime):
+                ages[i] = (now - pub_time).total_seconds()
+            
+            comments[i] = post.get('comments', 0)
+        
+        # 关键词命中矩阵（仅未命中缓存的帖子）
+        if misses:
+            rows = np.array([i for i, _, _ in misses])
+            hits = np.zeros((len(misses), len(rules.keyword_order)), dtype=np.float64)
+            for row, (_, _, columns) in enumerate(misses):
+                if columns:
+                    hits[row, columns] = 1.0
+            positive[rows] = hits @ np.asarray(rules.positive_points, dtype=np.float64)
+            negative[rows] = hits @ np.asarray(rules.negative_points, dtype=np.float64)
+            
+            if self.score_cache is not None:
+                for i, cache_key, _ in misses:
+                    self.score_cache.put(
+                        cache_key, (float(positive[i]), float(negative[i]), float(weights[i]))
+                    )
+        
+        # 基础分 + 关键词分
+        scores = 50.0 + (positive + negative)
+        
+        # 时效性评分（与 _calculate_time_score 的分段一致）
+        hour = 3600.0
+        time_scores = np.select(
+            [np.isnan(ages), ages < 2 * hour, ages < 6 * hour, ages < 12 * hour, ages < 24 * hour],
+            [0.0, 10.0, 5.0, 0.0, -5.0],
+            default=-10.0
+        )
+        scores = (scores + time_scores) * weights
+        
+        # 评论数加分（最多加10分）
+        scores += np.where(comments > 0, np.minimum(comments * 0.5, 10), 0.0)
+        
+        scores = np.clip(scores, 0, 100)
+        return [round(float(score), 1) for score in scores]
+    
     def filter_posts(self, posts: List[Dict]) -> List[Dict]:
         """
         过滤帖子列表，只保留高质量内容
@@ -207,9 +425,10 @@ class QualityFilter:
         """
         filtered_posts = []
         
-        for post in posts:
-            # 计算质量分数
-            score = self.calculate_score(post)
+        # 批量计算质量分数
+        scores = self.score_batch(posts)
+        
+        for post, score in zip(posts, scores):
             post['quality_score'] = score
             
             # 判断是否通过过滤
@@ -226,6 +445,9 @@ class QualityFilter:
         # 按质量分数排序
         filtered_posts.sort(key=lambda x: x['quality_score'], reverse=True)
         
+        if self.score_cache is not None:
+            self.score_cache.save()
+        
         self.logger.info(
             f"过滤完成: 输入 {len(posts)} 条，输出 {len(filtered_posts)} 条 "
             f"(过滤率: {(1 - len(filtered_posts)/len(posts))*100:.1f}%)"
@@ -233,6 +455,41 @@ class QualityFilter:
         
         return filtered_posts
     
+    async def filter_stream(
+        self,
+        posts: Union[Iterable[Dict], AsyncIterable[Dict]],
+        max_items: int,
+        keep_passed: bool = False
+    ) -> List[Dict]:
+        """
+        流式过滤，只保留分数最高的 max_items 条高质量内容
+        
+        可直接传入 crawler.crawl_iter()，边爬取边评分；内存占用只与 max_items 有关。
+        统计信息保存在 last_stats 中（字段与 get_filter_stats 一致）。
+        
+        Args:
+            posts: 帖子的同步或异步可迭代对象
+            max_items: 最多保留的条目数
+            keep_passed: 是否把所有通过阈值的帖子（不限于前 max_items 条）保存在 last_passed 中
+            
+        Returns:
+            过滤后按分数降序排列的帖子列表（与 filter_posts(posts)[:max_items] 一致）
+        """
+        top_k = TopKFilter(self, max_items, keep_passed=keep_passed)
+        filtered_posts = await top_k.consume_async(posts)
+        self.last_stats = top_k.get_stats()
+        self.last_passed = top_k.passed_posts
+        
+        self.logger.info(
+            f"过滤完成: 输入 {top_k.total} 条，通过 {top_k.passed} 条，输出 {len(filtered_posts)} 条 "
+            f"(通过率: {self.last_stats.get('pass_rate', 0)}%)"
+        )
+        
+        if self.score_cache is not None:
+            self.score_cache.save()
+        
+        return filtered_posts
+    
     def get_filter_stats(self, posts: List[Dict]) -> Dict:
         """
         获取过滤统计信息
@@ -0,0 +1,206 @@
+"""
+评分规则快照
+从规则文件加载关键词表和分类权重，编译为不可变的规则快照；可选地将编译结果（JSON格式）
+按规则文件内容缓存到磁盘，规则未变化时启动直接加载，无需重新构建匹配器
+"""
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+import hashlib
+import json
+import os
+from loguru import logger
+from .keyword_matcher import KeywordMatcher
+
+# 内置规则文件
+DEFAULT_RULES_FILE = Path(__file__).with_name('quality_rules.json')
+
+# 快照结构变化时递增，使旧的磁盘缓存失效
+SNAPSHOT_VERSION = 2
+
+RULE_TABLES = ('positive_keywords', 'negative_keywords', 'category_weights')
+
+
+class RuleSnapshot:
+    """
+    编译后的评分规则（创建后不再修改）
+    
+    评分时只读取一次快照引用，热更新只需替换引用，进行中的评分继续使用旧快照。
+    """
+    
+    def __init__(
+        self,
+        positive_keywords: Mapping[str, float],
+        negative_keywords: Mapping[str, float],
+        category_weights: Mapping[str, float],
+        source: Optional[str] = None,
+        mtime: Optional[float] = None,
+        text_matcher: Optional[KeywordMatcher] = None,
+        category_matcher: Optional[KeywordMatcher] = None
+    ):
+        """
+        编译规则
+        
+        Args:
+            positive_keywords: 正面关键词及加分
+            negative_keywords: 负面关键词及扣分（负数）
+            category_weights: 分类关键词及权重系数
+            source: 规则文件路径（可选）
+            mtime: 加载时规则文件的修改时间（可选，用于检测规则更新）
+            text_matcher: 已编译的关键词匹配器（可选，关键词须与规则表一致，否则重新编译）
+            category_matcher: 已编译的分类匹配器（可选，同上）
+        """
+        self.positive_keywords: Dict[str, float] = dict(positive_keywords)
+        self.negative_keywords: Dict[str, float] = dict(negative_keywords)
+        self.category_weights: Dict[str, float] = dict(category_weights)
+        self.source = source
+        self.mtime = mtime
+        
+        keywords = list(self.positive_keywords) + list(self.negative_keywords)
+        if text_matcher is None or text_matcher.keywords != list(dict.fromkeys(keywords)):
+            text_matcher = KeywordMatcher(keywords)
+        if category_matcher is None or category_matcher.keywords != list(self.category_weights):
+            category_matcher = KeywordMatcher(self.category_weights)
+        self.text_matcher = text_matcher
+        self.category_matcher = category_matcher
+        # 关键词在规则表中的顺序，用于按原顺序输出命中列表
+        self.keyword_order = {keyword: i for i, keyword in enumerate(keywords)}
+        # 正面/负面关键词分值向量（与 keyword_order 列顺序一致，供批量评分使用）
+        self.positive_points = [self.positive_keywords.get(keyword, 0) for keyword in keywords]
+        self.negative_points = [self.negative_keywords.get(keyword, 0) for keyword in keywords]
+        # 规则指纹，作为评分缓存键的一部分，规则变化后旧缓存不再命中
+        rules = [self.positive_keywords, self.negative_keywords, self.category_weights]
+        self.fingerprint = hashlib.sha1(
+            json.dumps(rules, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+    
+    @classmethod
+    def from_dict(cls, data: Mapping, **kwargs) -> 'RuleSnapshot':
+        """
+        根据规则字典创建快照
+        
+        每张规则表可以直接是 关键词 -> 数值 的映射，也可以按分组嵌套一层
+        （分组名 -> {关键词: 数值}），分组名只用于说明，加载时按顺序展开。
+        
+        Args:
+            data: 包含 positive_keywords / negative_keywords / category_weights 的字典
+            **kwargs: 传给构造函数的其他参数
+        
+        Returns:
+            规则快照
+        
+        Raises:
+            ValueError: 规则格式不正确
+        """
+        tables = {}
+        for name in RULE_TABLES:
+            table = data.get(name, {})
+            if not isinstance(table, dict):
+                raise ValueError(f"规则 {name} 必须是 关键词 -> 数值 的映射")
+            flat = {}
+            for key, value in table.items():
+                if isinstance(value, dict):
+                    flat.update(value)
+                else:
+                    flat[key] = value
+            if not all(
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                for value in flat.values()
+            ):
+                raise ValueError(f"规则 {name} 必须是 关键词 -> 数值 的映射")
+            tables[name] = flat
+        return cls(**tables, **kwargs)
+    
+    @classmethod
+    def load(
+        cls,
+        rule_file: Union[str, Path, None] = None,
+        cache_dir: Union[str, Path, None] = None
+    ) -> 'RuleSnapshot':
+        """
+        从规则文件加载快照
+        
+        提供 cache_dir 时，按规则文件内容哈希查找已编译的快照（JSON），未命中才重新编译并写入缓存；
+        缓存文件只包含数据，损坏或被篡改时忽略并重新编译。
+        
+        Args:
+            rule_file: JSON规则文件路径（默认使用内置规则）
+            cache_dir: 编译快照的缓存目录（可选）
+        
+        Returns:
+            规则快照
+        
+        Raises:
+            OSError: 规则文件无法读取
+            ValueError: 规则文件格式不正确
+        """
+        path = Path(rule_file) if rule_file else DEFAULT_RULES_FILE
+        mtime = path.stat().st_mtime
+        raw = path.read_bytes()
+        
+        cache_path = None
+        if cache_dir:
+            # 文件名: 规则文件路径哈希 + 内容哈希，每个规则文件只保留最新的快照
+            path_digest = hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:12]
+            digest = hashlib.sha1(raw).hexdigest()
+            cache_path = Path(cache_dir) / f"rules-v{SNAPSHOT_VERSION}-{path_digest}-{digest}.json"
+            snapshot = cls._load_cached(cache_path, source=str(path), mtime=mtime)
+            if snapshot is not None:
+                logger.debug(f"加载已编译的评分规则: {cache_path}")
+                return snapshot
+        
+        try:
+            data = json.loads(raw.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"规则文件格式错误 {path}: {e}") from e
+        if not isinstance(data, dict):
+            raise ValueError(f"规则文件格式错误 {path}: 顶层必须是对象")
+        
+        snapshot = cls.from_dict(data, source=str(path), mtime=mtime)
+        if cache_path is not None:
+            snapshot._save_cached(cache_path)
+        return snapshot
+    
+    @classmethod
+    def _load_cached(cls, cache_path: Path, **kwargs) -> Optional['RuleSnapshot']:
+        """读取已编译的快照，不存在或损坏时返回None"""
+        if not cache_path.exists():
+            return None
+        
+        try:
+            data = json.loads(cache_path.read_text(encoding='utf-8'))
+            return cls.from_dict(
+                data,
+                text_matcher=KeywordMatcher.from_state(data['text_matcher']),
+                category_matcher=KeywordMatcher.from_state(data['category_matcher']),
+                **kwargs
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"评分规则快照缓存损坏，已忽略: {e}")
+        return None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """导出规则表和编译后的匹配器（可JSON序列化）"""
+        return {
+            'positive_keywords': self.positive_keywords,
+            'negative_keywords': self.negative_keywords,
+            'category_weights': self.category_weights,
+            'text_matcher': self.text_matcher.to_state(),
+            'category_matcher': self.category_matcher.to_state(),
+        }
+    
+    def _save_cached(self, cache_path: Path) -> None:
+        """写入已编译的快照，并清理同一规则文件旧内容对应的快照"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+            prefix = cache_path.name.rsplit('-', 1)[0]
+            for old in cache_path.parent.glob(f'{prefix}-*.json'):
+                if old != cache_path:
+                    old.unlink()
+        except Exception as e:
+            logger.error(f"保存评分规则快照失败: {e}")
+    
+    def __len__(self) -> int:
+        return len(self.keyword_order)
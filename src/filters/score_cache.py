@@ -0,0 +1,125 @@
+"""
+评分缓存
+按内容哈希缓存与时间无关的评分部分（关键词分、分类权重），每次只需重新计算时效分
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+import hashlib
+import json
+import os
+from loguru import logger
+
+# (正面关键词分, 负面关键词分, 分类权重)
+ScoreParts = Tuple[float, float, float]
+
+
+class ScoreCache:
+    """有容量上限的LRU评分缓存，可选持久化到JSON文件"""
+    
+    def __init__(self, max_entries: int = 10000, cache_file: Optional[str] = None):
+        """
+        初始化缓存
+        
+        Args:
+            max_entries: 最多缓存的条目数
+            cache_file: 持久化文件路径（可选，不提供则只在内存中缓存）
+        """
+        self.max_entries = max_entries
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._entries: "OrderedDict[str, ScoreParts]" = OrderedDict()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+    
+    @staticmethod
+    def make_key(rules_fingerprint: str, title: str, content: str, category: str, comments) -> str:
+        """
+        根据规则指纹和帖子内容生成缓存键
+        
+        Args:
+            rules_fingerprint: 评分规则指纹（规则变化时旧缓存自动失效）
+            title: 标题
+            content: 内容
+            category: 分类
+            comments: 评论数
+            
+        Returns:
+            缓存键
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (rules_fingerprint, title, content, category, str(comments)):
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+    
+    def _load(self) -> None:
+        """从磁盘加载缓存"""
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                for key, parts in json.load(f):
+                    self._entries[key] = tuple(parts)
+            self._evict()
+            logger.debug(f"加载评分缓存: {len(self._entries)} 条")
+        except Exception as e:
+            logger.warning(f"评分缓存文件损坏，已忽略: {e}")
+            self._entries.clear()
+    
+    def get(self, key: str) -> Optional[ScoreParts]:
+        """
+        读取缓存（命中时更新LRU顺序）
+        
+        Args:
+            key: 缓存键
+            
+        Returns:
+            评分部分，未命中返回None
+        """
+        parts = self._entries.get(key)
+        if parts is None:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return parts
+    
+    def put(self, key: str, parts: ScoreParts) -> None:
+        """
+        写入缓存
+        
+        Args:
+            key: 缓存键
+            parts: 评分部分
+        """
+        self._entries[key] = parts
+        self._entries.move_to_end(key)
+        self._dirty = True
+        self._evict()
+    
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目"""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def save(self) -> None:
+        """持久化到磁盘（未配置文件路径时忽略）"""
+        if self.cache_file is None or not self._dirty:
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._entries.items()), f)
+            os.replace(tmp_path, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"保存评分缓存失败: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._entries)
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+流式Top-K过滤器
+逐条（或分批）接收帖子，只在堆中保留分数最高的K条，内存占用与输入规模无关
+"""
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Union
+from datetime import datetime
+import heapq
+from loguru import logger
+
+
+class TopKFilter:
+    """流式Top-K质量过滤器"""
+    
+    # 质量分数上限，堆中K条都达到上限后后续帖子不可能再进入结果
+    MAX_SCORE = 100.0
+    
+    def __init__(
+        self,
+        quality_filter,
+        k: int,
+        batch_size: int = 16,
+        early_stop: bool = True,
+        keep_passed: bool = False
+    ):
+        """
+        初始化过滤器
+        
+        Args:
+            quality_filter: QualityFilter实例（提供评分和阈值）
+            k: 最多保留的条目数
+            batch_size: 分批评分的批大小（提前停止只在一批评分后检查，批次过大会多读取输入，
+                流式输入时每多读一条都可能多抓取一个详情页）
+            early_stop: 堆已满且全部为满分时是否提前停止读取输入
+            keep_passed: 是否另外保留所有通过阈值的帖子（passed_posts，如需全部写入帖子存储）
+        """
+        self.quality_filter = quality_filter
+        self.k = k
+        self.batch_size = max(1, batch_size)
+        self.early_stop = early_stop
+        self.now: Optional[datetime] = None
+        
+        # 小顶堆: (分数, -输入序号, 帖子)；同分时先到的帖子优先保留，与 filter_posts 的稳定排序一致
+        self._heap: List = []
+        self._seq = 0
+        self._batch: List[Dict] = []
+        self.keep_passed = keep_passed
+        self.passed_posts: List[Dict] = []
+        
+        # 增量统计
+        self.total = 0
+        self.passed = 0
+        self._score_sum = 0.0
+        self._max_score: Optional[float] = None
+        self._min_score: Optional[float] = None
+    
+    @property
+    def saturated(self) -> bool:
+        """堆已满且最低分已是满分"""
+        return len(self._heap) >= self.k and (self.k == 0 or self._heap[0][0] >= self.MAX_SCORE)
+    
+    def add(self, post: Dict) -> None:
+        """
+        添加一条帖子（攒满一批后统一评分）
+        
+        Args:
+            post: 帖子数据字典
+        """
+        self._batch.append(post)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """对当前批次评分并更新堆和统计"""
+        if not self._batch:
+            return
+        
+        batch, self._batch = self._batch, []
+        self.now = self.now or datetime.now()
+        scores = self.quality_filter.score_batch(batch, self.now)
+        
+        for post, score in zip(batch, scores):
+            post['quality_score'] = score
+            self._seq += 1
+            self.total += 1
+            self._score_sum += score
+            self._max_score = score if self._max_score is None else max(self._max_score, score)
+            self._min_score = score if self._min_score is None else min(self._min_score, score)
+            
+            if score < self.quality_filter.threshold:
+                continue
+            self.passed += 1
+            if self.keep_passed:
+                self.passed_posts.append(post)
+            
+            if self.k <= 0:
+                continue
+            entry = (score, -self._seq, post)
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+    
+    def consume(self, posts: Iterable[Dict]) -> List[Dict]:
+        """
+        消费同步可迭代对象
+        
+        Args:
+            posts: 帖子可迭代对象
+            
+        Returns:
+            分数最高的K条帖子（按分数降序）
+        """
+        for post in posts:
+            self.add(post)
+            if self.early_stop and not self._batch and self.saturated:
+                break
+        return self.results()
+    
+    async def consume_async(self, posts: Union[Iterable[Dict], AsyncIterable[Dict]]) -> List[Dict]:
+        """
+        消费同步或异步可迭代对象（如 crawler.crawl_iter()）
+        
+        Args:
+            posts: 帖子可迭代对象
+            
+        Returns:
+            分数最高的K条帖子（按分数降序）
+        """
+        if not hasattr(posts, '__aiter__'):
+            return self.consume(posts)
+        
+        try:
+            async for post in posts:
+                self.add(post)
+                if self.early_stop and not self._batch and self.saturated:
+                    logger.info(f"已收集 {self.k} 条满分线报，提前停止")
+                    break
+        finally:
+            if hasattr(posts, 'aclose'):
+                await posts.aclose()
+        return self.results()
+    
+    def results(self) -> List[Dict]:
+        """
+        获取当前结果
+        
+        Returns:
+            分数最高的K条帖子（按分数降序）
+        """
+        self.flush()
+        return [post for _, _, post in sorted(self._heap, reverse=True)]
+    
+    def get_stats(self) -> Dict:
+        """
+        获取增量统计信息（字段与 QualityFilter.get_filter_stats 一致）
+        
+        Returns:
+            统计信息字典
+        """
+        self.flush()
+        if not self.total:
+            return {
+                'total': 0,
+                'avg_score': 0,
+                'max_score': 0,
+                'min_score': 0,
+                'passed': 0,
+                'filtered': 0
+            }
+        
+        return {
+            'total': self.total,
+            'avg_score': round(self._score_sum / self.total, 1),
+            'max_score': self._max_score,
+            'min_score': self._min_score,
+            'passed': self.passed,
+            'filtered': self.total - self.passed,
+            'pass_rate': round(self.passed / self.total * 100, 1)
+        }
\ No newline at end of file
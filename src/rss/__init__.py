@@ -1,6 +1,7 @@
 """
 RSS生成模块
 """
-from .generator import RSSGenerator, RSSManager
+from .generator import FEED_FORMATS, RSSGenerator, RSSManager, register_feed_format
+from .xml_writer import FeedEntry, FeedXMLWriter
 
-__all__ = ['RSSGenerator', 'RSSManager']
\ No newline at end of file
+__all__ = ['RSSGenerator', 'RSSManager', 'FEED_FORMATS', 'register_feed_format', 'FeedEntry', 'FeedXMLWriter']
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Feed条目片段缓存
+按 (格式, URL) 缓存已渲染的 <item> / <entry> / JSON条目片段，帖子内容哈希不变时直接复用，
+组装Feed时只需渲染新增或变化的帖子
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import threading
+from loguru import logger
+
+# 影响渲染结果的帖子字段（JSON条目包含全部字段，RSS/Atom条目不含摘要和质量分数）
+FRAGMENT_FIELDS = (
+    'title', 'url', 'content', 'category', 'author', 'summary', 'publish_time', 'quality_score'
+)
+XML_FRAGMENT_FIELDS = ('title', 'url', 'content', 'category', 'author', 'publish_time')
+
+# 缓存条目: (内容哈希, 片段)
+CachedFragment = Tuple[str, str]
+
+
+class FragmentCache:
+    """有容量上限的LRU片段缓存，可选持久化到JSON文件（线程安全）"""
+    
+    def __init__(self, max_entries: int = 1000, cache_file: Optional[str] = None):
+        """
+        初始化缓存
+        
+        Args:
+            max_entries: 最多缓存的片段数（所有格式合计）
+            cache_file: 持久化文件路径（可选，不提供则只在内存中缓存）
+        """
+        self.max_entries = max_entries
+        self.cache_file = Path(cache_file) if cache_file else None
+        # "格式\x1fURL" -> (内容哈希, 片段)
+        self._entries: "OrderedDict[str, CachedFragment]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+    
+    @staticmethod
+    def content_hash(post: Dict, fields: Sequence[str] = FRAGMENT_FIELDS) -> str:
+        """
+        计算帖子中影响渲染结果的字段的哈希
+        
+        Args:
+            post: 帖子数据字典
+            fields: 参与哈希的字段
+        
+        Returns:
+            内容哈希
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for field in fields:
+            digest.update(str(post.get(field, '')).encode('utf-8'))
+            digest.update(b'\x1f')
+        return digest.hexdigest()
+    
+    def _load(self) -> None:
+        """从磁盘加载缓存"""
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                for key, content_hash, fragment in json.load(f):
+                    self._entries[key] = (content_hash, fragment)
+            self._evict()
+            logger.debug(f"加载Feed片段缓存: {len(self._entries)} 条")
+        except Exception as e:
+            logger.warning(f"Feed片段缓存文件损坏，已忽略: {e}")
+            self._entries.clear()
+    
+    def render(
+        self,
+        kind: str,
+        post: Dict,
+        renderer: Callable[[Dict], str],
+        fields: Sequence[str] = FRAGMENT_FIELDS
+    ) -> str:
+        """
+        获取帖子的渲染片段，未命中或内容变化时调用 renderer 渲染并缓存
+        
+        Args:
+            kind: 片段类型（格式及渲染参数，如 'rss' / 'atom-compact'）
+            post: 帖子数据字典
+            renderer: 渲染函数
+            fields: 影响该片段的字段
+        
+        Returns:
+            渲染后的片段
+        """
+        key = f"{kind}\x1f{post.get('url', '')}"
+        content_hash = self.content_hash(post, fields)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == content_hash:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        
+        fragment = renderer(post)
+        with self._lock:
+            self._entries[key] = (content_hash, fragment)
+            self._entries.move_to_end(key)
+            self._dirty = True
+            self._evict()
+        return fragment
+    
+    def _evict(self) -> None:
+        """淘汰最久未使用的片段"""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def save(self) -> None:
+        """持久化到磁盘（未配置文件路径时忽略）"""
+        if self.cache_file is None or not self._dirty:
+            return
+        
+        with self._lock:
+            entries = [[key, *entry] for key, entry in self._entries.items()]
+            self._dirty = False
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except Exception as e:
+            logger.error(f"保存Feed片段缓存失败: {e}")
+            self._dirty = True
+    
+    def __len__(self) -> int:
+        return len(self._entries)
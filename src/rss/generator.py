@@ -2,13 +2,47 @@
 RSS生成器模块
 用于将过滤后的线报数据生成RSS 2.0格式的feed和JSON数据
 """
-from typing import List, Dict, Optional
-from datetime import datetime
-from feedgen.feed import FeedGenerator
+from typing import BinaryIO, Callable, Iterable, List, Dict, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
+import asyncio
+import io
 import pytz
 import json
+import re
+import textwrap
 from loguru import logger
+from .fragment_cache import FRAGMENT_FIELDS, XML_FRAGMENT_FIELDS, FragmentCache
+from .static_output import StaticPublisher
+from .xml_writer import FeedEntry, FeedXMLWriter
+from ..config import settings
+from ..storage.post_store import format_time_cursor, parse_cursor
+
+try:
+    import orjson  # 可选，更快的JSON序列化
+except ImportError:
+    orjson = None
+
+GENERATOR_NAME = '羊毛线报RSS生成器 v1.0'
+
+
+def dump_json(data, pretty: bool = False) -> bytes:
+    """
+    序列化为UTF-8编码的JSON（已安装orjson时使用orjson）
+    
+    Args:
+        data: 待序列化的数据
+        pretty: 是否缩进（默认紧凑输出）
+        
+    Returns:
+        JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 
 class RSSGenerator:
@@ -19,7 +53,9 @@ class RSSGenerator:
         title: str = "高质量羊毛线报",
         link: str = "https://new.ixbk.net/",
         description: str = "精选高质量羊毛线报，自动过滤低质量内容",
-        language: str = "zh-CN"
+        language: str = "zh-CN",
+        fragment_cache: Optional[FragmentCache] = None,
+        publisher: Optional[StaticPublisher] = None
     ):
         """
         初始化RSS生成器
@@ -29,92 +65,192 @@ class RSSGenerator:
             link: Feed链接
             description: Feed描述
             language: Feed语言
+            fragment_cache: 条目片段缓存（默认按 FRAGMENT_CACHE_SIZE / FRAGMENT_CACHE_FILE 创建，
+                FRAGMENT_CACHE_SIZE 为0时不缓存）
+            publisher: 输出文件发布器（默认按 OUTPUT_GZIP / OUTPUT_BROTLI / OUTPUT_MANIFEST 创建）
         """
         self.title = title
         self.link = link
         self.description = description
         self.language = language
-        
-    def create_feed(self, posts: List[Dict]) -> FeedGenerator:
+        self.fragment_cache = fragment_cache
+        if self.fragment_cache is None and settings.FRAGMENT_CACHE_SIZE > 0:
+            self.fragment_cache = FragmentCache(
+                max_entries=settings.FRAGMENT_CACHE_SIZE,
+                cache_file=settings.FRAGMENT_CACHE_FILE or None
+            )
+        self.publisher = publisher or StaticPublisher.from_settings()
+        
+    def _entry_pub_time(self, post: Dict) -> Optional[datetime]:
         """
-        创建RSS Feed
+        获取条目的发布时间（带时区）
         
         Args:
-            posts: 线报数据列表
+            post: 线报数据
             
         Returns:
-            FeedGenerator对象
+            带时区的发布时间，帖子没有发布时间时返回None
         """
-        # 创建feed生成器
-        fg = FeedGenerator()
-        
-        # 设置feed基本信息
-        fg.id(self.link)  # Atom格式需要的唯一ID
-        fg.title(self.title)
-        fg.link(href=self.link, rel='alternate')
-        fg.description(self.description)
-        fg.language(self.language)
-        fg.generator('羊毛线报RSS生成器 v1.0')
+        if not post.get('publish_time'):
+            return None
         
-        # 设置更新时间为当前时间
         tz = pytz.timezone('Asia/Shanghai')
-        fg.lastBuildDate(datetime.now(tz))
-        fg.pubDate(datetime.now(tz))
-        
-        # 添加线报条目
-        for post in posts:
-            self._add_entry(fg, post)
-            
-        logger.info(f"成功创建RSS Feed，包含 {len(posts)} 条线报")
-        return fg
+        try:
+            pub_time = post['publish_time']
+            # 如果是字符串，则解析；如果已经是datetime对象，则直接使用
+            if isinstance(pub_time, str):
+                pub_time = self._parse_publish_time(pub_time)
+            # 确保有时区信息
+            if pub_time.tzinfo is None:
+                pub_time = tz.localize(pub_time)
+            return pub_time
+        except Exception as e:
+            logger.warning(f"解析发布时间失败: {e}")
+            # 使用当前时间
+            return datetime.now(tz)
     
-    def _add_entry(self, fg: FeedGenerator, post: Dict) -> None:
+    def _feed_entry(self, post: Dict) -> FeedEntry:
         """
-        添加单个线报条目到Feed
+        将线报数据转换为流式写入器的条目
         
         Args:
-            fg: FeedGenerator对象
             post: 线报数据
+            
+        Returns:
+            FeedEntry
         """
-        fe = fg.add_entry()
-        
-        # 设置条目基本信息
-        fe.title(post['title'])
-        fe.link(href=post['url'])
+        return FeedEntry(
+            title=post['title'],
+            url=post['url'],
+            description=self._build_description(post),
+            category=post.get('category') or '',
+            author=post.get('author') or '',
+            pub_time=self._entry_pub_time(post)
+        )
+    
+    def _xml_writer(self, pretty: bool = True) -> FeedXMLWriter:
+        """创建使用本Feed信息的流式写入器"""
+        return FeedXMLWriter(
+            title=self.title,
+            link=self.link,
+            description=self.description,
+            language=self.language,
+            generator=GENERATOR_NAME,
+            pretty=pretty
+        )
+    
+    def write_rss(
+        self,
+        posts: Iterable[Dict],
+        output: Union[str, BinaryIO],
+        pretty: bool = True
+    ) -> int:
+        """
+        流式写入RSS，逐条转义并输出，不在内存中保留整个文档
         
-        # 构建描述内容（包含质量评分）
-        description = self._build_description(post)
-        fe.description(description)
+        Args:
+            posts: 线报数据（可为生成器，按迭代顺序写入）
+            output: 输出文件路径或二进制输出流（文件、socket.makefile('wb') 等）
+            pretty: 是否格式化输出
+            
+        Returns:
+            写入的条目数
+        """
+        return self._write_xml('rss', posts, output, pretty)
+    
+    def write_atom(
+        self,
+        posts: Iterable[Dict],
+        output: Union[str, BinaryIO],
+        pretty: bool = True
+    ) -> int:
+        """
+        流式写入Atom，逐条转义并输出，不在内存中保留整个文档
         
-        # 设置发布时间
-        if post.get('publish_time'):
-            try:
-                pub_time = post['publish_time']
-                # 如果是字符串，则解析；如果已经是datetime对象，则直接使用
-                if isinstance(pub_time, str):
-                    pub_time = self._parse_publish_time(pub_time)
-                # 确保有时区信息
-                if pub_time.tzinfo is None:
-                    tz = pytz.timezone('Asia/Shanghai')
-                    pub_time = tz.localize(pub_time)
-                fe.pubDate(pub_time)
-            except Exception as e:
-                logger.warning(f"解析发布时间失败: {e}")
-                # 使用当前时间
-                tz = pytz.timezone('Asia/Shanghai')
-                fe.pubDate(datetime.now(tz))
+        Args:
+            posts: 线报数据（可为生成器，按迭代顺序写入）
+            output: 输出文件路径或二进制输出流
+            pretty: 是否格式化输出
+            
+        Returns:
+            写入的条目数
+        """
+        return self._write_xml('atom', posts, output, pretty)
+    
+    def _write_xml(
+        self,
+        feed_format: str,
+        posts: Iterable[Dict],
+        output: Union[str, BinaryIO],
+        pretty: bool
+    ) -> int:
+        """按格式把条目写入文件路径或输出流（条目片段优先从缓存读取）"""
+        writer = self._xml_writer(pretty)
+        build_time = datetime.now(pytz.timezone('Asia/Shanghai'))
+        kind = feed_format if pretty else f"{feed_format}-compact"
+        if feed_format == 'rss':
+            header, footer = writer.rss_header(build_time), writer.rss_footer()
+            renderer = lambda post: writer.rss_item(self._feed_entry(post))
+        else:
+            # 缓存的Atom条目保留首次渲染时的 updated 时间
+            updated = datetime.now(timezone.utc)
+            header, footer = writer.atom_header(build_time), writer.atom_footer()
+            renderer = lambda post: writer.atom_entry(self._feed_entry(post), updated)
+        
+        def write(out: BinaryIO) -> int:
+            out.write(header)
+            count = 0
+            for post in posts:
+                out.write(self._render_fragment(kind, post, renderer, XML_FRAGMENT_FIELDS).encode('utf-8'))
+                count += 1
+            out.write(footer)
+            return count
+        
+        if not isinstance(output, (str, Path)):
+            return write(output)
         
-        # 设置分类
-        if post.get('category'):
-            fe.category(term=post['category'])
+        try:
+            # 写入临时文件，完成后原子替换并生成压缩文件
+            with self.publisher.open_stream(output) as f:
+                count = write(f)
+            logger.info(f"{feed_format.upper()} Feed已保存到: {output}（{count} 条）")
+            return count
+        except Exception as e:
+            logger.error(f"保存{feed_format.upper()}文件失败: {e}")
+            raise
+    
+    def _render_fragment(
+        self,
+        kind: str,
+        post: Dict,
+        renderer: Callable[[Dict], str],
+        fields=FRAGMENT_FIELDS
+    ) -> str:
+        """
+        渲染单条帖子的片段，启用片段缓存时只渲染新增或内容变化的帖子
         
-        # 设置作者
-        if post.get('author'):
-            fe.author({'name': post['author']})
+        Args:
+            kind: 片段类型（格式及渲染参数）
+            post: 线报数据
+            renderer: 渲染函数
+            fields: 影响该片段的帖子字段
             
-        # 设置唯一ID（使用URL作为GUID）
-        fe.guid(post['url'], permalink=True)
-        
+        Returns:
+            片段文本
+        """
+        if self.fragment_cache is None:
+            return renderer(post)
+        return self.fragment_cache.render(kind, post, renderer, fields)
+    
+    def save_cache(self) -> None:
+        """持久化条目片段缓存（未启用缓存或未配置文件时忽略）"""
+        if self.fragment_cache is None:
+            return
+        logger.info(
+            f"Feed片段缓存累计命中 {self.fragment_cache.hits} 次，未命中 {self.fragment_cache.misses} 次"
+        )
+        self.fragment_cache.save()
+    
     def _build_description(self, post: Dict) -> str:
         """
         构建线报描述内容（仅包含核心信息，无额外操作链接）
@@ -209,11 +345,12 @@ class RSSGenerator:
         Returns:
             RSS XML字符串
         """
-        # 创建feed
-        fg = self.create_feed(posts)
-        
-        # 生成RSS XML
-        rss_str = fg.rss_str(pretty=pretty)
+        # 流式写入内存缓冲区（feedgen 的 add_entry 默认插入到最前，
+        # 倒序写入以保持与原输出一致的条目顺序）
+        buffer = io.BytesIO()
+        self.write_rss(reversed(posts), buffer, pretty=pretty)
+        rss_str = buffer.getvalue()
+        logger.info(f"成功创建RSS Feed，包含 {len(posts)} 条线报")
         
         # 如果指定了输出文件，保存到文件
         if output_file:
@@ -225,19 +362,17 @@ class RSSGenerator:
         """
         保存RSS内容到文件
         
+        原子写入并生成压缩文件；内容（不计生成时间）与上次相同时不重写。
+        
         Args:
             rss_content: RSS内容（字节）
             file_path: 文件路径
         """
         try:
-            # 创建目录（如果不存在）
-            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-            
-            # 写入文件
-            with open(file_path, 'wb') as f:
-                f.write(rss_content)
-            
-            logger.info(f"RSS Feed已保存到: {file_path}")
+            if self.publisher.publish(file_path, rss_content):
+                logger.info(f"RSS Feed已保存到: {file_path}")
+            else:
+                logger.info(f"RSS Feed内容未变化，保留原文件: {file_path}")
         except Exception as e:
             logger.error(f"保存RSS文件失败: {e}")
             raise
@@ -259,11 +394,11 @@ class RSSGenerator:
         Returns:
             Atom XML字符串
         """
-        # 创建feed
-        fg = self.create_feed(posts)
-        
-        # 生成Atom XML
-        atom_str = fg.atom_str(pretty=pretty)
+        # 流式写入内存缓冲区（条目顺序与原 feedgen 输出一致）
+        buffer = io.BytesIO()
+        self.write_atom(reversed(posts), buffer, pretty=pretty)
+        atom_str = buffer.getvalue()
+        logger.info(f"成功创建Atom Feed，包含 {len(posts)} 条线报")
         
         # 如果指定了输出文件，保存到文件
         if output_file:
@@ -288,46 +423,162 @@ class RSSGenerator:
         Returns:
             JSON字符串
         """
-        # 准备JSON数据
+        # 准备JSON数据（条目单独渲染后拼接，输出与整体 json.dumps 一致）
         json_data = {
             "title": self.title,
             "description": self.description,
             "link": self.link,
             "updated": datetime.now(pytz.timezone('Asia/Shanghai')).isoformat(),
-            "items": []
         }
         
         # 转换线报数据为JSON格式
-        for post in posts:
-            item = {
-                "title": post.get('title', ''),
-                "url": post.get('url', ''),
-                "category": post.get('category', ''),
-                "content": post.get('content', ''),
-                "summary": post.get('summary', ''),
-                "author": post.get('author', ''),
-                "publish_time": self._format_datetime(post.get('publish_time')),
-                "quality_score": post.get('quality_score', 0)
-            }
-            json_data["items"].append(item)
+        kind = 'json' if pretty else 'json-compact'
+        renderer = partial(self._render_json_item, pretty=pretty)
+        items = [self._render_fragment(kind, post, renderer) for post in posts]
         
         # 生成JSON字符串
-        indent = 2 if pretty else None
-        json_str = json.dumps(json_data, ensure_ascii=False, indent=indent)
+        if pretty:
+            head = json.dumps(json_data, ensure_ascii=False, indent=2)[:-2]
+            body = ',\n'.join(items)
+            json_str = f'{head},\n  "items": [\n{body}\n  ]\n}}' if items else f'{head},\n  "items": []\n}}'
+        else:
+            head = json.dumps(json_data, ensure_ascii=False)[:-1]
+            json_str = f'{head}, "items": [{", ".join(items)}]}}'
         
         # 如果指定了输出文件，保存到文件
         if output_file:
             try:
-                Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(json_str)
-                logger.info(f"JSON数据已保存到: {output_file}")
+                if self.publisher.publish(output_file, json_str.encode('utf-8')):
+                    logger.info(f"JSON数据已保存到: {output_file}")
+                else:
+                    logger.info(f"JSON数据内容未变化，保留原文件: {output_file}")
             except Exception as e:
                 logger.error(f"保存JSON文件失败: {e}")
                 raise
         
         return json_str
     
+    def generate_json_pages(
+        self,
+        posts: List[Dict],
+        output_dir: str,
+        page_size: Optional[int] = None,
+        prefix: str = 'feed',
+        pretty: bool = False
+    ) -> str:
+        """
+        生成分页的JSON数据：固定大小的分页文件 {prefix}-1.json、{prefix}-2.json…
+        以及记录各页条目数和游标的索引文件 {prefix}-index.json
+        
+        客户端先读取索引（或直接读取第1页），再沿 next 按需加载后续分页。
+        多余的旧分页文件会被删除。
+        
+        Args:
+            posts: 线报数据列表（按输出顺序）
+            output_dir: 输出目录
+            page_size: 每页条目数（默认取配置 JSON_PAGE_SIZE）
+            prefix: 文件名前缀
+            pretty: 是否格式化输出（默认紧凑输出）
+            
+        Returns:
+            索引JSON字符串
+        """
+        page_size = max(1, page_size or settings.JSON_PAGE_SIZE)
+        directory = Path(output_dir)
+        page_count = max(1, -(-len(posts) // page_size))
+        
+        def page_file(n: int) -> Optional[str]:
+            return f"{prefix}-{n}.json" if 1 <= n <= page_count else None
+        
+        pages = []
+        written = 0
+        for n in range(1, page_count + 1):
+            offset = (n - 1) * page_size
+            items = [self._json_item(post) for post in posts[offset:offset + page_size]]
+            times = sorted(item['publish_time'] for item in items if item['publish_time'])
+            page = {
+                "page": n,
+                "page_count": page_count,
+                "offset": offset,
+                "count": len(items),
+                "prev": page_file(n - 1),
+                "next": page_file(n + 1),
+                "items": items,
+            }
+            if self.publisher.publish(directory / page_file(n), dump_json(page, pretty)):
+                written += 1
+            pages.append({
+                "page": n,
+                "file": page_file(n),
+                "offset": offset,
+                "count": len(items),
+                "newest": times[-1] if times else None,
+                "oldest": times[0] if times else None,
+            })
+        
+        # 删除本次没有用到的旧分页
+        pattern = re.compile(rf'^{re.escape(prefix)}-(\d+)\.json$')
+        if directory.exists():
+            for path in directory.iterdir():
+                match = pattern.match(path.name)
+                if match and int(match.group(1)) > page_count:
+                    self.publisher.remove(path)
+        
+        index = {
+            "title": self.title,
+            "description": self.description,
+            "link": self.link,
+            "updated": datetime.now(pytz.timezone('Asia/Shanghai')).isoformat(),
+            "total": len(posts),
+            "page_size": page_size,
+            "page_count": page_count,
+            "first": page_file(1),
+            "pages": pages,
+        }
+        index_data = dump_json(index, pretty)
+        self.publisher.publish(directory / f"{prefix}-index.json", index_data)
+        logger.info(
+            f"分页JSON已保存到: {directory}（{len(posts)} 条，{page_count} 页，更新 {written} 页）"
+        )
+        return index_data.decode('utf-8')
+    
+    def _json_item(self, post: Dict) -> Dict:
+        """
+        转换单条帖子为JSON条目
+        
+        Args:
+            post: 线报数据
+            
+        Returns:
+            JSON条目字典
+        """
+        return {
+            "title": post.get('title', ''),
+            "url": post.get('url', ''),
+            "category": post.get('category', ''),
+            "content": post.get('content', ''),
+            "summary": post.get('summary', ''),
+            "author": post.get('author', ''),
+            "publish_time": self._format_datetime(post.get('publish_time')),
+            "quality_score": post.get('quality_score', 0)
+        }
+    
+    def _render_json_item(self, post: Dict, pretty: bool = True) -> str:
+        """
+        渲染单条帖子的JSON条目
+        
+        Args:
+            post: 线报数据
+            pretty: 是否格式化输出（缩进与条目在 items 数组中的层级一致）
+            
+        Returns:
+            JSON片段
+        """
+        item = self._json_item(post)
+        if not pretty:
+            return json.dumps(item, ensure_ascii=False)
+        return textwrap.indent(json.dumps(item, ensure_ascii=False, indent=2), '    ')
+    
     def _format_datetime(self, dt) -> str:
         """
         格式化datetime对象为ISO字符串
@@ -353,6 +604,29 @@ class RSSGenerator:
         return str(dt)
 
 
+# 输出格式 -> 渲染函数(生成器, 帖子列表, 输出文件) -> 渲染结果字符串
+FeedRenderer = Callable[[RSSGenerator, List[Dict], Optional[str]], str]
+
+FEED_FORMATS: Dict[str, FeedRenderer] = {
+    'rss': lambda generator, posts, output_file: generator.generate_rss(posts, output_file=output_file),
+    'atom': lambda generator, posts, output_file: generator.generate_atom(posts, output_file=output_file),
+    'json': lambda generator, posts, output_file: generator.generate_json(posts, output_file=output_file),
+    # 分页JSON的输出路径为目录
+    'json-pages': lambda generator, posts, output_dir: generator.generate_json_pages(posts, output_dir or 'output'),
+}
+
+
+def register_feed_format(name: str, renderer: FeedRenderer) -> None:
+    """
+    注册新的输出格式，注册后可在 RSSManager.generate_feeds 中使用
+    
+    Args:
+        name: 格式名
+        renderer: 渲染函数，参数为 (RSSGenerator, 帖子列表, 输出文件路径或None)，返回渲染结果
+    """
+    FEED_FORMATS[name] = renderer
+
+
 class RSSManager:
     """RSS管理器 - 整合爬虫、过滤器和生成器"""
     
@@ -360,7 +634,9 @@ class RSSManager:
         self,
         crawler,
         quality_filter,
-        rss_generator: Optional[RSSGenerator] = None
+        rss_generator: Optional[RSSGenerator] = None,
+        deduplicator=None,
+        post_store=None
     ):
         """
         初始化RSS管理器
@@ -369,10 +645,225 @@ class RSSManager:
             crawler: 爬虫实例
             quality_filter: 质量过滤器实例
             rss_generator: RSS生成器实例（可选）
+            deduplicator: 近似重复过滤器实例（可选，在爬取和过滤之间去重）
+            post_store: 帖子存储（可选，PostStore 或 SQLitePostStore，提供后每次爬取的结果
+                都会写入，用于增量Feed）
         """
         self.crawler = crawler
         self.quality_filter = quality_filter
         self.rss_generator = rss_generator or RSSGenerator()
+        self.deduplicator = deduplicator
+        self.post_store = post_store
+    
+    async def collect_posts(self, max_items: int = 50) -> List[Dict]:
+        """
+        爬取并过滤一次，得到本次输出的帖子快照（爬取 -> 去重 -> 过滤）
+        
+        未配置去重时边爬取边评分（流式Top-K）；配置了去重时，同一线报的多个版本要按分数
+        决定保留哪一条，需要先收集完整批次再去重，此时不再边爬取边评分。
+        
+        Args:
+            max_items: 最大条目数
+            
+        Returns:
+            按质量分数降序排列的帖子列表
+        """
+        # 边爬取边过滤，只保留前 max_items 条
+        posts = self.crawler.crawl_iter()
+        if self.deduplicator is not None:
+            # 近似去重需要比较同批次的所有帖子，先收集完整批次
+            posts = self.deduplicator.dedupe([post async for post in posts])
+        # 有帖子存储时保存所有通过过滤的帖子，而不只是输出的前 max_items 条
+        filtered_posts = await self.quality_filter.filter_stream(
+            posts, max_items=max_items, keep_passed=self.post_store is not None
+        )
+        stats = self.quality_filter.last_stats
+        logger.info(f"爬取到 {stats.get('total', 0)} 条线报，{stats.get('passed', 0)} 条通过过滤")
+        logger.info(f"输出前 {len(filtered_posts)} 条高质量线报")
+        if self.post_store is not None:
+            changed = self.post_store.upsert(self.quality_filter.last_passed)
+            logger.debug(f"帖子存储: 新增或更新 {changed} 条，最新序号 {self.post_store.latest_seq}")
+        elif settings.INCREMENTAL_CRAWL:
+            logger.warning("增量模式下未配置帖子存储，输出只包含本次新爬取的帖子")
+        
+        # 帖子已评分并保存，此时才记录为已处理（增量模式），中途失败时下次重新爬取
+        if hasattr(self.crawler, 'mark_seen'):
+            self.crawler.mark_seen()
+        
+        if self.post_store is not None and settings.INCREMENTAL_CRAWL:
+            filtered_posts = await self._backfill_posts(max_items)
+        if self.deduplicator is not None:
+            self.deduplicator.save()
+        return filtered_posts
+    
+    async def _backfill_posts(self, max_items: int) -> List[Dict]:
+        """
+        增量模式下爬虫只产出新帖子，从帖子存储取出时间范围内的帖子重新去重、评分，补齐完整的输出
+        
+        Args:
+            max_items: 最大条目数
+            
+        Returns:
+            按质量分数降序排列的帖子列表
+        """
+        since = datetime.now() - timedelta(days=settings.MAX_POST_AGE_DAYS)
+        recent_posts = [post for _, post in self.post_store.since_time(since)]
+        if self.deduplicator is not None:
+            # 之前的爬取已保存的近似重复帖子不再重新进入输出
+            recent_posts = self.deduplicator.dedupe(recent_posts)
+        posts = await self.quality_filter.filter_stream(recent_posts, max_items=max_items)
+        logger.info(f"增量模式: 从帖子存储补齐，输出 {len(posts)} 条（存储中近期帖子 {len(recent_posts)} 条）")
+        return posts
+    
+    def get_delta(
+        self,
+        cursor: Union[str, int, None] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict], str]:
+        """
+        获取客户端游标之后的新帖子（只访问索引中游标之后的部分）
+        
+        Args:
+            cursor: 客户端上次拿到的游标（帖子序号、ISO 8601时间或返回的时间游标），为空时返回最近的帖子
+            limit: 最多返回的条目数
+            
+        Returns:
+            (按从新到旧排列的帖子列表, 客户端下次请求使用的游标)
+            
+        Raises:
+            RuntimeError: 未配置帖子存储
+            ValueError: 游标格式不正确
+        """
+        if self.post_store is None:
+            raise RuntimeError("未配置帖子存储，无法生成增量Feed")
+        
+        position = parse_cursor(cursor)
+        if position is None:
+            entries = self.post_store.latest(limit)
+        elif isinstance(position, tuple):
+            entries = self.post_store.since_time(position[0], limit, after_seq=position[1])
+        else:
+            entries = self.post_store.since_seq(position, limit)
+        
+        if isinstance(position, tuple) and len(entries) >= limit:
+            # 按时间查询被截断时，下次从最后一条的 (发布时间, 序号) 继续，发布时间相同的帖子不会被跳过
+            last_seq, last_post = entries[-1]
+            last_time = last_post.get('publish_time')
+            next_cursor = (
+                format_time_cursor(last_time, last_seq) if isinstance(last_time, datetime)
+                else str(self.post_store.latest_seq)
+            )
+        elif isinstance(position, int) and len(entries) >= limit:
+            next_cursor = str(entries[-1][0])
+        else:
+            next_cursor = str(self.post_store.latest_seq)
+        
+        posts = [post for _, post in reversed(entries)]
+        return posts, next_cursor
+    
+    async def generate_delta_feed(
+        self,
+        cursor: Union[str, int, None] = None,
+        feed_format: str = 'rss',
+        limit: int = 50
+    ) -> Tuple[str, str]:
+        """
+        生成客户端游标之后的增量Feed（不写文件）
+        
+        Args:
+            cursor: 客户端上次拿到的游标
+            feed_format: 输出格式（rss / atom / json 等已注册的单文件格式）
+            limit: 最多包含的条目数
+            
+        Returns:
+            (渲染结果字符串, 客户端下次请求使用的游标)
+        """
+        if feed_format not in FEED_FORMATS or feed_format == 'json-pages':
+            raise ValueError(f"增量Feed不支持的格式: {feed_format}")
+        
+        posts, next_cursor = self.get_delta(cursor, limit)
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(
+            None, partial(FEED_FORMATS[feed_format], self.rss_generator, posts, None)
+        )
+        return content, next_cursor
+    
+    async def render_feeds(
+        self,
+        posts: List[Dict],
+        outputs: Dict[str, Optional[str]]
+    ) -> Dict[str, str]:
+        """
+        用同一批帖子并发渲染多种输出格式
+        
+        各格式在线程池中同时渲染，渲染过程只读取帖子，不做修改。某个格式失败时
+        其余格式照常完成，之后再抛出第一个错误。
+        
+        Args:
+            posts: 已过滤的帖子列表
+            outputs: 格式名 -> 输出文件路径（None表示只返回结果不写文件），
+                格式名须已在 FEED_FORMATS 中注册
+            
+        Returns:
+            格式名 -> 渲染结果字符串
+        """
+        unknown = [name for name in outputs if name not in FEED_FORMATS]
+        if unknown:
+            raise ValueError(f"未知的输出格式: {unknown}，可选: {list(FEED_FORMATS)}")
+        
+        loop = asyncio.get_running_loop()
+        names = list(outputs)
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    None,
+                    partial(FEED_FORMATS[name], self.rss_generator, posts, outputs[name])
+                )
+                for name in names
+            ),
+            return_exceptions=True
+        )
+        
+        rendered = {}
+        errors = []
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.error(f"生成 {name} 格式失败: {result}")
+                errors.append(result)
+            else:
+                rendered[name] = result
+        self.rss_generator.save_cache()
+        if errors:
+            raise errors[0]
+        return rendered
+    
+    async def generate_feeds(
+        self,
+        outputs: Dict[str, Optional[str]],
+        max_items: int = 50
+    ) -> Dict[str, str]:
+        """
+        爬取和过滤一次，并发生成多种格式的feed
+        
+        Args:
+            outputs: 格式名 -> 输出文件路径，如 {'rss': 'output/feed.xml', 'json': 'output/feed.json'}
+            max_items: 最大条目数
+            
+        Returns:
+            格式名 -> 渲染结果字符串
+        """
+        logger.info(f"开始生成Feed: {', '.join(outputs)}")
+        
+        # 1. 爬取并过滤（所有格式共用同一批结果）
+        logger.info("步骤1: 爬取线报数据并应用质量过滤...")
+        filtered_posts = await self.collect_posts(max_items)
+        
+        # 2. 并发渲染各格式
+        logger.info("步骤2: 生成Feed...")
+        rendered = await self.render_feeds(filtered_posts, outputs)
+        
+        logger.info(f"✓ Feed生成完成！{len(rendered)} 种格式，包含 {len(filtered_posts)} 条高质量线报")
+        return rendered
     
     async def generate_rss_feed(
         self,
@@ -382,6 +873,8 @@ class RSSManager:
         """
         生成完整的RSS feed（爬取 -> 过滤 -> 生成RSS）
         
+        需要多种格式时使用 generate_feeds，避免重复爬取。
+        
         Args:
             output_file: 输出文件路径
             max_items: 最大条目数
@@ -389,29 +882,5 @@ class RSSManager:
         Returns:
             RSS XML字符串
         """
-        logger.info("开始生成RSS Feed...")
-        
-        # 1. 爬取数据
-        logger.info("步骤1: 爬取线报数据...")
-        posts = await self.crawler.crawl()
-        logger.info(f"爬取到 {len(posts)} 条线报")
-        
-        # 2. 过滤数据
-        logger.info("步骤2: 应用质量过滤...")
-        filtered_posts = self.quality_filter.filter_posts(posts)
-        logger.info(f"过滤后剩余 {len(filtered_posts)} 条高质量线报")
-        
-        # 3. 限制条目数
-        if len(filtered_posts) > max_items:
-            filtered_posts = filtered_posts[:max_items]
-            logger.info(f"限制输出条目数为 {max_items}")
-        
-        # 4. 生成RSS
-        logger.info("步骤3: 生成RSS Feed...")
-        rss_content = self.rss_generator.generate_rss(
-            filtered_posts,
-            output_file=output_file
-        )
-        
-        logger.info(f"✓ RSS Feed生成完成！包含 {len(filtered_posts)} 条高质量线报")
-        return rss_content
\ No newline at end of file
+        rendered = await self.generate_feeds({'rss': output_file}, max_items=max_items)
+        return rendered['rss']
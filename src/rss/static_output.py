@@ -0,0 +1,260 @@
+"""
+静态输出发布
+原子写入（先写临时文件再重命名）Feed文件，生成预压缩的 .gz / .br 文件，并在输出目录的
+清单文件中记录ETag和大小；内容（不计生成时间）未变化时不重写文件
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from loguru import logger
+from ..config import settings
+
+try:
+    import brotli  # 可选，生成 .br 文件
+except ImportError:
+    brotli = None
+
+# 每次生成都会变化的时间字段，判断内容是否变化时忽略
+_VOLATILE_PATTERNS = [
+    # RSS频道的 lastBuildDate 及与之相同的 pubDate
+    re.compile(rb'<lastBuildDate>([^<]*)</lastBuildDate>(\s*)<pubDate>\1</pubDate>'),
+    # Atom的 updated
+    re.compile(rb'<updated>[^<]*</updated>'),
+    # JSON的 updated
+    re.compile(rb'"updated": ?"[^"]*"'),
+]
+
+CONTENT_TYPES = {
+    '.xml': 'application/rss+xml; charset=utf-8',
+    '.atom': 'application/atom+xml; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+}
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def content_hash(data: bytes) -> str:
+    """
+    计算忽略生成时间后的内容哈希
+    
+    Args:
+        data: 文件内容
+    
+    Returns:
+        内容哈希
+    """
+    for pattern in _VOLATILE_PATTERNS:
+        data = pattern.sub(b'', data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class StaticPublisher:
+    """Feed静态文件发布器（线程安全）"""
+    
+    def __init__(
+        self,
+        gzip_enabled: bool = True,
+        brotli_enabled: bool = False,
+        manifest_name: str = 'manifest.json'
+    ):
+        """
+        初始化发布器
+        
+        Args:
+            gzip_enabled: 是否生成 .gz 文件
+            brotli_enabled: 是否生成 .br 文件（需要安装 brotli）
+            manifest_name: 输出目录中清单文件的文件名（为空时不生成清单）
+        """
+        self.gzip_enabled = gzip_enabled
+        self.brotli_enabled = brotli_enabled
+        if self.brotli_enabled and brotli is None:
+            logger.warning("未安装 brotli，不生成 .br 文件")
+            self.brotli_enabled = False
+        self.manifest_name = manifest_name
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls) -> 'StaticPublisher':
+        """按 OUTPUT_GZIP / OUTPUT_BROTLI / OUTPUT_MANIFEST 创建发布器"""
+        return cls(
+            gzip_enabled=settings.OUTPUT_GZIP,
+            brotli_enabled=settings.OUTPUT_BROTLI,
+            manifest_name=settings.OUTPUT_MANIFEST
+        )
+    
+    def publish(self, path: Union[str, Path], data: bytes) -> bool:
+        """
+        发布完整的文件内容
+        
+        Args:
+            path: 输出文件路径
+            data: 文件内容
+        
+        Returns:
+            是否写入了文件（内容未变化时返回False）
+        """
+        path = Path(path)
+        digest = content_hash(data)
+        entry = self._load_manifest(path.parent).get(path.name)
+        if entry and entry.get('content_hash') == digest and self._outputs_exist(path):
+            logger.debug(f"内容未变化，跳过写入: {path}")
+            return False
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(path)
+        tmp_path.write_bytes(data)
+        self._finish(path, tmp_path, digest)
+        return True
+    
+    @contextmanager
+    def open_stream(self, path: Union[str, Path]) -> Iterator[BinaryIO]:
+        """
+        以流的方式写入文件，写完后原子替换（适合不便整体放入内存的大文件）
+        
+        流式写入的文件总是会被替换，不做内容未变化的判断。
+        
+        Args:
+            path: 输出文件路径
+        
+        Yields:
+            临时文件的二进制写入流
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(path)
+        try:
+            with open(tmp_path, 'wb') as f:
+                yield f
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._finish(path, tmp_path, None)
+    
+    def remove(self, path: Union[str, Path]) -> None:
+        """
+        删除已发布的文件、压缩文件及其清单记录
+        
+        Args:
+            path: 输出文件路径
+        """
+        path = Path(path)
+        for target in (path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')):
+            target.unlink(missing_ok=True)
+        self._update_manifest(path, None)
+    
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    
+    def _outputs_exist(self, path: Path) -> bool:
+        """文件及需要的压缩文件是否都存在"""
+        if not path.exists():
+            return False
+        if self.gzip_enabled and not path.with_name(path.name + '.gz').exists():
+            return False
+        if self.brotli_enabled and not path.with_name(path.name + '.br').exists():
+            return False
+        return True
+    
+    def _finish(self, path: Path, tmp_path: Path, digest: Optional[str]) -> None:
+        """生成压缩文件，原子替换目标文件并更新清单"""
+        try:
+            etag = hashlib.blake2b(digest_size=16)
+            with open(tmp_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                    etag.update(chunk)
+            if digest is None:
+                digest = etag.hexdigest()
+            
+            entry = {
+                'etag': f'"{etag.hexdigest()}"',
+                'content_hash': digest,
+                'size': tmp_path.stat().st_size,
+                'content_type': CONTENT_TYPES.get(path.suffix, 'application/octet-stream'),
+                'updated': datetime.now().astimezone().isoformat(timespec='seconds'),
+            }
+            
+            # 先替换压缩文件，再替换原文件
+            gz_path = path.with_name(path.name + '.gz')
+            if self.gzip_enabled:
+                entry['gzip_size'] = self._compress(tmp_path, gz_path, 'gzip')
+            else:
+                gz_path.unlink(missing_ok=True)
+            br_path = path.with_name(path.name + '.br')
+            if self.brotli_enabled:
+                entry['br_size'] = self._compress(tmp_path, br_path, 'br')
+            else:
+                br_path.unlink(missing_ok=True)
+            
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        self._update_manifest(path, entry)
+    
+    def _compress(self, src: Path, dest: Path, method: str) -> int:
+        """
+        压缩文件并原子替换目标文件
+        
+        Returns:
+            压缩后的大小
+        """
+        tmp_path = self._tmp_path(dest)
+        try:
+            with open(src, 'rb') as fin, open(tmp_path, 'wb') as fout:
+                if method == 'gzip':
+                    # mtime=0 保证相同内容得到相同的压缩结果
+                    with gzip.GzipFile(filename='', mode='wb', fileobj=fout, compresslevel=9, mtime=0) as gz:
+                        shutil.copyfileobj(fin, gz, _CHUNK_SIZE)
+                else:
+                    compressor = brotli.Compressor(quality=11)
+                    for chunk in iter(lambda: fin.read(_CHUNK_SIZE), b''):
+                        fout.write(compressor.process(chunk))
+                    fout.write(compressor.finish())
+            os.replace(tmp_path, dest)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return dest.stat().st_size
+    
+    def _load_manifest(self, directory: Path) -> Dict[str, Dict]:
+        """读取输出目录的清单"""
+        if not self.manifest_name:
+            return {}
+        
+        manifest_path = directory / self.manifest_name
+        if not manifest_path.exists():
+            return {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"输出清单文件损坏，已忽略: {e}")
+            return {}
+    
+    def _update_manifest(self, path: Path, entry: Optional[Dict]) -> None:
+        """更新清单中的单个文件记录（entry为None时删除记录，原子写入）"""
+        if not self.manifest_name:
+            return
+        
+        with self._lock:
+            manifest = self._load_manifest(path.parent)
+            if entry is None:
+                if manifest.pop(path.name, None) is None:
+                    return
+            else:
+                manifest[path.name] = entry
+            manifest_path = path.parent / self.manifest_name
+            tmp_path = self._tmp_path(manifest_path)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, manifest_path)
@@ -0,0 +1,256 @@
+"""
+流式Feed写入器
+逐条输出RSS 2.0 / Atom 1.0条目，不构建完整的文档树；输出结构与 feedgen 生成的一致
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import BinaryIO, Iterable, NamedTuple, Optional
+import re
+
+RSS_DOCS = 'http://www.rssboard.org/rss-specification'
+XML_DECLARATION = b"<?xml version='1.0' encoding='UTF-8'?>\n"
+
+# XML 1.0 不允许出现的字符（lxml 遇到时会直接报错，这里改为删除）
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+
+def escape_text(value: str) -> str:
+    """
+    转义元素文本（与 libxml2 的转义规则一致）
+    
+    Args:
+        value: 原始文本
+    
+    Returns:
+        转义后的文本
+    """
+    value = _INVALID_XML_CHARS.sub('', value)
+    return (
+        value.replace('&', '&amp;')
+        .replace('<', '&lt;')
+        .replace('>', '&gt;')
+        .replace('\r', '&#13;')
+    )
+
+
+def escape_attr(value: str) -> str:
+    """
+    转义属性值（与 libxml2 的转义规则一致）
+    
+    Args:
+        value: 原始属性值
+    
+    Returns:
+        转义后的属性值（不含两侧引号）
+    """
+    return (
+        escape_text(value)
+        .replace('"', '&quot;')
+        .replace('\n', '&#10;')
+        .replace('\t', '&#9;')
+    )
+
+
+class FeedEntry(NamedTuple):
+    """待写入的条目（pub_time 须带时区）"""
+    title: str
+    url: str
+    description: str
+    category: str = ''
+    author: str = ''
+    pub_time: Optional[datetime] = None
+
+
+class FeedXMLWriter:
+    """RSS/Atom流式写入器"""
+    
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        description: str,
+        language: str,
+        generator: str,
+        pretty: bool = True
+    ):
+        """
+        初始化写入器
+        
+        Args:
+            title: Feed标题
+            link: Feed链接
+            description: Feed描述
+            language: Feed语言
+            generator: 生成器名称
+            pretty: 是否缩进换行（与 feedgen 的 pretty 输出一致）
+        """
+        self.title = title
+        self.link = link
+        self.description = description
+        self.language = language
+        self.generator = generator
+        self.pretty = pretty
+    
+    def _element(self, depth: int, name: str, text: str, attrs: str = '') -> str:
+        """生成单个已转义的文本元素"""
+        indent = '  ' * depth if self.pretty else ''
+        newline = '\n' if self.pretty else ''
+        if not text:
+            return f"{indent}<{name}{attrs}/>{newline}"
+        return f"{indent}<{name}{attrs}>{text}</{name}>{newline}"
+    
+    def _open(self, depth: int, tag: str) -> str:
+        return f"{'  ' * depth}<{tag}>\n" if self.pretty else f"<{tag}>"
+    
+    def _close(self, depth: int, name: str) -> str:
+        return f"{'  ' * depth}</{name}>\n" if self.pretty else f"</{name}>"
+    
+    def rss_item(self, entry: FeedEntry) -> str:
+        """
+        生成单个RSS <item> 片段
+        
+        Args:
+            entry: 条目
+        
+        Returns:
+            片段文本
+        """
+        url = escape_text(entry.url)
+        parts = [
+            self._open(2, 'item'),
+            self._element(3, 'title', escape_text(entry.title)),
+            self._element(3, 'link', url),
+        ]
+        if entry.description:
+            parts.append(self._element(3, 'description', escape_text(entry.description)))
+        parts.append(self._element(3, 'guid', url, ' isPermaLink="true"'))
+        if entry.category:
+            parts.append(self._element(3, 'category', escape_text(entry.category)))
+        if entry.pub_time:
+            parts.append(self._element(3, 'pubDate', format_datetime(entry.pub_time)))
+        parts.append(self._close(2, 'item'))
+        return ''.join(parts)
+    
+    def atom_entry(self, entry: FeedEntry, updated: Optional[datetime] = None) -> str:
+        """
+        生成单个Atom <entry> 片段
+        
+        Args:
+            entry: 条目
+            updated: 条目更新时间（默认当前UTC时间）
+        
+        Returns:
+            片段文本
+        """
+        updated = updated or datetime.now(timezone.utc)
+        url = escape_text(entry.url)
+        parts = [
+            self._open(1, 'entry'),
+            self._element(2, 'id', url),
+            self._element(2, 'title', escape_text(entry.title)),
+            self._element(2, 'updated', updated.isoformat()),
+        ]
+        if entry.author:
+            parts.append(self._open(2, 'author'))
+            parts.append(self._element(3, 'name', escape_text(entry.author)))
+            parts.append(self._close(2, 'author'))
+        parts.append(self._element(2, 'content', escape_text(entry.description)))
+        parts.append(self._element(2, 'link', '', f' href="{escape_attr(entry.url)}" rel="alternate"'))
+        if entry.category:
+            parts.append(self._element(2, 'category', '', f' term="{escape_attr(entry.category)}"'))
+        if entry.pub_time:
+            parts.append(self._element(2, 'published', entry.pub_time.isoformat()))
+        parts.append(self._close(1, 'entry'))
+        return ''.join(parts)
+    
+    def rss_header(self, build_time: datetime) -> bytes:
+        """
+        生成RSS文档开头（XML声明、<rss>、<channel>及频道信息）
+        
+        Args:
+            build_time: 生成时间（带时区）
+        """
+        build_date = format_datetime(build_time)
+        parts = [
+            '<rss xmlns:atom="http://www.w3.org/2005/Atom" '
+            'xmlns:content="http://purl.org/rss/1.0/modules/content/" version="2.0">',
+            '\n' if self.pretty else '',
+            self._open(1, 'channel'),
+            self._element(2, 'title', escape_text(self.title)),
+            self._element(2, 'link', escape_text(self.link)),
+            self._element(2, 'description', escape_text(self.description)),
+            self._element(2, 'docs', RSS_DOCS),
+            self._element(2, 'generator', escape_text(self.generator)),
+            self._element(2, 'language', escape_text(self.language)),
+            self._element(2, 'lastBuildDate', build_date),
+            self._element(2, 'pubDate', build_date),
+        ]
+        return XML_DECLARATION + ''.join(parts).encode('utf-8')
+    
+    def rss_footer(self) -> bytes:
+        """生成RSS文档结尾"""
+        return (self._close(1, 'channel') + self._close(0, 'rss')).encode('utf-8')
+    
+    def atom_header(self, build_time: datetime) -> bytes:
+        """
+        生成Atom文档开头（XML声明、<feed>及Feed信息）
+        
+        Args:
+            build_time: 生成时间（带时区）
+        """
+        parts = [
+            f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="{escape_attr(self.language)}">',
+            '\n' if self.pretty else '',
+            self._element(1, 'id', escape_text(self.link)),
+            self._element(1, 'title', escape_text(self.title)),
+            self._element(1, 'updated', build_time.isoformat()),
+            self._element(1, 'link', '', f' href="{escape_attr(self.link)}" rel="alternate"'),
+            self._element(1, 'generator', escape_text(self.generator)),
+            self._element(1, 'subtitle', escape_text(self.description)),
+        ]
+        return XML_DECLARATION + ''.join(parts).encode('utf-8')
+    
+    def atom_footer(self) -> bytes:
+        """生成Atom文档结尾"""
+        return self._close(0, 'feed').encode('utf-8')
+    
+    def write_rss(self, out: BinaryIO, entries: Iterable[FeedEntry], build_time: datetime) -> int:
+        """
+        逐条写入完整的RSS文档
+        
+        Args:
+            out: 二进制输出流（文件、socket.makefile('wb') 等）
+            entries: 条目（可为生成器，按迭代顺序写入）
+            build_time: 生成时间（带时区）
+        
+        Returns:
+            写入的条目数
+        """
+        out.write(self.rss_header(build_time))
+        count = 0
+        for entry in entries:
+            out.write(self.rss_item(entry).encode('utf-8'))
+            count += 1
+        out.write(self.rss_footer())
+        return count
+    
+    def write_atom(self, out: BinaryIO, entries: Iterable[FeedEntry], build_time: datetime) -> int:
+        """
+        逐条写入完整的Atom文档
+        
+        Args:
+            out: 二进制输出流
+            entries: 条目（可为生成器，按迭代顺序写入）
+            build_time: 生成时间（带时区）
+        
+        Returns:
+            写入的条目数
+        """
+        out.write(self.atom_header(build_time))
+        updated = datetime.now(timezone.utc)
+        count = 0
+        for entry in entries:
+            out.write(self.atom_entry(entry, updated).encode('utf-8'))
+            count += 1
+        out.write(self.atom_footer())
+        return count
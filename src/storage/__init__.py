@@ -0,0 +1,10 @@
+"""
+存储模块
+"""
+from .post import Post
+from .post_store import PostStore, format_time_cursor, parse_cursor
+from .search_index import SearchIndex
+from .seen_store import SeenStore
+from .sqlite_post_store import SQLitePostStore, sqlite_path
+
+__all__ = ['Post', 'PostStore', 'SQLitePostStore', 'SearchIndex', 'SeenStore', 'format_time_cursor', 'parse_cursor', 'sqlite_path']
\ No newline at end of file
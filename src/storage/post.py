@@ -0,0 +1,180 @@
+"""
+紧凑的帖子记录
+使用 __slots__ 保存帖子字段，分类、来源和作者字符串驻留（intern）共享，长内容可压缩保存、
+读取时再解压；实现 MutableMapping 接口，可直接替代原来的帖子字典
+"""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping, Optional
+import sys
+import zlib
+
+# 帖子字段（BaseCrawler.create_post_dict 的字段 + 爬虫和过滤器补充的字段），其他字段保存在 _extra 中
+POST_FIELDS = (
+    'title', 'url', 'author', 'publish_time', 'content', 'source', 'view_count', 'reply_count',
+    'crawl_time', 'category', 'comments', 'comment_links', 'quality_score'
+)
+# 直接保存在同名槽中的字段（content 需要压缩/解压，单独处理）
+_FIELD_SET = frozenset(POST_FIELDS) - {'content'}
+
+# 取值重复较多的字段，保存时驻留字符串
+_INTERNED_FIELDS = frozenset(('source', 'category', 'author'))
+
+# 压缩保存内容的最小长度（字符数），较短的内容压缩收益不大
+COMPRESS_MIN_LENGTH = 128
+
+# content 与标题相同时不重复保存
+_SAME_AS_TITLE = object()
+
+
+class Post(MutableMapping):
+    """
+    帖子记录（与帖子字典的用法一致：post['title']、post.get('category', '')、dict(post) 等）
+    
+    未设置的字段视为不存在，与字典中没有该键的行为相同。
+    
+    Post 不是 dict 的子类，不能直接 json.dumps / orjson.dumps（会抛出 TypeError），序列化前先调用
+    to_dict()；与原帖子字典一样，publish_time 等 datetime 字段仍需另行转换（见 RSSGenerator._json_item）。
+    """
+    
+    __slots__ = tuple(f'_{field}' if field == 'content' else field for field in POST_FIELDS) + (
+        '_extra', '_compress'
+    )
+    
+    def __init__(self, data: Optional[Mapping[str, Any]] = None, compress_content: bool = False, **fields):
+        """
+        创建帖子记录
+        
+        Args:
+            data: 帖子字段（可选，字典或其他Mapping）
+            compress_content: 是否压缩保存较长的内容（适合长期保存在内存中的帖子，读取内容时解压）
+            **fields: 其他帖子字段
+        """
+        self._extra: Optional[Dict[str, Any]] = None
+        self._compress = compress_content
+        if data is not None:
+            for key, value in data.items():
+                self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+    
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any], compress_content: bool = False) -> 'Post':
+        """
+        复制帖子字典或帖子记录
+        
+        Args:
+            data: 帖子数据
+            compress_content: 是否压缩保存较长的内容
+        
+        Returns:
+            新的帖子记录
+        """
+        return cls(data, compress_content=compress_content)
+    
+    @property
+    def content(self) -> str:
+        """帖子内容（按需解压）"""
+        return self['content']
+    
+    def _set_content(self, value: Any) -> None:
+        """保存内容：与标题相同时只记录标记，开启压缩时压缩较长的内容"""
+        if isinstance(value, str):
+            if value == getattr(self, 'title', None):
+                value = _SAME_AS_TITLE
+            elif self._compress and len(value) >= COMPRESS_MIN_LENGTH:
+                compressed = zlib.compress(value.encode('utf-8'))
+                if sys.getsizeof(compressed) < sys.getsizeof(value):
+                    value = compressed
+        self._content = value
+    
+    def _get_content(self) -> Any:
+        """读取内容（解压或取标题）"""
+        value = self._content
+        if value is _SAME_AS_TITLE:
+            return self.title
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode('utf-8')
+        return value
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            if key == 'content':
+                return self._get_content()
+            if key in _FIELD_SET:
+                return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == 'content':
+            self._set_content(value)
+        elif key in _FIELD_SET:
+            if key == 'title' and getattr(self, '_content', None) is _SAME_AS_TITLE:
+                # 内容引用的是旧标题
+                self._content = self.title
+            if key in _INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __delitem__(self, key: str) -> None:
+        try:
+            if key == 'content':
+                del self._content
+                return
+            if key in _FIELD_SET:
+                if key == 'title' and getattr(self, '_content', None) is _SAME_AS_TITLE:
+                    self._content = self.title
+                delattr(self, key)
+                return
+        except AttributeError:
+            raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+    
+    def __contains__(self, key: object) -> bool:
+        if key == 'content':
+            return hasattr(self, '_content')
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+    
+    def __iter__(self) -> Iterator[str]:
+        for field in POST_FIELDS:
+            if field in self:
+                yield field
+        if self._extra:
+            yield from self._extra
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """与 dict.get 相同（避免 Mapping.get 的异常开销）"""
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典（内容已解压，用于序列化等需要真正 dict 的场合）"""
+        return dict(self.items())
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'fields': self.to_dict(), 'compress': self._compress}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state['fields'], compress_content=state['compress'])
+    
+    def __repr__(self) -> str:
+        return f"Post({self.to_dict()!r})"
+
@@ -0,0 +1,230 @@
+"""
+帖子存储（增量Feed）
+为每次新增或内容变化的帖子分配单调递增的序号，并按序号和发布时间建立索引，
+按游标查询“某序号/某时间之后的新帖子”时只需访问新增部分
+"""
+from bisect import bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import hashlib
+import math
+import time
+from .post import Post
+
+# 判断帖子内容是否变化的字段（只有质量分数变化不算新帖子）
+CONTENT_FIELDS = ('title', 'content', 'category', 'author', 'publish_time')
+
+
+def post_content_hash(post: Dict) -> str:
+    """
+    计算帖子内容哈希
+    
+    Args:
+        post: 帖子数据字典
+    
+    Returns:
+        内容哈希
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for field in CONTENT_FIELDS:
+        digest.update(str(post.get(field, '')).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+def post_timestamp(post: Dict) -> float:
+    """获取帖子发布时间戳（没有发布时间时使用当前时间）"""
+    pub_time = post.get('publish_time')
+    return pub_time.timestamp() if isinstance(pub_time, datetime) else time.time()
+
+
+def format_time_cursor(pub_time: datetime, seq: int) -> str:
+    """
+    生成时间游标（发布时间 + 序号，发布时间相同的帖子按序号区分）
+    
+    Args:
+        pub_time: 最后一条帖子的发布时间
+        seq: 最后一条帖子的序号
+    
+    Returns:
+        游标字符串，如 2026-01-01T10:00:00@17
+    """
+    return f"{pub_time.isoformat()}@{seq}"
+
+
+def parse_cursor(cursor: Union[str, int, None]) -> Union[int, Tuple[datetime, Optional[int]], None]:
+    """
+    解析客户端游标
+    
+    Args:
+        cursor: 帖子序号（整数或数字字符串）、ISO 8601时间或 format_time_cursor 生成的时间游标，
+            为空表示没有游标
+    
+    Returns:
+        序号、(时间, 序号) 或None；只给出时间时序号为None，表示该时间之后的全部帖子
+    
+    Raises:
+        ValueError: 游标格式不正确
+    """
+    if cursor is None or cursor == '':
+        return None
+    if isinstance(cursor, int):
+        seq = cursor
+    elif cursor.isdigit():
+        seq = int(cursor)
+    else:
+        time_part, _, seq_part = cursor.partition('@')
+        try:
+            pub_time = datetime.fromisoformat(time_part)
+            after_seq = int(seq_part) if seq_part else None
+        except ValueError:
+            raise ValueError(f"无效的游标: {cursor!r}，应为帖子序号或ISO 8601时间") from None
+        return pub_time, after_seq
+    if seq < 0:
+        raise ValueError(f"无效的游标: {cursor!r}")
+    return seq
+
+
+class PostStore:
+    """内存中的帖子存储（序号索引 + 发布时间索引）"""
+    
+    def __init__(self, max_entries: int = 10000):
+        """
+        初始化存储
+        
+        Args:
+            max_entries: 最多保留的帖子数，超过后删除序号最小（最早入库）的帖子
+        """
+        self.max_entries = max_entries
+        self.latest_seq = 0
+        # url -> (序号, 内容哈希, 发布时间戳, 帖子)
+        self._entries: Dict[str, Tuple[int, str, float, Dict]] = {}
+        # 按序号递增追加的 (序号, url)；帖子更新后旧记录失效，查询时跳过
+        self._seq_index: List[Tuple[int, str]] = []
+        # 按 (发布时间戳, 序号) 排序的 (时间戳, 序号, url)
+        self._time_index: List[Tuple[float, int, str]] = []
+    
+    def upsert(self, posts: Iterable[Dict]) -> int:
+        """
+        写入帖子：新帖子或内容变化的帖子分配新序号，其他帖子只更新字段
+        
+        Args:
+            posts: 帖子列表
+        
+        Returns:
+            新增或内容变化的帖子数
+        """
+        changed = 0
+        for post in posts:
+            url = post['url']
+            content_hash = post_content_hash(post)
+            entry = self._entries.get(url)
+            if entry is not None and entry[1] == content_hash:
+                self._entries[url] = entry[:3] + (Post.from_mapping(post, compress_content=True),)
+                continue
+            
+            self.latest_seq += 1
+            timestamp = post_timestamp(post)
+            self._entries[url] = (
+                self.latest_seq, content_hash, timestamp, Post.from_mapping(post, compress_content=True)
+            )
+            self._seq_index.append((self.latest_seq, url))
+            insort(self._time_index, (timestamp, self.latest_seq, url))
+            changed += 1
+        
+        self._prune()
+        return changed
+    
+    def _is_live(self, seq: int, url: str) -> bool:
+        """索引记录是否仍对应帖子的当前版本"""
+        entry = self._entries.get(url)
+        return entry is not None and entry[0] == seq
+    
+    def since_seq(self, seq: int, limit: Optional[int] = None) -> List[Tuple[int, Dict]]:
+        """
+        查询序号大于 seq 的帖子（按序号升序）
+        
+        Args:
+            seq: 游标序号
+            limit: 最多返回的条目数
+        
+        Returns:
+            (序号, 帖子) 列表
+        """
+        results = []
+        start = bisect_right(self._seq_index, (seq, '\U0010ffff'))
+        for entry_seq, url in self._seq_index[start:]:
+            if limit is not None and len(results) >= limit:
+                break
+            if self._is_live(entry_seq, url):
+                results.append((entry_seq, self._entries[url][3]))
+        return results
+    
+    def since_time(
+        self,
+        after: datetime,
+        limit: Optional[int] = None,
+        after_seq: Optional[int] = None
+    ) -> List[Tuple[int, Dict]]:
+        """
+        查询 (发布时间, 序号) 大于 (after, after_seq) 的帖子（按发布时间、序号升序）
+        
+        Args:
+            after: 游标时间
+            limit: 最多返回的条目数
+            after_seq: 游标序号（发布时间等于 after 的帖子只返回序号更大的；None表示全部跳过）
+        
+        Returns:
+            (序号, 帖子) 列表
+        """
+        results = []
+        key = (after.timestamp(), math.inf if after_seq is None else after_seq, '\U0010ffff')
+        start = bisect_right(self._time_index, key)
+        for _, entry_seq, url in self._time_index[start:]:
+            if limit is not None and len(results) >= limit:
+                break
+            if self._is_live(entry_seq, url):
+                results.append((entry_seq, self._entries[url][3]))
+        return results
+    
+    def latest(self, limit: int) -> List[Tuple[int, Dict]]:
+        """
+        获取最近入库的帖子（按序号升序）
+        
+        Args:
+            limit: 最多返回的条目数
+        
+        Returns:
+            (序号, 帖子) 列表
+        """
+        results = []
+        for entry_seq, url in reversed(self._seq_index):
+            if len(results) >= limit:
+                break
+            if self._is_live(entry_seq, url):
+                results.append((entry_seq, self._entries[url][3]))
+        results.reverse()
+        return results
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """按URL获取帖子"""
+        entry = self._entries.get(url)
+        return entry[3] if entry else None
+    
+    def _prune(self) -> None:
+        """删除超出上限的最早帖子，并在失效记录过多时压缩索引"""
+        if len(self._entries) > self.max_entries:
+            excess = len(self._entries) - self.max_entries
+            for entry_seq, url in self._seq_index:
+                if not excess:
+                    break
+                if self._is_live(entry_seq, url):
+                    del self._entries[url]
+                    excess -= 1
+        
+        if len(self._seq_index) > 2 * len(self._entries) + 100:
+            self._seq_index = [item for item in self._seq_index if self._is_live(*item)]
+            self._time_index = [item for item in self._time_index if self._is_live(item[1], item[2])]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
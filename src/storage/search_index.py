@@ -0,0 +1,191 @@
+"""
+帖子全文索引（SQLite FTS5）
+对标题、内容和评论区链接建立倒排索引：中文按相邻二字切分（bigram，另保留每段中文的末字），
+英文和数字按单词切分，索引文本在Python中切分好后写入FTS5表；帖子写入时增量更新，查询按BM25排序并分页
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+import sqlite3
+import unicodedata
+
+# 参与索引的字段及BM25权重（标题命中最重要）
+SEARCH_FIELDS = ('title', 'content', 'comment_links')
+FIELD_WEIGHTS = (5.0, 1.0, 2.0)
+
+# 切分规则版本，切分方式变化后已有的索引需要重建
+TOKENIZER_VERSION = 2
+
+_CJK_RANGES = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+_TOKEN_PATTERN = re.compile(f'[{_CJK_RANGES}]+|[a-z0-9]+')
+_CJK_PATTERN = re.compile(f'[{_CJK_RANGES}]')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    切分文本（全角转半角并转为小写）
+    
+    连续的中文切分为相邻二字组合，并在末尾保留该段的最后一个字（单个汉字即原字），
+    这样每个汉字都是某个词元的首字，单字查询按前缀即可命中；英文和数字按单词切分，
+    其他字符视为分隔符。
+    
+    例如 “领优惠券” 切分为 领优、优惠、惠券、券。
+    
+    Args:
+        text: 原始文本
+    
+    Returns:
+        词元列表
+    """
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text or '').lower()):
+        if _CJK_PATTERN.match(run) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            tokens.append(run[-1])
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    将用户输入转换为FTS5查询表达式
+    
+    空格分隔的每个词都必须命中（AND），词内按短语匹配以保证是连续的子串；
+    词尾的单字和英文/数字按前缀匹配：既能匹配文本中该段中文的末字，也能匹配以它开头的二字组合，
+    因此单字查询可以命中任意位置的该字，也便于边输入边搜索。
+    
+    Args:
+        query: 用户输入的搜索词
+    
+    Returns:
+        FTS5 MATCH 表达式，没有可搜索的内容时返回None
+    """
+    phrases = []
+    for term in query.split():
+        tokens = tokenize(term)
+        if not tokens:
+            continue
+        phrase = '"' + ' '.join(tokens) + '"'
+        if len(tokens[-1]) == 1 or not _CJK_PATTERN.match(tokens[-1]):
+            phrase += '*'
+        phrases.append(phrase)
+    return ' AND '.join(phrases) if phrases else None
+
+
+class SearchIndex:
+    """
+    基于FTS5的帖子全文索引
+    
+    与帖子表位于同一个数据库，FTS行号即帖子序号；帖子删除或序号变化（内容更新）时由触发器
+    删除旧的索引行，新内容由 index() 在同一事务中写入。
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, table: str = 'posts'):
+        """
+        创建索引表（不存在或切分规则版本变化时重建）并为已有帖子补建索引
+        
+        Args:
+            conn: 数据库连接
+            table: 帖子表名（须包含 seq 及 SEARCH_FIELDS 中的列）
+        
+        Raises:
+            RuntimeError: SQLite未编译FTS5扩展
+        """
+        self._conn = conn
+        self.table = table
+        self.fts_table = f'{table}_fts'
+        
+        conn.execute('CREATE TABLE IF NOT EXISTS search_index_meta (fts_table TEXT PRIMARY KEY, version INTEGER)')
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.fts_table,)
+        ).fetchone()
+        row = conn.execute(
+            'SELECT version FROM search_index_meta WHERE fts_table = ?', (self.fts_table,)
+        ).fetchone()
+        if exists and row and row[0] == TOKENIZER_VERSION:
+            return
+        
+        try:
+            with conn:
+                if exists:
+                    conn.execute(f'DROP TABLE {self.fts_table}')
+                conn.execute(
+                    f'CREATE VIRTUAL TABLE {self.fts_table} USING fts5('
+                    f'{", ".join(SEARCH_FIELDS)}, tokenize = "unicode61")'
+                )
+                conn.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN'
+                    f' DELETE FROM {self.fts_table} WHERE rowid = old.seq; END'
+                )
+                conn.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF seq ON {table} BEGIN'
+                    f' DELETE FROM {self.fts_table} WHERE rowid = old.seq; END'
+                )
+                rows = conn.execute(f'SELECT seq, {", ".join(SEARCH_FIELDS)} FROM {table}')
+                self.index((row[0], dict(zip(SEARCH_FIELDS, row[1:]))) for row in rows)
+                conn.execute(
+                    'INSERT OR REPLACE INTO search_index_meta (fts_table, version) VALUES (?, ?)',
+                    (self.fts_table, TOKENIZER_VERSION)
+                )
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f"SQLite不支持FTS5全文索引: {e}") from e
+    
+    def index(self, entries: Iterable[Tuple[int, Dict]]) -> None:
+        """
+        写入帖子的索引（由调用方控制事务）
+        
+        Args:
+            entries: (序号, 帖子) 列表，序号须是该帖子的新序号
+        """
+        placeholders = ', '.join('?' * (len(SEARCH_FIELDS) + 1))
+        self._conn.executemany(
+            f'INSERT INTO {self.fts_table} (rowid, {", ".join(SEARCH_FIELDS)}) VALUES ({placeholders})',
+            (
+                (seq, *(' '.join(tokenize(post.get(field) or '')) for field in SEARCH_FIELDS))
+                for seq, post in entries
+            )
+        )
+    
+    def search(
+        self,
+        query: str,
+        columns: Iterable[str],
+        limit: int = 20,
+        offset: int = 0,
+        where: str = '',
+        params: Tuple = ()
+    ) -> Tuple[int, List[sqlite3.Row]]:
+        """
+        按相关度查询帖子
+        
+        Args:
+            query: 用户输入的搜索词
+            columns: 返回的帖子表列
+            limit: 每页条目数
+            offset: 跳过的条目数
+            where: 附加的帖子表过滤条件（以 AND 拼接，列名用 p. 前缀）
+            params: 附加条件的参数
+        
+        Returns:
+            (命中总数, 当前页的帖子行，含 seq 和相关度 relevance 列)
+        """
+        match = build_match_query(query)
+        if match is None:
+            return 0, []
+        
+        joined = (
+            f'FROM {self.fts_table} JOIN {self.table} AS p ON p.seq = {self.fts_table}.rowid '
+            f'WHERE {self.fts_table} MATCH ? {"AND " + where if where else ""}'
+        )
+        total = self._conn.execute(f'SELECT COUNT(*) {joined}', (match, *params)).fetchone()[0]
+        if not total or offset >= total:
+            return total, []
+        
+        weights = ', '.join(str(weight) for weight in FIELD_WEIGHTS)
+        rows = self._conn.execute(
+            f'SELECT p.seq, {", ".join(f"p.{column}" for column in columns)}, '
+            f'-bm25({self.fts_table}, {weights}) AS relevance {joined} '
+            f'ORDER BY relevance DESC, p.publish_time DESC LIMIT ? OFFSET ?',
+            (match, *params, limit, offset)
+        ).fetchall()
+        return total, rows
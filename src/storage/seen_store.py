@@ -0,0 +1,115 @@
+"""
+已处理帖子记录（Python端增量爬取）
+使用SQLite记录已处理的帖子URL及发布时间，供爬虫提前停止翻页、跳过详情页
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+import sqlite3
+import time
+from loguru import logger
+
+
+class SeenStore:
+    """基于SQLite的已处理帖子记录"""
+    
+    def __init__(self, db_path: str, max_entries: int = 5000):
+        """
+        初始化记录库
+        
+        Args:
+            db_path: SQLite数据库文件路径
+            max_entries: 最多保留的记录数，超过后删除最早处理的记录
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            ' url TEXT PRIMARY KEY,'
+            ' publish_time REAL,'
+            ' seen_at REAL NOT NULL'
+            ')'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_seen_at ON seen (seen_at)')
+        self._conn.commit()
+    
+    def known(self, urls: Iterable[str]) -> Set[str]:
+        """
+        查询哪些URL已经处理过
+        
+        Args:
+            urls: 待查询的URL
+            
+        Returns:
+            已处理过的URL集合
+        """
+        urls = list(urls)
+        if not urls:
+            return set()
+        
+        placeholders = ','.join('?' * len(urls))
+        rows = self._conn.execute(
+            f'SELECT url FROM seen WHERE url IN ({placeholders})', urls
+        ).fetchall()
+        return {row[0] for row in rows}
+    
+    def high_water_mark(self) -> Optional[datetime]:
+        """
+        获取已处理帖子中最新的发布时间
+        
+        Returns:
+            最新发布时间，没有记录返回None
+        """
+        row = self._conn.execute('SELECT MAX(publish_time) FROM seen').fetchone()
+        if not row or row[0] is None:
+            return None
+        return datetime.fromtimestamp(row[0])
+    
+    def mark(self, posts: Iterable[Dict]) -> None:
+        """
+        将帖子记录为已处理（单个事务）
+        
+        Args:
+            posts: 帖子列表
+        """
+        now = time.time()
+        rows = []
+        for post in posts:
+            pub_time = post.get('publish_time')
+            timestamp = pub_time.timestamp() if isinstance(pub_time, datetime) else None
+            rows.append((post['url'], timestamp, now))
+        if not rows:
+            return
+        
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO seen (url, publish_time, seen_at) VALUES (?, ?, ?)',
+                rows
+            )
+            self._prune()
+        logger.debug(f"记录已处理帖子 {len(rows)} 条")
+    
+    def _prune(self) -> None:
+        """删除超出上限的最早记录"""
+        self._conn.execute(
+            'DELETE FROM seen WHERE url IN ('
+            ' SELECT url FROM seen ORDER BY seen_at DESC LIMIT -1 OFFSET ?'
+            ')',
+            (self.max_entries,)
+        )
+    
+    def reset(self) -> None:
+        """清空所有记录"""
+        with self._conn:
+            self._conn.execute('DELETE FROM seen')
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()
+    
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
\ No newline at end of file
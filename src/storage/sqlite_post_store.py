@@ -0,0 +1,386 @@
+"""
+帖子持久化存储（SQLite）
+按URL批量写入帖子（每次爬取一个事务），WAL模式，按发布时间、质量分数和分类建立索引；
+与内存中的 PostStore 接口一致，可直接用于增量Feed，Feed、统计和全文搜索可直接查询而无需重新爬取
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import sqlite3
+from loguru import logger
+from ..config import settings
+from .post import Post
+from .post_store import post_content_hash, post_timestamp
+from .search_index import SearchIndex
+
+# 帖子字段（BaseCrawler.create_post_dict 的字段 + category / comments / comment_links / quality_score）
+POST_COLUMNS = (
+    'url', 'title', 'author', 'publish_time', 'content', 'source', 'view_count',
+    'reply_count', 'crawl_time', 'category', 'comments', 'comment_links', 'quality_score'
+)
+_TIME_COLUMNS = ('publish_time', 'crawl_time')
+_DEFAULTS = {
+    'title': '', 'author': '', 'content': '', 'source': '', 'category': '', 'comment_links': '',
+    'view_count': 0, 'reply_count': 0, 'comments': 0,
+}
+
+# 单条 IN (...) 查询的参数上限（低于SQLite默认限制）
+_QUERY_CHUNK = 500
+
+
+def sqlite_path(database_url: str) -> str:
+    """
+    从数据库URL中取出SQLite文件路径
+    
+    支持 sqlite:///relative.db、sqlite:////absolute.db、sqlite+aiosqlite:///... 及 sqlite:///:memory:
+    
+    Args:
+        database_url: 数据库URL
+    
+    Returns:
+        SQLite数据库文件路径
+    
+    Raises:
+        ValueError: 不是SQLite数据库URL
+    """
+    parts = urlsplit(database_url)
+    if parts.scheme.split('+')[0] != 'sqlite':
+        raise ValueError(f"帖子存储只支持SQLite数据库: {database_url}")
+    path = parts.path[1:] if parts.path.startswith('/') else parts.path
+    return path or ':memory:'
+
+
+class SQLitePostStore:
+    """基于SQLite的帖子存储"""
+    
+    def __init__(self, db_path: str, max_entries: Optional[int] = None):
+        """
+        初始化存储
+        
+        Args:
+            db_path: SQLite数据库文件路径
+            max_entries: 最多保留的帖子数，超过后删除序号最小的帖子（None表示不限制）
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        
+        if db_path != ':memory:':
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS posts ('
+            ' url TEXT PRIMARY KEY,'
+            ' seq INTEGER NOT NULL UNIQUE,'
+            ' content_hash TEXT NOT NULL,'
+            ' title TEXT NOT NULL,'
+            ' author TEXT,'
+            ' publish_time REAL,'
+            ' content TEXT,'
+            ' source TEXT,'
+            ' view_count INTEGER,'
+            ' reply_count INTEGER,'
+            ' crawl_time REAL,'
+            ' category TEXT,'
+            ' comments INTEGER,'
+            ' comment_links TEXT,'
+            ' quality_score REAL'
+            ')'
+        )
+        # 旧版本创建的表没有 comment_links 列
+        if 'comment_links' not in {row[1] for row in self._conn.execute('PRAGMA table_info(posts)')}:
+            self._conn.execute('ALTER TABLE posts ADD COLUMN comment_links TEXT')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_publish_time ON posts (publish_time)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_quality_score ON posts (quality_score)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_category ON posts (category)')
+        # 序号单独保存，删除帖子后也不会回退，保证客户端游标始终有效
+        self._conn.execute('CREATE TABLE IF NOT EXISTS post_meta (key TEXT PRIMARY KEY, value INTEGER)')
+        self._conn.commit()
+        self.search_index = SearchIndex(self._conn, 'posts')
+        
+        row = self._conn.execute("SELECT value FROM post_meta WHERE key = 'latest_seq'").fetchone()
+        self.latest_seq = row[0] if row else 0
+    
+    @classmethod
+    def from_settings(cls) -> 'SQLitePostStore':
+        """按 DATABASE_URL / POST_STORE_MAX_ENTRIES 创建存储"""
+        return cls(
+            sqlite_path(settings.DATABASE_URL),
+            max_entries=settings.POST_STORE_MAX_ENTRIES or None
+        )
+    
+    def upsert(self, posts: Iterable[Dict]) -> int:
+        """
+        按URL批量写入帖子（单个事务）：新帖子或内容变化的帖子分配新序号，
+        其他帖子只更新浏览数、回复数、评论数和质量分数
+        
+        Args:
+            posts: 帖子列表
+        
+        Returns:
+            新增或内容变化的帖子数
+        """
+        posts = {post['url']: post for post in posts}
+        if not posts:
+            return 0
+        
+        known = self._content_hashes(list(posts))
+        changed_rows = []
+        changed_posts = []
+        unchanged_rows = []
+        seq = self.latest_seq
+        for url, post in posts.items():
+            content_hash = post_content_hash(post)
+            if known.get(url) == content_hash:
+                unchanged_rows.append((
+                    post.get('view_count', 0), post.get('reply_count', 0),
+                    post.get('comments', 0), post.get('quality_score'), url
+                ))
+                continue
+            seq += 1
+            changed_rows.append((seq, content_hash) + self._to_row(post))
+            changed_posts.append((seq, post))
+        
+        columns = ', '.join(POST_COLUMNS)
+        updates = ', '.join(f'{column} = excluded.{column}' for column in POST_COLUMNS[1:])
+        placeholders = ', '.join('?' * (len(POST_COLUMNS) + 2))
+        with self._conn:
+            self._conn.executemany(
+                f'INSERT INTO posts (seq, content_hash, {columns}) VALUES ({placeholders}) '
+                f'ON CONFLICT(url) DO UPDATE SET seq = excluded.seq, '
+                f'content_hash = excluded.content_hash, {updates}',
+                changed_rows
+            )
+            # 序号变化时触发器已删除旧的索引行，这里写入新内容的索引
+            self.search_index.index(changed_posts)
+            self._conn.executemany(
+                'UPDATE posts SET view_count = ?, reply_count = ?, comments = ?, quality_score = ? '
+                'WHERE url = ?',
+                unchanged_rows
+            )
+            if seq != self.latest_seq:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO post_meta (key, value) VALUES ('latest_seq', ?)", (seq,)
+                )
+            self._prune()
+        self.latest_seq = seq
+        logger.debug(f"写入帖子 {len(posts)} 条，其中新增或更新 {len(changed_rows)} 条")
+        return len(changed_rows)
+    
+    def _content_hashes(self, urls: List[str]) -> Dict[str, str]:
+        """查询已保存帖子的内容哈希"""
+        hashes = {}
+        for i in range(0, len(urls), _QUERY_CHUNK):
+            chunk = urls[i:i + _QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            for row in self._conn.execute(
+                f'SELECT url, content_hash FROM posts WHERE url IN ({placeholders})', chunk
+            ):
+                hashes[row[0]] = row[1]
+        return hashes
+    
+    @staticmethod
+    def _to_row(post: Dict) -> Tuple:
+        """帖子字典 -> 数据库行"""
+        row = []
+        for column in POST_COLUMNS:
+            value = post.get(column, _DEFAULTS.get(column))
+            if column in _TIME_COLUMNS:
+                value = post_timestamp(post) if column == 'publish_time' else (
+                    value.timestamp() if isinstance(value, datetime) else None
+                )
+            row.append(value)
+        return tuple(row)
+    
+    @staticmethod
+    def _to_post(row: sqlite3.Row) -> Post:
+        """数据库行 -> 帖子记录"""
+        fields = {column: row[column] for column in POST_COLUMNS}
+        for column in _TIME_COLUMNS:
+            if fields[column] is not None:
+                fields[column] = datetime.fromtimestamp(fields[column])
+        return Post(fields)
+    
+    def _select(self, where: str, params: Tuple, order: str, limit: Optional[int]) -> List[Tuple[int, Dict]]:
+        """按条件查询 (序号, 帖子) 列表"""
+        sql = f'SELECT seq, {", ".join(POST_COLUMNS)} FROM posts {where} ORDER BY {order}'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params += (limit,)
+        return [(row['seq'], self._to_post(row)) for row in self._conn.execute(sql, params)]
+    
+    def since_seq(self, seq: int, limit: Optional[int] = None) -> List[Tuple[int, Dict]]:
+        """
+        查询序号大于 seq 的帖子（按序号升序）
+        
+        Args:
+            seq: 游标序号
+            limit: 最多返回的条目数
+        
+        Returns:
+            (序号, 帖子) 列表
+        """
+        return self._select('WHERE seq > ?', (seq,), 'seq', limit)
+    
+    def since_time(
+        self,
+        after: datetime,
+        limit: Optional[int] = None,
+        after_seq: Optional[int] = None
+    ) -> List[Tuple[int, Dict]]:
+        """
+        查询 (发布时间, 序号) 大于 (after, after_seq) 的帖子（按发布时间、序号升序）
+        
+        Args:
+            after: 游标时间
+            limit: 最多返回的条目数
+            after_seq: 游标序号（发布时间等于 after 的帖子只返回序号更大的；None表示全部跳过）
+        
+        Returns:
+            (序号, 帖子) 列表
+        """
+        timestamp = after.timestamp()
+        if after_seq is None:
+            return self._select('WHERE publish_time > ?', (timestamp,), 'publish_time, seq', limit)
+        return self._select(
+            'WHERE publish_time > ? OR (publish_time = ? AND seq > ?)',
+            (timestamp, timestamp, after_seq), 'publish_time, seq', limit
+        )
+    
+    def latest(self, limit: int) -> List[Tuple[int, Dict]]:
+        """
+        获取最近入库的帖子（按序号升序）
+        
+        Args:
+            limit: 最多返回的条目数
+        
+        Returns:
+            (序号, 帖子) 列表
+        """
+        entries = self._select('', (), 'seq DESC', limit)
+        entries.reverse()
+        return entries
+    
+    def top(
+        self,
+        limit: int = 50,
+        category: Optional[str] = None,
+        since: Optional[datetime] = None,
+        min_score: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        按质量分数降序查询帖子
+        
+        Args:
+            limit: 最多返回的条目数
+            category: 只返回该分类的帖子（可选）
+            since: 只返回该时间之后发布的帖子（可选）
+            min_score: 最低质量分数（可选）
+        
+        Returns:
+            帖子列表
+        """
+        conditions = []
+        params = ()
+        if category is not None:
+            conditions.append('category = ?')
+            params += (category,)
+        if since is not None:
+            conditions.append('publish_time > ?')
+            params += (since.timestamp(),)
+        if min_score is not None:
+            conditions.append('quality_score >= ?')
+            params += (min_score,)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        return [post for _, post in self._select(where, params, 'quality_score DESC, publish_time DESC', limit)]
+    
+    def search(
+        self,
+        query: str,
+        page: int = 1,
+        page_size: int = 20,
+        category: Optional[str] = None
+    ) -> Dict:
+        """
+        全文搜索标题、内容和评论区链接，按相关度排序并分页
+        
+        Args:
+            query: 搜索词（空格分隔的多个词须同时命中）
+            page: 页码（从1开始）
+            page_size: 每页条目数
+            category: 只搜索该分类的帖子（可选）
+            
+        Returns:
+            {'query': 搜索词, 'total': 命中总数, 'page': 页码, 'page_size': 每页条目数,
+             'page_count': 总页数, 'items': 帖子列表（含相关度 relevance）}
+        """
+        page = max(page, 1)
+        where, params = ('p.category = ?', (category,)) if category is not None else ('', ())
+        total, rows = self.search_index.search(
+            query, POST_COLUMNS, limit=page_size, offset=(page - 1) * page_size,
+            where=where, params=params
+        )
+        items = []
+        for row in rows:
+            post = self._to_post(row)
+            post['relevance'] = row['relevance']
+            items.append(post)
+        return {
+            'query': query,
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'page_count': (total + page_size - 1) // page_size,
+            'items': items,
+        }
+    
+    def stats(self) -> Dict:
+        """
+        统计帖子数量和质量分数
+        
+        Returns:
+            {'total': 总数, 'avg_score': 平均分, 'latest_publish_time': 最新发布时间,
+             'categories': {分类: {'count': 数量, 'avg_score': 平均分}}}
+        """
+        row = self._conn.execute(
+            'SELECT COUNT(*), AVG(quality_score), MAX(publish_time) FROM posts'
+        ).fetchone()
+        categories = {
+            category: {'count': count, 'avg_score': avg_score}
+            for category, count, avg_score in self._conn.execute(
+                'SELECT category, COUNT(*), AVG(quality_score) FROM posts '
+                'GROUP BY category ORDER BY COUNT(*) DESC'
+            )
+        }
+        return {
+            'total': row[0],
+            'avg_score': row[1],
+            'latest_publish_time': datetime.fromtimestamp(row[2]) if row[2] is not None else None,
+            'categories': categories,
+        }
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """按URL获取帖子"""
+        entries = self._select('WHERE url = ?', (url,), 'seq', 1)
+        return entries[0][1] if entries else None
+    
+    def _prune(self) -> None:
+        """删除超出上限的最早帖子"""
+        if self.max_entries is None:
+            return
+        self._conn.execute(
+            'DELETE FROM posts WHERE seq IN ('
+            ' SELECT seq FROM posts ORDER BY seq DESC LIMIT -1 OFFSET ?'
+            ')',
+            (self.max_entries,)
+        )
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()
+    
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM posts').fetchone()[0]
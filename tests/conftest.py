@@ -0,0 +1,34 @@
+"""
+测试共用的夹具
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+BASE_TIME = datetime(2026, 1, 1, 10, 0)
+
+
+@pytest.fixture
+def make_post():
+    """
+    帖子字典工厂: make_post(i, title, **fields)
+    
+    字段顺序与 Post 相同。URL 和默认标题由序号生成，发布时间从 BASE_TIME 起按序号递增一分钟，
+    未指定内容时与标题相同；其他字段按 fields 覆盖或补充。
+    """
+    def factory(i=0, title=None, **fields):
+        title = f'线报{i}' if title is None else title
+        post = {
+            'title': title,
+            'url': f'https://new.ixbk.net/{i}.html',
+            'author': '线报员',
+            'publish_time': BASE_TIME + timedelta(minutes=i),
+            'content': title,
+            'source': 'ixbk',
+            'category': '京东',
+            'comments': 0,
+            'quality_score': 70,
+        }
+        post.update(fields)
+        return post
+    return factory
@@ -0,0 +1,220 @@
+"""
+爬虫测试：通过 httpx.MockTransport 模拟线报酷站点
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.crawlers import IxbkCrawler
+from src.crawlers.registry import MultiSourceCrawler
+
+BASE_URL = 'https://new.ixbk.net/'
+
+
+def list_html(start, count, time_str='10:00', comments=0, next_page=None):
+    """生成列表页：帖子 start..start+count-1（time_str、comments 可为每篇的取值列表），可带“下一页”链接"""
+    if isinstance(time_str, str):
+        time_str = [time_str] * count
+    if isinstance(comments, int):
+        comments = [comments] * count
+    items = ''.join(
+        f'<li class="article-list"><a href="/{i}.html" title="京东 话费充值 满减 {i}" data-catename="京东" '
+        f'data-content="简介{i}" data-louzhu="u{i}">t</a><time class="badge">{t}</time>'
+        f'<span class="badge com">{n}</span></li>'
+        for i, t, n in zip(range(start, start + count), time_str, comments)
+    )
+    pagination = f'<div class="pagination"><a href="/page/{next_page}">下一页</a></div>' if next_page else ''
+    return f'<html><body><ul class="new-post">{items}</ul>{pagination}</body></html>'
+
+
+def detail_html(url):
+    return f'<div class="article-content"><p>详情 {url}</p></div>'
+
+
+class MockIxbkCrawler(IxbkCrawler):
+    """请求由 handler 响应的线报酷爬虫，记录创建过的HTTP客户端"""
+    
+    def __init__(self, handler, **kwargs):
+        super().__init__(**kwargs)
+        self.transport = httpx.MockTransport(handler)
+        self.clients = []
+    
+    def _build_client(self, http2=False):
+        client = httpx.AsyncClient(transport=self.transport, headers=self.headers)
+        self.clients.append(client)
+        return client
+
+
+def site(pages, details=None):
+    """
+    模拟站点的请求处理函数
+    
+    Args:
+        pages: 列表页路径（'/'、'/page/2'）-> HTML
+        details: 详情页处理协程（参数为URL），默认立即返回详情页
+    """
+    requested = []
+    
+    async def handler(request):
+        url = str(request.url)
+        requested.append(url)
+        path = request.url.path
+        if path in pages:
+            return httpx.Response(200, text=pages[path])
+        if details is not None:
+            return await details(url)
+        return httpx.Response(200, text=detail_html(url))
+    
+    handler.requested = requested
+    return handler
+
+
+@pytest.fixture(autouse=True)
+def crawler_settings(monkeypatch):
+    monkeypatch.setattr(settings, 'RATE_LIMIT_PER_HOST', 1000.0)
+    monkeypatch.setattr(settings, 'RATE_LIMIT_BURST', 1000)
+    monkeypatch.setattr(settings, 'PARSE_EXECUTOR', 'none')
+    monkeypatch.setattr(settings, 'HTTP_CACHE_ENABLED', False)
+    monkeypatch.setattr(settings, 'DETAIL_CACHE_ENABLED', False)
+    monkeypatch.setattr(settings, 'INCREMENTAL_CRAWL', False)
+
+
+def crawl(crawler):
+    async def run():
+        async with crawler:
+            return await crawler.crawl()
+    return asyncio.run(run())
+
+
+def test_open_crawler_reuses_one_client_and_closes_it():
+    handler = site({'/': list_html(0, 5)})
+    crawler = MockIxbkCrawler(handler, max_pages=1)
+    
+    posts = crawl(crawler)
+    
+    assert len(posts) == 5
+    assert len(handler.requested) == 6
+    assert posts[0]['content'] == f'详情 {BASE_URL}0.html'
+    # 列表页和全部详情页共用同一个连接池，关闭后释放
+    assert len(crawler.clients) == 1
+    assert crawler.clients[0].is_closed
+    assert crawler._client is None
+
+
+def test_fetch_without_open_uses_temporary_clients():
+    crawler = MockIxbkCrawler(site({'/': list_html(0, 1)}))
+    
+    async def fetch_twice():
+        return [await crawler.fetch_page(BASE_URL) for _ in range(2)]
+    
+    pages = asyncio.run(fetch_twice())
+    
+    assert all('new-post' in page for page in pages)
+    assert len(crawler.clients) == 2
+    assert all(client.is_closed for client in crawler.clients)
+
+
+def test_detail_requests_are_bounded_by_semaphore():
+    in_flight = 0
+    peak = 0
+    
+    async def details(url):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, text=detail_html(url))
+    
+    crawler = MockIxbkCrawler(site({'/': list_html(0, 10)}, details), max_pages=1, detail_concurrency=3)
+    
+    posts = crawl(crawler)
+    
+    assert len(posts) == 10
+    assert peak == 3
+    assert all(post['content'].startswith('详情') for post in posts)
+
+
+def test_details_past_deadline_fall_back_to_list_content():
+    slow = {f'{BASE_URL}1.html', f'{BASE_URL}3.html'}
+    
+    async def details(url):
+        if url in slow:
+            await asyncio.sleep(10)
+        return httpx.Response(200, text=detail_html(url))
+    
+    crawler = MockIxbkCrawler(site({'/': list_html(0, 5)}, details), max_pages=1, crawl_deadline=0.2)
+    
+    posts = crawl(crawler)
+    
+    # 超时的帖子保留列表页简介，其余帖子使用详情页内容，产出顺序不变
+    assert [post['url'] for post in posts] == [f'{BASE_URL}{i}.html' for i in range(5)]
+    assert [post['content'] for post in posts] == [
+        f'详情 {BASE_URL}0.html', '简介1', f'详情 {BASE_URL}2.html', '简介3', f'详情 {BASE_URL}4.html'
+    ]
+
+
+def test_detail_cache_hit_and_invalidation_on_comment_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'DETAIL_CACHE_ENABLED', True)
+    monkeypatch.setattr(settings, 'DETAIL_CACHE_FILE', str(tmp_path / 'detail_cache.json'))
+    
+    def detail_urls(handler):
+        return [url for url in handler.requested if url.endswith('.html')]
+    
+    first = site({'/': list_html(0, 3, comments=2)})
+    posts = crawl(MockIxbkCrawler(first, max_pages=1))
+    assert len(detail_urls(first)) == 3
+    
+    # 下次运行（缓存已写入磁盘）评论数不变：不再请求详情页，内容来自缓存
+    second = site({'/': list_html(0, 3, comments=2)})
+    cached_posts = crawl(MockIxbkCrawler(second, max_pages=1))
+    assert detail_urls(second) == []
+    assert [post['content'] for post in cached_posts] == [post['content'] for post in posts]
+    
+    # 评论数变化的帖子重新抓取详情页
+    third = site({'/': list_html(0, 3, comments=[2, 2, 5])})
+    crawl(MockIxbkCrawler(third, max_pages=1))
+    assert detail_urls(third) == [f'{BASE_URL}2.html']
+
+
+def test_slow_source_times_out_without_blocking_others():
+    async def hang(url):
+        await asyncio.sleep(30)
+        return httpx.Response(200, text=detail_html(url))
+    
+    # 慢数据源第一页正常，第二页一直不返回
+    slow_site = site({'/': list_html(100, 2, next_page=2)}, hang)
+    slow = MockIxbkCrawler(slow_site, fetch_detail=False, max_pages=5)
+    fast = MockIxbkCrawler(site({'/': list_html(0, 3)}), max_pages=1)
+    crawler = MultiSourceCrawler({'slow': slow, 'fast': fast}, timeouts={'slow': 0.3, 'fast': 5})
+    
+    start = time.monotonic()
+    posts = crawl(crawler)
+    elapsed = time.monotonic() - start
+    
+    urls = {post['url'] for post in posts}
+    assert {f'{BASE_URL}{i}.html' for i in range(3)} <= urls
+    # 超时前已产出的帖子保留
+    assert {f'{BASE_URL}100.html', f'{BASE_URL}101.html'} <= urls
+    assert len(posts) == 5
+    assert elapsed < 5
+    assert slow_site.requested[-1] == f'{BASE_URL}page/2'
+
+
+def test_pagination_stops_at_max_post_age(monkeypatch):
+    monkeypatch.setattr(settings, 'MAX_POST_AGE_DAYS', 7)
+    # 第二页后半部分早于7天，不再请求第三页
+    handler = site({
+        '/': list_html(0, 3, next_page=2),
+        '/page/2': list_html(10, 4, time_str=['10:00', '09:00', '2020-01-01', '2020-01-01'], next_page=3),
+        '/page/3': list_html(20, 3),
+    })
+    crawler = MockIxbkCrawler(handler, fetch_detail=False, max_pages=10)
+    
+    posts = crawl(crawler)
+    
+    assert [post['url'].rsplit('/', 1)[-1] for post in posts] == ['0.html', '1.html', '2.html', '10.html', '11.html']
+    assert handler.requested == [BASE_URL, f'{BASE_URL}page/2']
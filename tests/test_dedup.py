@@ -0,0 +1,96 @@
+"""
+近似重复过滤器测试
+"""
+from datetime import datetime, timedelta
+
+from src.filters import NearDuplicateFilter, QualityFilter
+from src.filters.score_cache import ScoreCache
+
+
+def test_window_expires_entries_across_batches(make_post):
+    dedup = NearDuplicateFilter(window_hours=1)
+    base = datetime(2026, 1, 1, 10, 0)
+    # 分数高的帖子更新：按分数入索引时较旧的帖子排在后面
+    dedup.dedupe([
+        make_post(title='京东PLUS会员年卡限时五折抢购', url='u/new', publish_time=base + timedelta(minutes=50), quality_score=90),
+        make_post(title='招商银行信用卡刷卡满减活动', url='u/old', publish_time=base, quality_score=50),
+    ])
+    assert len(dedup) == 2
+    
+    dedup.dedupe([make_post(title='美团外卖天天神券领取入口', url='u/later', publish_time=base + timedelta(minutes=90), quality_score=70)])
+    
+    # 10:00 的帖子已在 10:30 之前，必须被淘汰；10:50 的仍在窗口内
+    urls = {entry[1] for entry in dedup._entries.values()}
+    assert urls == {'u/new', 'u/later'}
+
+
+def test_replaced_entries_do_not_grow_time_index(make_post):
+    dedup = NearDuplicateFilter(window_hours=72)
+    base = datetime(2026, 1, 1)
+    for _ in range(500):
+        dedup.dedupe([make_post(title='话费充值满100减5元', url='u/same', publish_time=base, quality_score=80)])
+    
+    assert len(dedup) == 1
+    assert len(dedup._by_time) <= 2 * len(dedup) + 64
+
+
+def test_duplicate_keeps_higher_score_and_uses_existing_score(make_post):
+    calls = []
+    dedup = NearDuplicateFilter(score_func=lambda post: calls.append(post) or 0)
+    base = datetime(2026, 1, 1)
+    kept = dedup.dedupe([
+        make_post(title='京东PLUS会员年卡限时五折抢购', url='u/a', publish_time=base, quality_score=60),
+        make_post(title='京东PLUS会员年卡限时五折抢购！', url='u/b', publish_time=base, quality_score=80),
+    ])
+    
+    assert [post['url'] for post in kept] == ['u/b']
+    assert calls == []
+
+
+def test_dedup_scores_are_reused_by_quality_filter():
+    quality_filter = QualityFilter(threshold=0, score_cache=ScoreCache(max_entries=100))
+    dedup = NearDuplicateFilter(score_func=quality_filter.calculate_score)
+    base = datetime(2026, 1, 1)
+    posts = [
+        {'title': title, 'url': f'u/{i}', 'content': title, 'category': '京东', 'publish_time': base}
+        for i, title in enumerate(['京东PLUS会员年卡限时五折', '话费充值满100减5元', '美团外卖天天神券'])
+    ]
+    
+    quality_filter.filter_posts(dedup.dedupe(posts))
+    
+    assert quality_filter.score_cache.misses == len(posts)
+    assert quality_filter.score_cache.hits == len(posts)
+
+
+def test_index_persists_across_runs(tmp_path, make_post):
+    state_file = str(tmp_path / 'dedup.json')
+    base = datetime(2026, 1, 1, 10, 0)
+    first = NearDuplicateFilter(window_hours=72, state_file=state_file)
+    first.dedupe([make_post(title='京东PLUS会员年卡限时五折抢购', url='u/a', publish_time=base, quality_score=80)])
+    first.save()
+    
+    # 下次运行（新进程）仍能识别窗口内的重复
+    second = NearDuplicateFilter(window_hours=72, state_file=state_file)
+    kept = second.dedupe([
+        make_post(title='京东PLUS会员年卡限时五折抢购！', url='u/b', publish_time=base + timedelta(hours=30), quality_score=60),
+        make_post(title='美团外卖天天神券领取入口', url='u/c', publish_time=base + timedelta(hours=30), quality_score=60),
+    ])
+    assert [post['url'] for post in kept] == ['u/c']
+    second.save()
+    
+    # 超出窗口的条目在加载时淘汰
+    third = NearDuplicateFilter(window_hours=72, state_file=state_file)
+    kept = third.dedupe([
+        make_post(title='京东PLUS会员年卡限时五折抢购', url='u/d', publish_time=base + timedelta(hours=100), quality_score=60),
+    ])
+    assert [post['url'] for post in kept] == ['u/d']
+    assert {entry[1] for entry in third._entries.values()} == {'u/c', 'u/d'}
+
+
+def test_corrupt_state_file_is_ignored(tmp_path):
+    state_file = tmp_path / 'dedup.json'
+    state_file.write_text('[[1, "u/a"', encoding='utf-8')
+    
+    dedup = NearDuplicateFilter(state_file=str(state_file))
+    
+    assert len(dedup) == 0
@@ -0,0 +1,154 @@
+"""
+Feed输出测试（多格式渲染、片段缓存、静态文件发布、分页JSON）
+"""
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from src.rss import generator as generator_module
+from src.rss.fragment_cache import FragmentCache
+from src.rss.generator import RSSGenerator, RSSManager
+from src.rss.static_output import StaticPublisher
+
+
+def make_generator(fragment_cache=None, **publisher_options):
+    return RSSGenerator(
+        fragment_cache=fragment_cache or FragmentCache(max_entries=100),
+        publisher=StaticPublisher(**publisher_options)
+    )
+
+
+def test_failing_format_does_not_stop_other_formats(tmp_path, monkeypatch, make_post):
+    def broken(generator, posts, output_file):
+        raise RuntimeError('渲染失败')
+    
+    monkeypatch.setitem(generator_module.FEED_FORMATS, 'broken', broken)
+    saved = []
+    rss_generator = make_generator()
+    monkeypatch.setattr(rss_generator, 'save_cache', lambda: saved.append(True))
+    manager = RSSManager(crawler=object(), quality_filter=object(), rss_generator=rss_generator)
+    posts = [make_post(i) for i in range(3)]
+    outputs = {
+        'rss': str(tmp_path / 'feed.xml'),
+        'broken': None,
+        'json': str(tmp_path / 'feed.json'),
+    }
+    
+    with pytest.raises(RuntimeError, match='渲染失败'):
+        asyncio.run(manager.render_feeds(posts, outputs))
+    
+    # 其他格式照常写出，片段缓存照常保存
+    assert (tmp_path / 'feed.xml').read_text(encoding='utf-8').count('<item>') == 3
+    assert len(json.loads((tmp_path / 'feed.json').read_text(encoding='utf-8'))['items']) == 3
+    assert saved == [True]
+
+
+def test_cached_fragment_is_rerendered_when_a_fragment_field_changes(make_post):
+    rss_generator = make_generator()
+    cache = rss_generator.fragment_cache
+    posts = [make_post(i, content=f'内容{i}') for i in range(3)]
+    
+    def render_items():
+        return json.loads(rss_generator.generate_json(posts))['items']
+    
+    first = render_items()
+    assert (cache.hits, cache.misses) == (0, 3)
+    
+    # 不影响渲染结果的字段变化时仍命中缓存
+    posts[0]['comments'] = 99
+    assert render_items() == first
+    assert (cache.hits, cache.misses) == (3, 3)
+    
+    posts[1]['content'] = '内容已更新'
+    posts[2]['quality_score'] = 95
+    items = render_items()
+    
+    assert (cache.hits, cache.misses) == (4, 5)
+    assert [item['content'] for item in items] == ['内容0', '内容已更新', '内容2']
+    assert items[2]['quality_score'] == 95
+    
+    # RSS条目不包含质量分数，分数变化不重新渲染；内容变化时重新渲染
+    rss_generator.generate_rss(posts)
+    misses = cache.misses
+    posts[2]['quality_score'] = 60
+    rss_generator.generate_rss(posts)
+    assert cache.misses == misses
+    posts[0]['title'] = '新标题'
+    assert '新标题' in rss_generator.generate_rss(posts)
+    assert cache.misses == misses + 1
+
+
+def feed_json(updated, items):
+    return json.dumps({'title': '线报', 'updated': updated, 'items': items}, ensure_ascii=False).encode('utf-8')
+
+
+def test_publish_skips_timestamp_only_changes_and_updates_manifest(tmp_path):
+    publisher = StaticPublisher(gzip_enabled=True)
+    path = tmp_path / 'feed.json'
+    
+    assert publisher.publish(path, feed_json('2026-01-01T10:00:00+08:00', ['a']))
+    manifest = json.loads((tmp_path / 'manifest.json').read_text(encoding='utf-8'))
+    entry = manifest['feed.json']
+    assert entry['size'] == path.stat().st_size
+    assert entry['content_type'] == 'application/json; charset=utf-8'
+    assert entry['gzip_size'] == (tmp_path / 'feed.json.gz').stat().st_size
+    
+    # 只有生成时间变化：不重写文件
+    assert not publisher.publish(path, feed_json('2026-01-01T11:00:00+08:00', ['a']))
+    assert json.loads(path.read_bytes())['updated'] == '2026-01-01T10:00:00+08:00'
+    
+    # 内容变化：重写文件并更新清单
+    data = feed_json('2026-01-01T12:00:00+08:00', ['a', 'b'])
+    assert publisher.publish(path, data)
+    assert path.read_bytes() == data
+    new_entry = json.loads((tmp_path / 'manifest.json').read_text(encoding='utf-8'))['feed.json']
+    assert new_entry['etag'] != entry['etag']
+    assert new_entry['size'] == len(data)
+    
+    # 压缩文件被删除后即使内容未变化也重新生成
+    (tmp_path / 'feed.json.gz').unlink()
+    assert publisher.publish(path, data)
+    assert (tmp_path / 'feed.json.gz').exists()
+
+
+def test_gzip_output_is_deterministic(tmp_path):
+    publisher = StaticPublisher(gzip_enabled=True, manifest_name='')
+    data = feed_json('2026-01-01T10:00:00+08:00', ['京东'] * 100)
+    
+    publisher.publish(tmp_path / 'a.json', data)
+    publisher.publish(tmp_path / 'b.json', data)
+    
+    gz = (tmp_path / 'a.json.gz').read_bytes()
+    # 不记录文件名和修改时间，相同内容的压缩结果相同
+    assert gz == (tmp_path / 'b.json.gz').read_bytes()
+    assert gz[4:8] == bytes(4)
+    assert gzip.decompress(gz) == data
+    assert not (tmp_path / 'manifest.json').exists()
+
+
+def test_json_pages_remove_shards_left_from_a_larger_run(tmp_path, make_post):
+    rss_generator = make_generator()
+    posts = [make_post(i) for i in range(10)]
+    
+    rss_generator.generate_json_pages(posts, str(tmp_path), page_size=3)
+    assert sorted(path.name for path in tmp_path.glob('feed-*.json')) == [
+        'feed-1.json', 'feed-2.json', 'feed-3.json', 'feed-4.json', 'feed-index.json'
+    ]
+    
+    # 不是分页文件的同前缀文件不删除
+    (tmp_path / 'feed-archive.json').write_text('{}', encoding='utf-8')
+    
+    index = json.loads(rss_generator.generate_json_pages(posts[:4], str(tmp_path), page_size=3))
+    
+    assert index['page_count'] == 2
+    assert sorted(path.name for path in tmp_path.glob('feed-*')) == [
+        'feed-1.json', 'feed-1.json.gz', 'feed-2.json', 'feed-2.json.gz',
+        'feed-archive.json', 'feed-index.json', 'feed-index.json.gz'
+    ]
+    manifest = json.loads((tmp_path / 'manifest.json').read_text(encoding='utf-8'))
+    assert sorted(manifest) == ['feed-1.json', 'feed-2.json', 'feed-index.json']
+    last_page = json.loads((tmp_path / 'feed-2.json').read_text(encoding='utf-8'))
+    assert last_page['next'] is None
+    assert [item['url'] for item in last_page['items']] == [posts[3]['url']]
@@ -0,0 +1,164 @@
+"""
+HTTP条件请求缓存与请求重试测试
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.crawlers import base as base_module
+from src.crawlers.base import BaseCrawler
+from src.crawlers.http_cache import HTTPCache
+from src.crawlers.registry import MultiSourceCrawler
+
+URL = 'https://example.com/page.html'
+
+
+class StubRateLimiter:
+    def __init__(self):
+        self.records = []
+    
+    async def acquire(self, host):
+        pass
+    
+    def record(self, host, status_code, retry_after=0.0):
+        self.records.append((status_code, retry_after))
+
+
+class MockCrawler(BaseCrawler):
+    """通过 httpx.MockTransport 响应请求的爬虫"""
+    
+    def __init__(self, handler):
+        super().__init__()
+        self.source_name = 'mock'
+        self.rate_limiter = StubRateLimiter()
+        self.transport = httpx.MockTransport(handler)
+    
+    def _build_client(self, http2=False):
+        return httpx.AsyncClient(transport=self.transport, headers=self.headers)
+    
+    async def crawl_iter(self):
+        yield {'url': URL}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'HTTP_CACHE_ENABLED', True)
+    monkeypatch.setattr(settings, 'HTTP_CACHE_DIR', str(tmp_path / 'http'))
+    monkeypatch.setattr(HTTPCache, '_shared', {})
+    return tmp_path / 'http'
+
+
+def fetch(crawler, url=URL):
+    async def run():
+        async with crawler:
+            return await crawler.fetch_page(url)
+    return asyncio.run(run())
+
+
+def test_crawlers_share_one_cache_index(cache_dir):
+    a = MockCrawler(lambda request: httpx.Response(200, text=f'A {request.url}', headers={'ETag': '"a"'}))
+    b = MockCrawler(lambda request: httpx.Response(200, text=f'B {request.url}', headers={'ETag': '"b"'}))
+    
+    assert a.http_cache is b.http_cache
+    fetch(a, 'https://a.example.com/1.html')
+    fetch(b, 'https://b.example.com/1.html')
+    
+    # 两个爬虫各自关闭后，索引包含双方的条目，内容文件都存在
+    entries = dict(json.loads((cache_dir / HTTPCache.INDEX_FILE).read_text(encoding='utf-8')))
+    assert set(entries) == {'https://a.example.com/1.html', 'https://b.example.com/1.html'}
+    assert all((cache_dir / entry['file']).exists() for entry in entries.values())
+    assert HTTPCache(str(cache_dir)).get('https://a.example.com/1.html') == 'A https://a.example.com/1.html'
+
+
+def test_aggregator_has_no_cache_or_rate_limiter(cache_dir):
+    aggregator = MultiSourceCrawler([MockCrawler(lambda request: httpx.Response(200))])
+    
+    assert aggregator.http_cache is None
+    assert aggregator.rate_limiter is None
+
+
+def test_not_modified_is_served_from_cache(cache_dir):
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text='正文', headers={'ETag': '"v1"'})
+    
+    crawler = MockCrawler(handler)
+    
+    assert fetch(crawler) == '正文'
+    assert fetch(crawler) == '正文'
+    assert [request.headers.get('If-None-Match') for request in requests] == [None, '"v1"']
+
+
+def test_not_modified_with_missing_body_retries_unconditionally(cache_dir):
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        if request.headers.get('If-None-Match'):
+            return httpx.Response(304)
+        return httpx.Response(200, text=f'正文{len(requests)}', headers={'ETag': '"v1"'})
+    
+    crawler = MockCrawler(handler)
+    assert fetch(crawler) == '正文1'
+    for path in cache_dir.iterdir():
+        if path.name != HTTPCache.INDEX_FILE:
+            path.unlink()
+    
+    assert fetch(crawler) == '正文3'
+    assert [request.headers.get('If-None-Match') for request in requests] == [None, '"v1"', None]
+    # 重新请求的内容已写回缓存
+    assert crawler.http_cache.get(URL) == '正文3'
+
+
+def test_throttled_requests_honour_retry_after_and_backoff(monkeypatch):
+    monkeypatch.setattr(settings, 'HTTP_CACHE_ENABLED', False)
+    monkeypatch.setattr(settings, 'MAX_RETRIES', 3)
+    monkeypatch.setattr(settings, 'RETRY_BACKOFF_BASE', 1.0)
+    monkeypatch.setattr(settings, 'RETRY_BACKOFF_MAX', 30.0)
+    delays = []
+    ceilings = []
+    
+    async def fake_sleep(delay):
+        delays.append(delay)
+    
+    def fake_uniform(low, high):
+        ceilings.append(high)
+        return high / 2
+    
+    monkeypatch.setattr(base_module.asyncio, 'sleep', fake_sleep)
+    monkeypatch.setattr(base_module.random, 'uniform', fake_uniform)
+    responses = iter([
+        httpx.Response(429, headers={'Retry-After': '5'}),
+        httpx.Response(503),
+        httpx.Response(503, headers={'Retry-After': '120'}),
+        httpx.Response(200, text='ok'),
+    ])
+    crawler = MockCrawler(lambda request: next(responses))
+    
+    assert fetch(crawler) == 'ok'
+    # Retry-After 大于退避时间时以其为准，且不超过 RETRY_BACKOFF_MAX
+    assert ceilings == [1.0, 2.0, 4.0]
+    assert delays == [5.0, 1.0, 30.0]
+    assert crawler.rate_limiter.records == [(429, 5.0), (503, 0.0), (503, 30.0), (200, 0.0)]
+
+
+def test_retries_are_exhausted(monkeypatch):
+    monkeypatch.setattr(settings, 'HTTP_CACHE_ENABLED', False)
+    monkeypatch.setattr(settings, 'MAX_RETRIES', 2)
+    
+    async def fake_sleep(delay):
+        pass
+    
+    monkeypatch.setattr(base_module.asyncio, 'sleep', fake_sleep)
+    calls = []
+    crawler = MockCrawler(lambda request: calls.append(request) or httpx.Response(503))
+    
+    assert fetch(crawler) is None
+    assert len(calls) == 3
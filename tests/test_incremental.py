@@ -0,0 +1,158 @@
+"""
+增量爬取测试
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from src.config import settings
+from src.crawlers import IxbkCrawler
+from src.filters import NearDuplicateFilter, QualityFilter
+from src.rss import RSSManager
+from src.storage import PostStore, SeenStore
+
+
+def list_html(count):
+    items = ''.join(
+        f'<li class="article-list"><a href="/{i}.html" title="京东 话费充值 满减 {i}" data-catename="京东" '
+        f'data-content="简介{i}" data-louzhu="u{i}">t</a><time class="badge">10:0{i}</time>'
+        f'<span class="badge com">{i}</span></li>'
+        for i in range(count)
+    )
+    return f'<html><body><ul class="new-post">{items}</ul></body></html>'
+
+
+class FakeIxbkCrawler(IxbkCrawler):
+    def __init__(self, count=5, failing_details=(), **kwargs):
+        super().__init__(**kwargs)
+        self.count = count
+        self.failing_details = set(failing_details)
+    
+    async def fetch_page(self, url):
+        if url == self.base_url:
+            return list_html(self.count)
+        if url in self.failing_details:
+            return None
+        return f'<div class="article-content"><p>详情 {url}</p></div>'
+
+
+def test_posts_are_marked_seen_only_by_mark_seen():
+    seen_store = SeenStore(':memory:')
+    crawler = FakeIxbkCrawler(fetch_detail=False, max_pages=1, seen_store=seen_store)
+    
+    async def take_first():
+        posts = crawler.crawl_iter()
+        first = await posts.__anext__()
+        await posts.aclose()
+        return first
+    
+    first = asyncio.run(take_first())
+    all_urls = [f'https://new.ixbk.net/{i}.html' for i in range(5)]
+    
+    # 产出时不记录，调用方保存后才记录
+    assert seen_store.known(all_urls) == set()
+    assert crawler.mark_seen() == 1
+    assert seen_store.known(all_urls) == {first['url']}
+    assert crawler.mark_seen() == 0
+
+
+def test_posts_with_failed_detail_are_not_marked_seen(monkeypatch):
+    monkeypatch.setattr(settings, 'DETAIL_CACHE_ENABLED', False)
+    seen_store = SeenStore(':memory:')
+    failing = 'https://new.ixbk.net/2.html'
+    crawler = FakeIxbkCrawler(max_pages=1, seen_store=seen_store, failing_details=[failing])
+    
+    posts = asyncio.run(crawler.crawl())
+    crawler.mark_seen()
+    
+    all_urls = {f'https://new.ixbk.net/{i}.html' for i in range(5)}
+    assert len(posts) == 5
+    assert seen_store.known(all_urls) == all_urls - {failing}
+
+
+def test_all_passed_posts_are_stored_before_marking_seen(monkeypatch):
+    monkeypatch.setattr(settings, 'INCREMENTAL_CRAWL', True)
+    monkeypatch.setattr(settings, 'DETAIL_CACHE_ENABLED', False)
+    seen_store = SeenStore(':memory:')
+    post_store = PostStore()
+    manager = RSSManager(
+        crawler=FakeIxbkCrawler(count=8, max_pages=1, seen_store=seen_store),
+        quality_filter=QualityFilter(threshold=0),
+        rss_generator=object(),
+        post_store=post_store
+    )
+    
+    first = asyncio.run(manager.collect_posts(max_items=3))
+    
+    all_urls = {f'https://new.ixbk.net/{i}.html' for i in range(8)}
+    # 输出只有前3条，但所有通过过滤的帖子都已保存并记录为已处理
+    assert len(first) == 3
+    assert {post['url'] for _, post in post_store.since_seq(0)} == all_urls
+    assert seen_store.known(all_urls) == all_urls
+    
+    # 下次增量爬取没有新帖子，输出仍从存储补齐
+    manager.crawler = FakeIxbkCrawler(count=8, max_pages=1, seen_store=seen_store)
+    second = asyncio.run(manager.collect_posts(max_items=10))
+    assert {post['url'] for post in second} == all_urls
+
+
+class EmptyCrawler:
+    async def crawl_iter(self):
+        return
+        yield
+
+
+def test_incremental_run_backfills_output_from_post_store(monkeypatch):
+    monkeypatch.setattr(settings, 'INCREMENTAL_CRAWL', True)
+    post_store = PostStore()
+    post_store.upsert([{
+        'title': '京东 话费充值 满100减5',
+        'url': 'https://new.ixbk.net/1.html',
+        'content': '京东 话费充值 满100减5',
+        'category': '京东',
+        'publish_time': datetime.now() - timedelta(hours=1),
+    }])
+    manager = RSSManager(
+        crawler=EmptyCrawler(),
+        quality_filter=QualityFilter(threshold=0),
+        rss_generator=object(),
+        post_store=post_store
+    )
+    
+    posts = asyncio.run(manager.collect_posts(max_items=10))
+    
+    assert [post['url'] for post in posts] == ['https://new.ixbk.net/1.html']
+
+
+def test_backfilled_posts_are_deduplicated(monkeypatch):
+    monkeypatch.setattr(settings, 'INCREMENTAL_CRAWL', True)
+    post_store = PostStore()
+    now = datetime.now()
+    post_store.upsert([
+        {
+            'title': '京东PLUS会员年卡限时五折抢购',
+            'url': 'https://new.ixbk.net/1.html',
+            'content': '京东PLUS会员年卡限时五折抢购',
+            'category': '京东',
+            'publish_time': now - timedelta(hours=2),
+            'quality_score': 70,
+        },
+        {
+            'title': '京东PLUS会员年卡限时五折抢购！',
+            'url': 'https://new.ixbk.net/2.html',
+            'content': '京东PLUS会员年卡限时五折抢购！',
+            'category': '京东',
+            'publish_time': now - timedelta(hours=1),
+            'quality_score': 80,
+        },
+    ])
+    manager = RSSManager(
+        crawler=EmptyCrawler(),
+        quality_filter=QualityFilter(threshold=0),
+        rss_generator=object(),
+        deduplicator=NearDuplicateFilter(),
+        post_store=post_store
+    )
+    
+    posts = asyncio.run(manager.collect_posts(max_items=10))
+    
+    assert len(posts) == 1
@@ -0,0 +1,84 @@
+"""
+线报酷页面提取器测试：各解析器 + 部分解析的结果须与 html.parser 完整解析一致
+"""
+from pathlib import Path
+
+import pytest
+
+from src.config import settings
+from src.crawlers import base
+from src.crawlers.ixbk_parser import parse_detail_page, parse_list_page
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+BASE_URL = 'https://new.ixbk.net/'
+
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None
+
+PARSERS = [
+    pytest.param('lxml', marks=pytest.mark.skipif(lxml is None, reason='未安装lxml')),
+    'html.parser',
+]
+
+
+def read_fixture(name):
+    return (FIXTURES / name).read_text(encoding='utf-8')
+
+
+def extract(monkeypatch, parser, partial, func, *args):
+    monkeypatch.setattr(base, 'HTML_PARSER', parser)
+    monkeypatch.setattr(settings, 'PARTIAL_PARSE', partial)
+    return func(*args)
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_list_page_partial_parse_matches_full_tree(monkeypatch, parser):
+    html = read_fixture('ixbk_list.html')
+    expected = extract(monkeypatch, 'html.parser', False, parse_list_page, html, BASE_URL)
+    actual = extract(monkeypatch, parser, True, parse_list_page, html, BASE_URL)
+    
+    assert len(expected['items']) == 30
+    assert expected['next_url'] == 'https://new.ixbk.net/page/2'
+    assert actual == expected
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_detail_page_partial_parse_matches_full_tree(monkeypatch, parser):
+    html = read_fixture('ixbk_detail.html')
+    expected = extract(monkeypatch, 'html.parser', False, parse_detail_page, html)
+    actual = extract(monkeypatch, parser, True, parse_detail_page, html)
+    
+    assert 'https://item.jd.com/100012043978.html' in expected['content']
+    assert 'https://u.jd.com/AbC123' in expected['comment_links']
+    assert actual == expected
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_malformed_list_page_is_parsed_alike(monkeypatch, parser):
+    html = read_fixture('ixbk_list_malformed.html')
+    expected = extract(monkeypatch, 'html.parser', False, parse_list_page, html, BASE_URL)
+    actual = extract(monkeypatch, parser, True, parse_list_page, html, BASE_URL)
+    
+    # 未闭合的 li/div、多余的结束标签、未加引号的属性值
+    assert [item['url'].rsplit('/', 1)[-1] for item in expected['items']] == ['2000.html', '2001.html', '2002.html']
+    assert [item['comments'] for item in expected['items']] == [2, 5, 0]
+    assert expected['items'][0]['category'] == '京东'
+    assert expected['next_url'] == 'https://new.ixbk.net/page/2'
+    assert actual == expected
+
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_bytes_input_matches_str_input(monkeypatch, parser):
+    html = read_fixture('ixbk_list.html')
+    expected = extract(monkeypatch, parser, True, parse_list_page, html, BASE_URL)
+    actual = extract(monkeypatch, parser, True, parse_list_page, html.encode('utf-8'), BASE_URL)
+    
+    assert actual == expected
+
+
+def test_resolve_parser():
+    assert base.resolve_parser('auto') == ('html.parser' if lxml is None else 'lxml')
+    assert base.resolve_parser('html.parser') == 'html.parser'
+    assert base.resolve_parser('lxml') == ('html.parser' if lxml is None else 'lxml')
@@ -0,0 +1,63 @@
+"""
+关键词匹配器测试（与逐个 keyword in text 的结果比较）
+"""
+import pytest
+
+from src.filters import keyword_matcher
+from src.filters.keyword_matcher import KeywordMatcher
+from src.filters.rules import RuleSnapshot
+
+RULES = RuleSnapshot.load(None, None)
+
+KEYWORD_SETS = {
+    'builtin': list(RULES.keyword_order),
+    # 互相重叠、互为前缀/后缀的关键词
+    'overlapping': ['he', 'she', 'his', 'hers', 'h', 'ers', 'rs'],
+    'suffix': ['优惠券', '惠券', '券', '优惠', '满减券', '减券', '满100减5'],
+    'repeated': ['aa', 'aaa', 'a', 'aaaa', 'ab', 'ba'],
+}
+
+TEXTS = [
+    '',
+    'ushers',
+    'ahishers she sells',
+    'aaaaab',
+    'bab',
+    '京东PLUS会员年卡限时五折 实物包邮，领优惠券再满减',
+    '话费充值满100减5元 满减券 惠券 券',
+    '助力砍价拉人，下载APP注册实名绑卡 下载app',
+    '支付宝红包 抽奖 概率 随机 可能 试试',
+    '平平无奇的一句话',
+]
+
+
+@pytest.fixture(params=['default', 'pure_python'])
+def matcher_factory(request, monkeypatch):
+    if request.param == 'pure_python':
+        # 强制使用纯Python的Aho-Corasick实现
+        monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    return KeywordMatcher
+
+
+@pytest.mark.parametrize('keywords', KEYWORD_SETS.values(), ids=KEYWORD_SETS.keys())
+@pytest.mark.parametrize('text', TEXTS)
+def test_find_matches_substring_baseline(matcher_factory, keywords, text):
+    matcher = matcher_factory(keywords)
+    
+    assert matcher.find(text) == {k for k in keywords if k in text}
+
+
+def test_pure_python_fallback_is_used(monkeypatch):
+    monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    matcher = KeywordMatcher(['券'])
+    
+    assert matcher._automaton is None
+    assert matcher.find('优惠券') == {'券'}
+
+
+def test_empty_keywords_and_duplicates(matcher_factory):
+    assert matcher_factory([]).find('任何文本') == set()
+    
+    matcher = matcher_factory(['', '红包', '红包'])
+    assert matcher.keywords == ['红包']
+    assert matcher.find('支付宝红包') == {'红包'}
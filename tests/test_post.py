@@ -0,0 +1,114 @@
+"""
+紧凑帖子记录测试
+"""
+from functools import partial
+import json
+import pickle
+
+import pytest
+
+from src.storage import Post, PostStore, SQLitePostStore
+from src.storage.post import COMPRESS_MIN_LENGTH, _SAME_AS_TITLE
+
+TITLE = '京东PLUS会员年卡限时五折'
+LONG_CONTENT = '京东PLUS会员年卡限时五折，领券后再减10元。' * 20
+
+
+@pytest.fixture
+def make_post(make_post):
+    """字段较全、内容较长的帖子"""
+    return partial(
+        make_post, 0, TITLE, content=LONG_CONTENT, comments=3, quality_score=72.5
+    )
+
+
+def test_behaves_like_dict(make_post):
+    data = make_post(summary='额外字段')
+    post = Post(data)
+    
+    assert dict(post) == data
+    assert post == data
+    assert len(post) == len(data)
+    assert list(post) == list(data)
+    assert post['summary'] == '额外字段'
+    assert post.get('view_count') is None
+    assert post.get('view_count', 0) == 0
+    assert 'view_count' not in post
+    with pytest.raises(KeyError):
+        post['view_count']
+    
+    del post['summary']
+    del post['author']
+    assert 'summary' not in post and 'author' not in post
+    with pytest.raises(KeyError):
+        del post['author']
+
+
+def test_content_same_as_title_is_aliased(make_post):
+    post = Post(make_post(content=TITLE))
+    assert post._content is _SAME_AS_TITLE
+    assert post['content'] == post['title']
+    
+    # 修改标题后内容保持原值
+    post['title'] = '新标题'
+    assert post['content'] == '京东PLUS会员年卡限时五折'
+    
+    post['content'] = '新标题'
+    del post['title']
+    assert post['content'] == '新标题'
+    assert 'title' not in post
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_long_content_compression(compress, make_post):
+    post = Post(make_post(), compress_content=compress)
+    
+    assert isinstance(post._content, bytes) is compress
+    assert post['content'] == LONG_CONTENT
+    assert post.content == LONG_CONTENT
+    
+    short = Post(make_post(content='短' * (COMPRESS_MIN_LENGTH - 1)), compress_content=compress)
+    assert isinstance(short._content, str)
+
+
+def test_interned_fields_share_strings(make_post):
+    a = Post(make_post(category=''.join(['京', '东'])))
+    b = Post(make_post(category=''.join(['京', '东'])))
+    
+    assert a['category'] is b['category']
+
+
+@pytest.mark.parametrize('content', [LONG_CONTENT, '京东PLUS会员年卡限时五折'])
+def test_pickle_round_trip(content, make_post):
+    post = Post(make_post(content=content, summary='额外字段'), compress_content=True)
+    
+    restored = pickle.loads(pickle.dumps(post))
+    
+    assert isinstance(restored, Post)
+    assert restored == post
+    assert type(restored._content) is type(post._content)
+    assert restored._compress
+
+
+def test_json_requires_to_dict(make_post):
+    post = Post(make_post())
+    
+    with pytest.raises(TypeError):
+        json.dumps(post)
+    
+    data = json.loads(json.dumps(post.to_dict(), default=str, ensure_ascii=False))
+    assert data['content'] == LONG_CONTENT
+    assert data['publish_time'] == '2026-01-01 10:00:00'
+
+
+@pytest.mark.parametrize('store_factory', [PostStore, lambda: SQLitePostStore(':memory:')], ids=['memory', 'sqlite'])
+def test_stores_return_posts_equal_to_input(store_factory, make_post):
+    store = store_factory()
+    data = make_post(comment_links='https://example.com/a')
+    store.upsert([data])
+    
+    [(_, post)] = store.since_seq(0)
+    
+    assert isinstance(post, Post)
+    assert post['content'] == LONG_CONTENT
+    assert {key: post[key] for key in data} == data
@@ -0,0 +1,66 @@
+"""
+帖子存储与增量Feed游标测试
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.rss.generator import RSSManager
+from src.storage import PostStore, SQLitePostStore, parse_cursor
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request):
+    if request.param == 'memory':
+        yield PostStore()
+    else:
+        sqlite_store = SQLitePostStore(':memory:')
+        yield sqlite_store
+        sqlite_store.close()
+
+
+def drain(manager, cursor, limit):
+    """按游标翻页直到没有新帖子，返回收到的全部帖子URL"""
+    received = []
+    for _ in range(100):
+        posts, cursor = manager.get_delta(cursor, limit)
+        if not posts:
+            return received
+        received.extend(post['url'] for post in reversed(posts))
+    raise AssertionError('游标没有前进')
+
+
+def test_time_cursor_paging_keeps_posts_with_same_publish_time(store, make_post):
+    base = datetime(2026, 1, 1, 10, 0)
+    # 8条帖子中有5条发布时间相同（ixbk的时间只精确到分钟）
+    times = [base - timedelta(minutes=2), base - timedelta(minutes=1)] + [base] * 5 + [base + timedelta(minutes=1)]
+    posts = [make_post(i, publish_time=publish_time) for i, publish_time in enumerate(times)]
+    store.upsert(posts)
+    manager = RSSManager(crawler=None, quality_filter=None, rss_generator=object(), post_store=store)
+    
+    received = drain(manager, (base - timedelta(hours=1)).isoformat(), limit=2)
+    
+    assert sorted(received) == sorted(post['url'] for post in posts)
+    assert len(received) == len(set(received))
+
+
+def test_seq_cursor_returns_only_new_posts(store, make_post):
+    base = datetime(2026, 1, 1)
+    store.upsert(make_post(i, publish_time=base + timedelta(minutes=i)) for i in range(5))
+    manager = RSSManager(crawler=None, quality_filter=None, rss_generator=object(), post_store=store)
+    _, cursor = manager.get_delta(None, 10)
+    
+    store.upsert([make_post(5, publish_time=base + timedelta(minutes=5)), make_post(1, publish_time=base + timedelta(minutes=1))])
+    posts, next_cursor = manager.get_delta(cursor, 10)
+    
+    assert [post['url'] for post in posts] == ['https://new.ixbk.net/5.html']
+    assert int(next_cursor) == int(cursor) + 1
+
+
+def test_parse_cursor():
+    assert parse_cursor(None) is None
+    assert parse_cursor('42') == 42
+    assert parse_cursor('2026-01-01T10:00:00') == (datetime(2026, 1, 1, 10), None)
+    assert parse_cursor('2026-01-01T10:00:00@7') == (datetime(2026, 1, 1, 10), 7)
+    with pytest.raises(ValueError):
+        parse_cursor('bogus')
@@ -0,0 +1,110 @@
+"""
+质量评分测试（批量评分与逐条评分一致）
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.filters import QualityFilter
+from src.filters import quality_filter as quality_filter_module
+from src.filters.rules import RuleSnapshot
+from src.filters.score_cache import ScoreCache
+
+RULES = RuleSnapshot.load(None, None)
+NOW = datetime(2026, 1, 1, 12, 0)
+
+TITLES = [
+    '京东PLUS会员年卡限时五折 实物包邮',
+    '话费充值满100减5元 优惠券',
+    '助力砍价拉人，下载app注册实名绑卡',
+    '支付宝红包抽奖 概率随机 可以试试',
+    '淘宝天猫品牌官方正品秒杀特价',
+    '平平无奇的一句话',
+]
+CATEGORIES = ['', '京东', '话费', '抽奖', '助力砍价', '其他']
+AGES = [None, 'not a datetime', 0.5, 3, 8, 18, 30, 24 * 7]
+
+
+def make_posts():
+    posts = []
+    for i, title in enumerate(TITLES * 4):
+        age = AGES[i % len(AGES)]
+        if age is None:
+            pub_time = None
+        elif isinstance(age, str):
+            pub_time = age
+        else:
+            pub_time = NOW - timedelta(hours=age)
+        posts.append({
+            'title': title,
+            'url': f'u/{i}',
+            'content': title if i % 2 else f'{title} 详情内容',
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'publish_time': pub_time,
+            'comments': (i * 7) % 30,
+        })
+    return posts
+
+
+def make_filter():
+    return QualityFilter(threshold=0, rules=RULES)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False], ids=['numpy', 'no_numpy'])
+def test_score_batch_matches_calculate_score(monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(quality_filter_module, 'np', None)
+    posts = make_posts()
+    quality_filter = make_filter()
+    quality_filter.score_cache = None
+    
+    expected = [quality_filter.calculate_score(post, NOW) for post in posts]
+    
+    assert quality_filter.score_batch(posts, NOW) == expected
+    assert quality_filter.score_batch([], NOW) == []
+
+
+@pytest.mark.parametrize('batch', [False, True], ids=['scalar', 'batch'])
+def test_cached_scores_match_uncached(batch):
+    posts = make_posts()
+    uncached = make_filter()
+    uncached.score_cache = None
+    expected = [uncached.calculate_score(post, NOW) for post in posts]
+    
+    cached = QualityFilter(threshold=0, rules=RULES, score_cache=ScoreCache(max_entries=100))
+    score = cached.score_batch if batch else lambda items, now: [
+        cached.calculate_score(post, now) for post in items
+    ]
+    
+    assert score(posts, NOW) == expected
+    misses = cached.score_cache.misses
+    # 第二遍全部命中缓存，结果不变
+    assert score(posts, NOW) == expected
+    assert cached.score_cache.misses == misses
+    assert cached.score_cache.hits >= len(posts)
+    
+    # 缓存的结果也用于另一种评分方式
+    assert [cached.calculate_score(post, NOW) for post in posts] == expected
+    assert cached.score_batch(posts, NOW) == expected
+    assert cached.score_cache.misses == misses
+
+
+def test_cache_is_invalidated_by_rule_changes():
+    post = make_posts()[0]
+    quality_filter = QualityFilter(threshold=0, rules=RULES, score_cache=ScoreCache(max_entries=100))
+    before = quality_filter.calculate_score(post, NOW)
+    
+    # 规则表只读，直接修改会报错而不是被静默忽略
+    with pytest.raises(TypeError):
+        quality_filter.positive_keywords['京东'] -= 60
+    assert quality_filter.calculate_score(post, NOW) == before
+    
+    positive_keywords = dict(quality_filter.positive_keywords)
+    positive_keywords['京东'] -= 60
+    quality_filter.update_rules(positive_keywords=positive_keywords)
+    
+    assert quality_filter.positive_keywords['京东'] == RULES.positive_keywords['京东'] - 60
+    assert quality_filter.calculate_score(post, NOW) < before
+    assert quality_filter.score_batch([post], NOW) == [quality_filter.calculate_score(post, NOW)]
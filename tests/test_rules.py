@@ -0,0 +1,82 @@
+"""
+评分规则快照测试（分组规则表、JSON快照缓存）
+"""
+import json
+
+import pytest
+
+from src.config import settings
+from src.filters import QualityFilter, RuleSnapshot
+from src.filters import keyword_matcher
+
+TEXT = '京东PLUS会员年卡限时五折 实物包邮 助力砍价 下载app'
+
+
+def write_rules(path, tables):
+    path.write_text(json.dumps(tables, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def test_grouped_tables_equal_flat_tables(tmp_path):
+    grouped = RuleSnapshot.load(None)
+    flat = RuleSnapshot.load(write_rules(tmp_path / 'flat.json', {
+        'positive_keywords': grouped.positive_keywords,
+        'negative_keywords': grouped.negative_keywords,
+        'category_weights': grouped.category_weights,
+    }))
+    
+    assert grouped.fingerprint == flat.fingerprint
+    assert list(grouped.keyword_order) == list(flat.keyword_order)
+    assert grouped.positive_keywords['0元购'] == 25
+    assert grouped.category_weights['砍价'] == 0.4
+
+
+def test_invalid_group_values_are_rejected():
+    with pytest.raises(ValueError):
+        RuleSnapshot.from_dict({'positive_keywords': {'实物类': {'实物': '20'}}})
+
+
+def test_quality_filter_does_not_write_cache_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, 'RULES_CACHE_DIR', '')
+    monkeypatch.setattr(settings, 'QUALITY_RULES_FILE', '')
+    monkeypatch.setattr(settings, 'SCORE_CACHE_FILE', '')
+    
+    QualityFilter()
+    
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('pure_python', [True, False], ids=['pure_python', 'default'])
+def test_json_cache_round_trip(tmp_path, monkeypatch, pure_python):
+    if pure_python:
+        monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    cache_dir = tmp_path / 'rules'
+    
+    compiled = RuleSnapshot.load(None, cache_dir)
+    files = list(cache_dir.iterdir())
+    assert [path.suffix for path in files] == ['.json']
+    json.loads(files[0].read_text(encoding='utf-8'))
+    
+    cached = RuleSnapshot.load(None, cache_dir)
+    
+    assert cached.fingerprint == compiled.fingerprint
+    assert cached.keyword_order == compiled.keyword_order
+    assert cached.text_matcher.find(TEXT) == compiled.text_matcher.find(TEXT)
+    assert cached.category_matcher.find('京东 助力') == {'京东', '助力'}
+    assert cached.source == compiled.source
+
+
+def test_corrupt_cache_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    cache_dir = tmp_path / 'rules'
+    expected = RuleSnapshot.load(None, cache_dir)
+    cache_file = next(cache_dir.iterdir())
+    
+    state = json.loads(cache_file.read_text(encoding='utf-8'))
+    state['text_matcher']['fail'] = [len(state['text_matcher']['goto']) + 5]
+    cache_file.write_text(json.dumps(state), encoding='utf-8')
+    assert RuleSnapshot.load(None, cache_dir).text_matcher.find(TEXT) == expected.text_matcher.find(TEXT)
+    
+    cache_file.write_bytes(b'\x80\x04not json')
+    assert RuleSnapshot.load(None, cache_dir).fingerprint == expected.fingerprint
@@ -0,0 +1,110 @@
+"""
+全文搜索测试（中文二字切分、单字查询、相关度排序和分页）
+"""
+import sqlite3
+
+import pytest
+
+from src.storage import SQLitePostStore
+from src.storage.search_index import SEARCH_FIELDS, SearchIndex, build_match_query, tokenize
+
+
+@pytest.fixture
+def store():
+    sqlite_store = SQLitePostStore(':memory:')
+    yield sqlite_store
+    sqlite_store.close()
+
+
+def urls(result):
+    return [post['url'].rsplit('/', 1)[-1] for post in result['items']]
+
+
+def test_tokenize_bigrams_keep_last_char():
+    assert tokenize('领优惠券') == ['领优', '优惠', '惠券', '券']
+    assert tokenize('券') == ['券']
+    assert tokenize('ＰＬＵＳ会员 满100减5') == ['plus', '会员', '员', '满', '100', '减', '5']
+    assert tokenize('  ，。!') == []
+
+
+def test_build_match_query():
+    assert build_match_query('券') == '"券"*'
+    assert build_match_query('优惠券') == '"优惠 惠券 券"*'
+    assert build_match_query('京东 plu') == '"京东 东"* AND "plu"*'
+    assert build_match_query(' ，') is None
+
+
+def test_single_char_query_matches_any_position(store, make_post):
+    store.upsert([
+        make_post(1, '领优惠券'),  # 末字
+        make_post(2, '券后价9.9元'),  # 首字
+        make_post(3, '优惠券包邮'),  # 中间
+        make_post(4, '话费充值', content='满减券'),
+        make_post(5, '京东PLUS会员'),
+    ])
+    
+    assert set(urls(store.search('券'))) == {'1.html', '2.html', '3.html', '4.html'}
+    assert set(urls(store.search('惠'))) == {'1.html', '3.html'}
+    assert urls(store.search('费')) == ['4.html']
+
+
+def test_multi_char_query_is_contiguous(store, make_post):
+    store.upsert([
+        make_post(1, '领优惠券'),
+        make_post(2, '优惠券包邮'),
+        make_post(3, '优质的惠民券'),
+        make_post(4, '优惠券abc'),
+    ])
+    
+    assert set(urls(store.search('优惠券'))) == {'1.html', '2.html', '4.html'}
+    assert set(urls(store.search('惠券'))) == {'1.html', '2.html', '4.html'}
+    assert urls(store.search('优惠券abc')) == ['4.html']
+    assert store.search('惠民 优惠')['total'] == 0
+    assert urls(store.search('惠民 券')) == ['3.html']
+
+
+def test_title_hits_rank_above_content_hits(store, make_post):
+    store.upsert([
+        make_post(1, '今日线报', content='内含优惠券'),
+        make_post(2, '优惠券限时领取'),
+        make_post(3, '话费充值'),
+    ])
+    
+    result = store.search('券')
+    
+    assert urls(result) == ['2.html', '1.html']
+    relevance = [post['relevance'] for post in result['items']]
+    assert relevance == sorted(relevance, reverse=True)
+
+
+def test_search_paging(store, make_post):
+    store.upsert([make_post(i, f'优惠券{i}号') for i in range(7)])
+    
+    pages = [store.search('券', page=page, page_size=3) for page in (1, 2, 3, 4)]
+    
+    assert [result['total'] for result in pages] == [7] * 4
+    assert pages[0]['page_count'] == 3
+    assert [len(result['items']) for result in pages] == [3, 3, 1, 0]
+    seen = [url for result in pages for url in urls(result)]
+    assert sorted(seen) == sorted(f'{i}.html' for i in range(7))
+    
+    assert store.search('券', category='淘宝')['total'] == 0
+
+
+def test_index_built_with_old_tokenizer_is_rebuilt():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE posts (seq INTEGER, title TEXT, content TEXT, comment_links TEXT, publish_time REAL)')
+    conn.execute("INSERT INTO posts VALUES (1, '领优惠券', '', '', 0)")
+    # 旧版本的索引：只有二字组合，没有版本记录
+    conn.execute(f'CREATE VIRTUAL TABLE posts_fts USING fts5({", ".join(SEARCH_FIELDS)})')
+    conn.execute("INSERT INTO posts_fts (rowid, title, content, comment_links) VALUES (1, '领优 优惠 惠券', '', '')")
+    conn.commit()
+    
+    index = SearchIndex(conn, 'posts')
+    
+    total, _ = index.search('券', ['title'])
+    assert total == 1
+    # 版本一致时不再重建
+    conn.execute('DELETE FROM posts_fts')
+    SearchIndex(conn, 'posts')
+    assert index.search('券', ['title'])[0] == 0
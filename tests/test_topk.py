@@ -0,0 +1,65 @@
+"""
+流式Top-K过滤测试（结果须与 filter_posts 排序后截取前K条一致）
+"""
+import asyncio
+
+import pytest
+
+from src.filters import QualityFilter, TopKFilter
+from src.filters.rules import RuleSnapshot
+
+RULES = RuleSnapshot.load(None, None)
+
+# 每个标题重复出现，分数相同的帖子须按输入顺序保留
+TITLES = [
+    '京东PLUS会员年卡限时五折 实物包邮',
+    '话费充值满100减5元 优惠券',
+    '助力砍价拉人，下载app注册实名绑卡',
+    '平平无奇的一句话',
+    '淘宝天猫品牌官方正品秒杀特价',
+]
+
+
+def make_filter(threshold):
+    quality_filter = QualityFilter(threshold=threshold, rules=RULES)
+    quality_filter.score_cache = None
+    return quality_filter
+
+
+def make_posts(make_post):
+    return [make_post(i, TITLES[i * 7 % len(TITLES)], publish_time=None) for i in range(40)]
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 16, 100])
+@pytest.mark.parametrize('k', [0, 1, 5, 12, 40, 60])
+def test_top_k_matches_sorted_filter_posts(make_post, k, batch_size):
+    passed = make_filter(30).filter_posts(make_posts(make_post))
+    # 有未通过阈值的帖子，且通过的帖子中存在同分
+    assert 0 < len(passed) < 40
+    assert len({post['quality_score'] for post in passed}) < len(passed)
+    expected = passed[:k]
+    
+    top_k = TopKFilter(make_filter(30), k, batch_size=batch_size)
+    actual = top_k.consume(make_posts(make_post))
+    
+    assert [post['url'] for post in actual] == [post['url'] for post in expected]
+    assert [post['quality_score'] for post in actual] == [post['quality_score'] for post in expected]
+
+
+def test_early_stop_reads_at_most_one_batch_past_saturation(make_post):
+    quality_filter = make_filter(30)
+    top_title = TITLES[0]
+    assert quality_filter.calculate_score(make_post(0, top_title, publish_time=None)) == TopKFilter.MAX_SCORE
+    produced = 0
+    
+    async def stream():
+        nonlocal produced
+        for i in range(1000):
+            produced += 1
+            yield make_post(i, top_title, publish_time=None)
+    
+    top_k = TopKFilter(quality_filter, 3)
+    results = asyncio.run(top_k.consume_async(stream()))
+    
+    assert [post['url'] for post in results] == [f'https://new.ixbk.net/{i}.html' for i in range(3)]
+    assert produced <= top_k.batch_size